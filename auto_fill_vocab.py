@@ -1,18 +1,36 @@
 #!/usr/bin/env python3
 """
 Auto-fill missing pronunciation, definition, meaning, and examples for vocabulary
-Uses Dictionary API and MyMemory Translation API
+Uses Dictionary API and MyMemory Translation API (or the offline local_translate model)
 """
 
-import json
+import argparse
 import requests
 import time
 from typing import Dict, Optional
 
+import build_alignment
+import instrumentation
+import lesson_config
+import local_translate
+
 # API Endpoints
 DICTIONARY_API = "https://api.dictionaryapi.dev/api/v2/entries/en"
 MYMEMORY_TRANSLATE_API = "https://api.mymemory.translated.net/get"
 
+# Delay before each API request (seconds) to respect rate limits
+DICTIONARY_DELAY = 0.3
+TRANSLATE_DELAY = 0.5
+
+# Translation backends: MyMemory (free tier, rate limited) or the local CPU model
+TRANSLATORS = ('mymemory', 'local')
+TRANSLATOR = 'mymemory'
+
+# MyMemory has a 500 character limit per request: longer paragraphs go sentence by sentence
+SPLIT_LENGTH = 450
+
+_lookups = {}   # word -> Dictionary API result of this run (None = nothing found)
+
 def fetch_from_dictionary_api(word: str) -> Optional[Dict]:
     """
     Fetch word data from Dictionary API
@@ -20,6 +38,7 @@ def fetch_from_dictionary_api(word: str) -> Optional[Dict]:
     """
     try:
         url = f"{DICTIONARY_API}/{word}"
+        time.sleep(DICTIONARY_DELAY)  # Rate limiting
         response = requests.get(url, timeout=10)
 
         if response.status_code != 200:
@@ -48,13 +67,13 @@ def fetch_from_dictionary_api(word: str) -> Optional[Dict]:
         definitions = meaning.get('definitions', [])
         definition_obj = definitions[0] if definitions else {}
 
-        # Extract phonetic
-        phonetic = entry.get('phonetic', '')
-        if not phonetic and entry.get('phonetics'):
-            for p in entry.get('phonetics', []):
-                if p.get('text'):
-                    phonetic = p['text']
-                    break
+        # Extract phonetic (prefer the US transcription, like the DOCX sources)
+        phonetics = [p for p in entry.get('phonetics', []) if p.get('text')]
+        us = next((p for p in phonetics if p.get('audio', '').endswith('-us.mp3')), None)
+        if us:
+            phonetic = us['text']
+        else:
+            phonetic = entry.get('phonetic', '') or (phonetics[0]['text'] if phonetics else '')
 
         return {
             'pronunciation': phonetic,
@@ -69,15 +88,70 @@ def fetch_from_dictionary_api(word: str) -> Optional[Dict]:
         return None
 
 
+def lookup_word(word: str) -> Optional[Dict]:
+    """Dictionary API data of a word, fetched once per run"""
+    if word not in _lookups:
+        _lookups[word] = fetch_from_dictionary_api(word)
+    return _lookups[word]
+
+
+def is_phrase(word_text: str) -> bool:
+    """Phrases skip the Dictionary API (it won't work well)"""
+    return len(word_text.split()) > 1 or '/' in word_text or 'sth' in word_text.lower()
+
+
+def meaning_source(word: Dict) -> Optional[str]:
+    """
+    Text auto_fill_word translates into the meaning of an entry: the phrase itself,
+    the dictionary definition of a single word (the word when the API has nothing)
+    """
+    word_text = word.get('word', '')
+    if is_phrase(word_text):
+        return word_text
+    api_data = lookup_word(word_text)
+    if api_data is None:
+        return word_text
+    return api_data.get('definition') or None
+
+
+def paragraph_sources(text: str) -> list:
+    """Texts auto_fill_reading_translations translates for a paragraph"""
+    if len(text) > SPLIT_LENGTH:
+        return [text[start:end] for start, end in build_alignment.sentence_offsets(text)]
+    return [text]
+
+
+def pending_translations(data: Dict, skip_word=None) -> list:
+    """
+    Texts enrichment will translate for a lesson, so a batch backend can translate them
+    up front (dictionary lookups happen here, since single words translate their definition)
+    skip_word: optional predicate for entries filled some other way
+    """
+    texts = []
+    for para in data.get('reading', {}).get('paragraphs', []):
+        if para.get('text') and not para.get('translation'):
+            texts.extend(paragraph_sources(para['text']))
+    for word in data.get('vocabulary', []):
+        if word.get('word') and not word.get('meaning') and not (skip_word and skip_word(word)):
+            source = meaning_source(word)
+            if source:
+                texts.append(source)
+    return texts
+
+
 def translate_to_vietnamese(text: str) -> str:
     """
-    Translate text to Vietnamese using MyMemory Translation API
+    Translate text to Vietnamese using MyMemory Translation API (or the local model)
     """
     if not text or text.strip() == '':
         return ''
 
+    if TRANSLATOR == 'local':
+        return local_translate.translate(text)
+
     try:
         url = f"{MYMEMORY_TRANSLATE_API}?q={requests.utils.quote(text)}&langpair=en|vi"
+        time.sleep(TRANSLATE_DELAY)  # Rate limiting
         response = requests.get(url, timeout=10)
 
         if response.status_code != 200:
@@ -119,9 +193,7 @@ def auto_fill_word(word: Dict, index: int, total: int) -> Dict:
         return word
 
     # For phrases with multiple words, skip Dictionary API (won't work well)
-    is_phrase = len(word_text.split()) > 1 or '/' in word_text or 'sth' in word_text.lower()
-
-    if is_phrase:
+    if is_phrase(word_text):
         print(f"  ℹ Detected phrase, using translation only")
 
         # For phrases, just translate if needed
@@ -130,7 +202,6 @@ def auto_fill_word(word: Dict, index: int, total: int) -> Dict:
             if meaning:
                 word['meaning'] = meaning
                 print(f"  ✓ Meaning: {meaning}")
-            time.sleep(0.5)  # Rate limiting
 
         # Set empty values for other fields
         if needs_pronunciation:
@@ -145,7 +216,7 @@ def auto_fill_word(word: Dict, index: int, total: int) -> Dict:
         return word
 
     # For single words, use Dictionary API
-    api_data = fetch_from_dictionary_api(word_text)
+    api_data = lookup_word(word_text)
 
     if api_data:
         # Fill pronunciation
@@ -170,7 +241,6 @@ def auto_fill_word(word: Dict, index: int, total: int) -> Dict:
 
         # Translate definition to Vietnamese if needed
         if needs_meaning and api_data.get('definition'):
-            time.sleep(0.5)  # Rate limiting for translation API
             meaning = translate_to_vietnamese(api_data['definition'])
             if meaning:
                 word['meaning'] = meaning
@@ -181,15 +251,11 @@ def auto_fill_word(word: Dict, index: int, total: int) -> Dict:
 
         # Fallback: just translate the word
         if needs_meaning:
-            time.sleep(0.5)
             meaning = translate_to_vietnamese(word_text)
             if meaning:
                 word['meaning'] = meaning
                 print(f"  ✓ Meaning (fallback): {meaning}")
 
-    # Small delay to respect API rate limits
-    time.sleep(0.3)
-
     return word
 
 
@@ -240,25 +306,25 @@ def auto_fill_reading_translations(data: Dict) -> Dict:
         print(f"[{i+1}/{len(paragraphs)}] {para_id}: Translating {len(text)} chars...")
 
         # Translate paragraph (may need to split if too long)
-        # MyMemory has 500 char limit per request
-        if len(text) > 450:
-            # Split into sentences and translate separately
-            import re
-            sentences = re.split(r'(?<=[.!?])\s+', text)
+        if len(text) > SPLIT_LENGTH:
+            # Split into sentences and translate separately, keeping the sentence pairs
             translated_parts = []
-
-            for sentence in sentences:
-                if sentence.strip():
-                    time.sleep(0.5)  # Rate limiting
-                    translation = translate_to_vietnamese(sentence)
-                    if translation:
-                        translated_parts.append(translation)
-                    else:
-                        translated_parts.append(sentence)
+            alignment = []
+            position = 0
+
+            for start, end in build_alignment.sentence_offsets(text):
+                sentence = text[start:end]
+                translation = (translate_to_vietnamese(sentence) or sentence).strip()
+                if translated_parts:
+                    position += 1
+                alignment.append([start, end, position, position + len(translation)])
+                translated_parts.append(translation)
+                position += len(translation)
 
             para['translation'] = ' '.join(translated_parts)
+            para['alignment'] = alignment
         else:
-            time.sleep(0.5)  # Rate limiting
+            # Aligned afterwards (build_alignment)
             translation = translate_to_vietnamese(text)
             para['translation'] = translation if translation else ''
 
@@ -267,7 +333,7 @@ def auto_fill_reading_translations(data: Dict) -> Dict:
         else:
             print(f"  ⚠ Translation failed")
 
-        # MainIdea is left empty for manual input
+        # MainIdea is written by hand or extracted later (build_main_ideas)
         if not para.get('mainIdea'):
             para['mainIdea'] = ''
 
@@ -309,7 +375,6 @@ def auto_fill_fillInTheBlanks_translations(data: Dict) -> Dict:
                 continue
 
             # Translate sentence
-            time.sleep(0.5)  # Rate limiting
             translation = translate_to_vietnamese(sentence)
 
             if translation:
@@ -330,42 +395,63 @@ def main():
     """
     Main function - process JSON files
     """
-    import sys
+    parser = argparse.ArgumentParser(description='Auto-fill missing vocabulary data and translations')
+    parser.add_argument('files', nargs='*', help='lesson JSON files (default: all lessons)')
+    parser.add_argument('--translator', choices=TRANSLATORS, default=TRANSLATOR,
+                        help='translation backend (local: offline CPU model, see local_translate.py)')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
 
-    # Check if file path is provided
-    if len(sys.argv) > 1:
-        files = [sys.argv[1]]
-    else:
-        # Default files - all lessons
-        files = [
-            # Listening lessons
-            'public/lessons/json/unit1-listening.json',
-            'public/lessons/json/unit2-listening.json',
-            'public/lessons/json/unit3-listening.json',
-            # Reading lessons
-            'public/lessons/json/unit1-reading.json',
-            'public/lessons/json/unit2-reading-australian.json',
-            'public/lessons/json/unit2-reading-autumn.json',
-            'public/lessons/json/unit3-reading-malaria.json',
-            'public/lessons/json/unit3-reading-mekete.json',
-            'public/lessons/json/unit3-reading-sahara.json',
-            'public/lessons/json/unit4-reading.json',
-            'public/lessons/json/unit4-reading-name.json',
-            'public/lessons/json/unit4-should-we-try.json',
-            'public/lessons/json/unit5-reading-crops.json',
-            'public/lessons/json/unit5-reading-organic.json',
-            'public/lessons/json/unit5-reading-stadium.json',
-        ]
+    if not use_translator(args.translator):
+        return
+
+    with instrumentation.session(args):
+        process_files(args.files)
+
+
+def use_translator(name):
+    """Select the translation backend; returns False (with a message) when it cannot run"""
+    global TRANSLATOR
+    if name == 'local':
+        problem = local_translate.check_model()
+        if problem:
+            print(f"✗ {problem}")
+            return False
+    TRANSLATOR = name
+    return True
+
+
+def process_files(files):
+    """
+    Auto-fill every lesson file in files (all lessons when empty)
+    """
+    instrumentation.instrument(globals(), {
+        'fetch_from_dictionary_api': 'dictionary_api',
+        'translate_to_vietnamese': 'translate',
+        'auto_fill_vocabulary': 'enrich_vocab',
+        'auto_fill_reading_translations': 'enrich_reading',
+    })
+
+    if not files:
+        # Default files - all lessons in the pipeline config
+        files = [lesson['output'] for lesson in lesson_config.load_lessons()]
 
     for filename in files:
         print(f"\n{'='*60}")
         print(f"Processing: {filename}")
         print(f"{'='*60}")
 
+        instrumentation.set_lesson(filename.rsplit('/', 1)[-1])
+
         try:
             # Load JSON
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with instrumentation.stage('json_load'):
+                data = lesson_config.read_lesson(filename)
+
+            # The local model translates the whole lesson in batches up front
+            if TRANSLATOR == 'local':
+                with instrumentation.stage('translate_batch'):
+                    local_translate.prefill(pending_translations(data))
 
             # Auto-fill missing data
             data = auto_fill_vocabulary(data)
@@ -373,8 +459,8 @@ def main():
             # Skip fillInTheBlanks translation - questions have blanks, translation not useful yet
 
             # Save back
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with instrumentation.stage('serialize'):
+                lesson_config.write_lesson(filename, data)
 
             # Statistics
             vocab = data.get('vocabulary', [])
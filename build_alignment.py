@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Sentence-level English–Vietnamese alignment for reading paragraphs
+- paragraphs translated sentence by sentence keep their exact pairs
+  (auto_fill_vocab records them while joining the translation)
+- existing translations (hand-made or translated in one call) are aligned with a
+  length-based dynamic program (Gale & Church): 1-1, 1-2, 2-1, 2-2 beads, with
+  1-0 / 0-1 beads folded into their neighbour so every pair has both sides
+- sentences are split like build_search_index.split_sentences; stale alignments
+  (edited text or translation) are recomputed
+
+alignment: [[textStart, textEnd, translationStart, translationEnd], ...]
+(character offsets into paragraph.text and paragraph.translation, in order)
+"""
+
+import argparse
+import math
+
+import instrumentation
+import lesson_config
+from build_search_index import SENTENCE_RE
+
+# Bead shapes (source sentences, translation sentences) -> prior probability
+BEADS = {
+    (1, 1): 0.89,
+    (1, 0): 0.0099,
+    (0, 1): 0.0099,
+    (2, 1): 0.089,
+    (1, 2): 0.089,
+    (2, 2): 0.011,
+}
+BEAD_COSTS = {shape: -math.log(prior) for shape, prior in BEADS.items()}
+
+# Variance of the translation length per source character (Gale & Church)
+LENGTH_VARIANCE = 6.8
+
+
+def sentence_offsets(text):
+    """(start, end) of every sentence of a text, whitespace trimmed"""
+    offsets = []
+    start = 0
+    for match in SENTENCE_RE.finditer(text):
+        offsets.append((start, match.start()))
+        start = match.end()
+    offsets.append((start, len(text)))
+
+    trimmed = []
+    for start, end in offsets:
+        sentence = text[start:end]
+        if sentence.strip():
+            start += len(sentence) - len(sentence.lstrip())
+            end -= len(sentence) - len(sentence.rstrip())
+            trimmed.append((start, end))
+    return trimmed
+
+
+def bead_cost(source_length, target_length, ratio):
+    """Cost of pairing source_length characters with target_length characters"""
+    if source_length == 0 or target_length == 0:
+        return 0.0
+    mean = (source_length + target_length / ratio) / 2
+    delta = (target_length - source_length * ratio) / math.sqrt(mean * LENGTH_VARIANCE)
+    return delta * delta / 2
+
+
+def align_lengths(source_lengths, target_lengths):
+    """
+    Cheapest bead sequence for two lists of sentence lengths
+    Returns [(source_start, source_end, target_start, target_end)] sentence index ranges.
+    """
+    n, m = len(source_lengths), len(target_lengths)
+    ratio = (sum(target_lengths) / sum(source_lengths)) if sum(source_lengths) else 1.0
+    ratio = ratio or 1.0
+
+    # cost[i][j]: best cost of aligning the first i source and j target sentences
+    cost = [[math.inf] * (m + 1) for _ in range(n + 1)]
+    back = [[None] * (m + 1) for _ in range(n + 1)]
+    cost[0][0] = 0.0
+    for i in range(n + 1):
+        for j in range(m + 1):
+            if cost[i][j] == math.inf:
+                continue
+            for (di, dj), prior_cost in BEAD_COSTS.items():
+                ni, nj = i + di, j + dj
+                if ni > n or nj > m:
+                    continue
+                total = cost[i][j] + prior_cost + bead_cost(
+                    sum(source_lengths[i:ni]), sum(target_lengths[j:nj]), ratio
+                )
+                if total < cost[ni][nj]:
+                    cost[ni][nj] = total
+                    back[ni][nj] = (i, j)
+
+    beads = []
+    i, j = n, m
+    while (i, j) != (0, 0):
+        pi, pj = back[i][j]
+        beads.append((pi, i, pj, j))
+        i, j = pi, pj
+    beads.reverse()
+
+    # Sentences without a counterpart join the neighbouring pair
+    merged = []
+    for bead in beads:
+        if merged and (bead[0] == bead[1] or bead[2] == bead[3] or
+                       merged[-1][0] == merged[-1][1] or merged[-1][2] == merged[-1][3]):
+            merged[-1] = (merged[-1][0], bead[1], merged[-1][2], bead[3])
+        else:
+            merged.append(bead)
+    return merged
+
+
+def align_paragraph(text, translation):
+    """alignment of a paragraph and its translation ([] when either is empty)"""
+    sources = sentence_offsets(text or '')
+    targets = sentence_offsets(translation or '')
+    if not sources or not targets:
+        return []
+    if len(sources) == 1 or len(targets) == 1:
+        return [[sources[0][0], sources[-1][1], targets[0][0], targets[-1][1]]]
+
+    beads = align_lengths([end - start for start, end in sources],
+                          [end - start for start, end in targets])
+    return [[sources[s0][0], sources[s1 - 1][1], targets[t0][0], targets[t1 - 1][1]]
+            for s0, s1, t0, t1 in beads]
+
+
+def alignment_valid(para):
+    """
+    True when the stored alignment still fits the current texts: text spans start on
+    sentences, translation spans start after whitespace, both cover everything in order
+    (exact pairs from sentence-by-sentence translation need not split like the text)
+    """
+    alignment = para.get('alignment')
+    text = para.get('text', '')
+    translation = para.get('translation', '')
+    sources = sentence_offsets(text)
+    if not alignment or not sources or not translation.strip():
+        return False
+    source_starts = {start for start, _ in sources}
+    translation_start = len(translation) - len(translation.lstrip())
+    position = 0
+    for s0, s1, t0, t1 in alignment:
+        if s0 not in source_starts or t0 < position or t1 < t0 or (t0 and not translation[t0 - 1].isspace()):
+            return False
+        position = t1
+    return (alignment[0][0] == sources[0][0] and alignment[-1][1] == sources[-1][1]
+            and alignment[0][2] == translation_start and alignment[-1][3] == len(translation.rstrip()))
+
+
+def align_lessons(lessons):
+    """
+    Align every translated paragraph of (lesson_id, data) pairs whose alignment is missing or stale
+    Returns (paragraphs aligned now, paragraphs with an alignment)
+    """
+    aligned = 0
+    total = 0
+    for _, data in lessons:
+        for para in data.get('reading', {}).get('paragraphs', []):
+            if not para.get('text') or not para.get('translation'):
+                para.pop('alignment', None)
+                continue
+            if not alignment_valid(para):
+                para['alignment'] = align_paragraph(para['text'], para['translation'])
+                aligned += 1
+            total += 1
+    return aligned, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Align reading paragraphs with their translations sentence by sentence')
+    parser.add_argument('--dry-run', action='store_true', help='report without writing lessons')
+    parser.add_argument('--show', metavar='LESSON_ID', help='print the sentence pairs of a lesson')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        with instrumentation.stage('json_load'):
+            published = list(lesson_config.iter_published())
+
+        lessons = [(entry['id'], data) for entry, data in published]
+        with instrumentation.stage('align'):
+            aligned, total = align_lessons(lessons)
+        print(f"✓ Alignment: {total} paragraphs ({aligned} aligned now)")
+
+        for lesson_id, data in lessons:
+            if lesson_id != args.show:
+                continue
+            for para in data.get('reading', {}).get('paragraphs', []):
+                print(f"\n{'='*60}\n{para['id']}\n{'='*60}")
+                for s0, s1, t0, t1 in para.get('alignment', []):
+                    print(f"  {para['text'][s0:s1]}\n  → {para['translation'][t0:t1]}\n")
+
+        if not args.dry_run and aligned:
+            lesson_config.write_published(published, root)
+            print(f"✓ Updated {len(published)} lessons")
+
+
+if __name__ == "__main__":
+    main()
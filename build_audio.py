@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Pre-render pronunciation audio for every vocabulary word and simple example
+- synthesized offline with a local TTS engine (espeak-ng, espeak or pico2wave)
+- encoded to Opus (ffmpeg/opusenc) or MP3 (lame) at speech bitrates
+- files are named by content hash, so identical texts across lessons are rendered once
+  and unchanged texts are never rendered again
+- audio/manifest.json maps normalized text -> file; audioService plays these first
+
+Output: public/lessons/json/audio/<hash>.<ext> + audio/manifest.json
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import instrumentation
+import lesson_config
+
+AUDIO_DIR = 'audio'
+MANIFEST_VERSION = 1
+
+VOICE = 'en-us'
+WORDS_PER_MINUTE = 150  # ~AUDIO_CONFIG.TTS_RATE (0.85) of espeak's default 175
+BITRATE_KBPS = 24
+
+# Local TTS engines in order of preference: name -> command writing a WAV file
+TTS_ENGINES = {
+    'espeak-ng': lambda text, wav: ['espeak-ng', '-v', VOICE, '-s', str(WORDS_PER_MINUTE), '-w', wav, text],
+    'espeak': lambda text, wav: ['espeak', '-v', VOICE, '-s', str(WORDS_PER_MINUTE), '-w', wav, text],
+    'pico2wave': lambda text, wav: ['pico2wave', '-l', 'en-US', '-w', wav, text],
+}
+
+# Encoders in order of preference: name -> (extension, command)
+ENCODERS = {
+    'ffmpeg': ('opus', lambda wav, out: ['ffmpeg', '-loglevel', 'error', '-y', '-i', wav,
+                                         '-ac', '1', '-c:a', 'libopus', '-b:a', f'{BITRATE_KBPS}k',
+                                         '-application', 'voip', out]),
+    'opusenc': ('opus', lambda wav, out: ['opusenc', '--quiet', '--bitrate', str(BITRATE_KBPS), '--speech', wav, out]),
+    'lame': ('mp3', lambda wav, out: ['lame', '--quiet', '-m', 'm', '-b', '32', wav, out]),
+}
+
+
+def normalize_text(text):
+    """Key used for dedupe and lookups (must match lessonService.getAudioUrl)"""
+    return ' '.join(text.split()).lower()
+
+
+def spoken_text(text):
+    """Text passed to the TTS engine: '(Be in) vogue' -> 'Be in vogue'"""
+    return ' '.join(text.replace('(', ' ').replace(')', ' ').split())
+
+
+def audio_hash(text, engine):
+    """Content hash of the spoken text and the voice settings"""
+    key = f"{engine}|{VOICE}|{WORDS_PER_MINUTE}|{BITRATE_KBPS}|{normalize_text(text)}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def find_tools():
+    """First available (tts engine, encoder) names, or None for each"""
+    engine = next((name for name in TTS_ENGINES if shutil.which(name)), None)
+    encoder = next((name for name in ENCODERS if shutil.which(name)), None)
+    return engine, encoder
+
+
+def collect_texts(lessons):
+    """Normalized text -> text to speak, over (lesson_id, data) pairs"""
+    texts = {}
+    for _, data in lessons:
+        for word in data.get('vocabulary', []):
+            for text in (word.get('word', ''), word.get('exampleSimple', '')):
+                if text.strip():
+                    texts.setdefault(normalize_text(text), text.strip())
+    return texts
+
+
+def render(text, out_path, engine, encoder):
+    """Synthesize one text to WAV and encode it; returns True on success"""
+    _, encode = ENCODERS[encoder]
+    fd, wav_path = tempfile.mkstemp(suffix='.wav')
+    os.close(fd)
+    try:
+        subprocess.run(TTS_ENGINES[engine](spoken_text(text), wav_path), check=True, capture_output=True)
+        subprocess.run(encode(wav_path, out_path), check=True, capture_output=True)
+        return True
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"  ✗ Failed to render '{text[:40]}': {e}")
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        return False
+    finally:
+        os.remove(wav_path)
+
+
+def build_audio(lessons, root, engine, encoder, workers=4, dry_run=False):
+    """
+    Render missing audio files under root/audio and return
+    ({relative manifest path: manifest}, number of files rendered)
+    With dry_run nothing is rendered: the manifest and count are what a real run would give.
+    """
+    ext, _ = ENCODERS[encoder]
+    out_dir = f"{root}/{AUDIO_DIR}"
+
+    entries = {}
+    pending = []
+    for key, text in sorted(collect_texts(lessons).items()):
+        file_name = f"{audio_hash(text, engine)}.{ext}"
+        entries[key] = file_name
+        if not os.path.exists(f"{out_dir}/{file_name}"):
+            pending.append((text, f"{out_dir}/{file_name}"))
+
+    if dry_run:
+        results = [True] * len(pending)
+    else:
+        os.makedirs(out_dir, exist_ok=True)
+        # TTS and encoding run as subprocesses, so threads render in parallel
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda job: render(job[0], job[1], engine, encoder), pending))
+
+    failed = {path for (_, path), ok in zip(pending, results) if not ok}
+    entries = {key: name for key, name in entries.items() if f"{out_dir}/{name}" not in failed}
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "format": ext,
+        "engine": engine,
+        "entries": entries
+    }
+    return {f"{AUDIO_DIR}/manifest.json": manifest}, len(pending) - len(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-render pronunciation audio for published lessons')
+    parser.add_argument('--workers', type=int, default=4, help='parallel render jobs')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    engine, encoder = find_tools()
+    if not engine or not encoder:
+        print("✗ Need a TTS engine (espeak-ng, espeak, pico2wave) and an encoder (ffmpeg, opusenc, lame)")
+        return
+
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        with instrumentation.stage('render'):
+            files, rendered = build_audio(
+                ((entry['id'], data) for entry, data in lesson_config.iter_published()),
+                root, engine, encoder, workers=args.workers
+            )
+
+        with instrumentation.stage('serialize'):
+            lesson_config.write_artifacts(files, root)
+
+    manifest = files[f"{AUDIO_DIR}/manifest.json"]
+    print(f"✓ Audio: {len(manifest['entries'])} clips ({rendered} rendered) with {engine} + {encoder} "
+          f"→ {root}/{AUDIO_DIR}/")
+
+
+if __name__ == "__main__":
+    main()
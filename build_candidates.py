@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Propose vocabulary candidates from the reading texts (offline, for teachers)
+- every reading sentence of the course is tokenized in one pass; tokens are reduced
+  to a base form (frequency-list lemmas, course vocabulary, then suffix rules)
+- words already covered by a lesson's vocabulary (morphology index: inflections and
+  phrase templates) are dropped; words taught in another lesson are kept and marked
+- words score by frequency band (lessons/frequency_bands.txt: rarer = harder),
+  repetition in the lesson and how specific they are to it
+- collocations: 2-3 word n-grams of content words that recur in the course more
+  often than their words predict (pointwise mutual information)
+- each candidate lists up to MAX_EXAMPLES sentences it appears in
+
+Output: lessons/candidates.json (generated report, not published)
+"""
+
+import argparse
+import json
+import math
+import re
+
+import build_difficulty
+import build_morphology
+import instrumentation
+import lesson_config
+from build_examples import sentence_spans
+
+CANDIDATES_PATH = 'lessons/candidates.json'
+CANDIDATES_VERSION = 1
+
+# Bands 1-2 (≈ A1/A2) are taken as known
+MIN_BAND = 3
+MAX_CANDIDATES = 30
+MAX_EXAMPLES = 2
+# Words another lesson already teaches are revision, not new vocabulary
+TAUGHT_WEIGHT = 0.5
+
+# Collocations: recurring n-grams whose words co-occur far above chance
+NGRAM_SIZES = (2, 3)
+MIN_NGRAM_COUNT = 2
+MIN_PMI = 4.0
+
+# Hyphenated compounds stay one token (multi-storey)
+TOKEN_RE = re.compile(r"[^\W\d_]+(?:['’-][^\W\d_]+)*")
+STOP_WORDS = build_morphology.FUNCTION_WORDS | build_morphology.SLOT_WORDS | {
+    'is', 'are', 'was', 'were', 'be', 'been', 'being', 'has', 'have', 'had', 'do', 'does', 'did',
+    'it', 'this', 'that', 'these', 'those', 'they', 'them', 'he', 'she', 'we', 'you', 'i', 'me', 'us',
+    'which', 'who', 'whom', 'whose', 'what', 'when', 'where', 'why', 'how', 'there', 'here',
+    'can', 'could', 'will', 'would', 'should', 'may', 'might', 'must', 'also', 'very', 'so',
+    'but', 'if', 'then', 'such', 'some', 'any', 'more', 'most', 'many', 'much', 'other', 'each',
+}
+# Function words allowed inside a collocation (take part in, the rest of the)
+LINK_WORDS = build_morphology.FUNCTION_WORDS - {'and', 'or', 'not', 'than'}
+
+
+def read_sentences(lessons):
+    """Yield (lesson_id, paragraph id, sentence) for every reading sentence (tabbed glossary rows skipped)"""
+    for lesson_id, data in lessons:
+        for para in data.get('reading', {}).get('paragraphs', []):
+            for sentence in sentence_spans(para.get('text', '')):
+                if sentence and '\t' not in sentence:
+                    yield lesson_id, para.get('id', ''), sentence
+
+
+def base_form(token, lemmas, seen):
+    """Base form of a lowercase token: known lemma, else a suffix rule leading to a seen word"""
+    if token in lemmas:
+        return lemmas[token]
+    rules = []
+    if token.endswith('ies'):
+        rules.append(token[:-3] + 'y')
+    if token.endswith('es'):
+        rules.append(token[:-2])
+    if token.endswith('s') and not token.endswith('ss'):
+        rules.append(token[:-1])
+    for suffix in ('ed', 'ing'):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            stem = token[:-len(suffix)]
+            rules += [stem, stem + 'e']
+            if len(stem) > 2 and stem[-1] == stem[-2]:
+                rules.append(stem[:-1])
+    for rule in rules:
+        if rule in lemmas:
+            return lemmas[rule]
+        if rule in seen:
+            return rule
+    return token
+
+
+def lemma_table(index):
+    """{inflected form or lemma: lemma} from the frequency list and the course vocabulary"""
+    lemmas = {}
+    for lemma in build_difficulty.read_band_list():
+        lemmas.setdefault(lemma, lemma)
+        for form in build_morphology.inflect(lemma, {'n', 'v', 'adj'}):
+            lemmas.setdefault(form, lemma)
+    for form, lemma in index['forms'].items():
+        lemmas[form] = lemma
+    return lemmas
+
+
+def mine_candidates(lessons, bands=None):
+    """
+    Ranked candidates per lesson from (lesson_id, data) pairs
+    Returns {lesson_id: [candidate]}; a candidate is {text, kind, band, cefr, count,
+    score, examples[, taughtIn]}
+    """
+    lessons = list(lessons)
+    bands = bands or build_difficulty.load_bands()
+    index = build_morphology.build_morphology(lessons)[f"{build_morphology.MORPHOLOGY_DIR}/index.json"]
+    lemmas = lemma_table(index)
+
+    # Lessons teaching each headword key, and each single-word lemma
+    taught = {}
+    for lesson_id, data in lessons:
+        for word in data.get('vocabulary', []):
+            key = build_morphology.headword_key(word.get('word', ''))
+            pattern = build_morphology.compile_pattern(word.get('word', ''))
+            lemmas_taught = pattern[0].lstrip('?').split('|') if len(pattern) == 1 else []
+            for name in [key] + lemmas_taught:
+                taught.setdefault(name, set()).add(lesson_id)
+
+    # One pass: tokens, their sentence and whether the lesson's own vocabulary covers them
+    sentences = []      # (lesson_id, ref, text)
+    tokens = []         # (sentence index, start, end, lowercase token, skip)
+    covered = set()     # positions of tokens inside a vocabulary occurrence of the same lesson
+    lowercase = set()   # tokens written in lower case somewhere (the rest are names)
+    for lesson_id, ref, text in read_sentences(lessons):
+        first = len(tokens)
+        sentence_index = len(sentences)
+        sentences.append((lesson_id, ref, text))
+        for position, match in enumerate(TOKEN_RE.finditer(text)):
+            word = match.group(0)
+            if word[0].islower():
+                lowercase.add(word)
+            # '19th' leaves 'th'
+            after_digit = match.start() > 0 and text[match.start() - 1].isdigit()
+            tokens.append((sentence_index, match.start(), match.end(), word.lower(),
+                           after_digit or build_difficulty.skip_token(word, position)))
+        for start, end, key in build_morphology.find_matches(text, index):
+            if lesson_id in taught.get(key, ()):
+                covered.update(i for i in range(first, len(tokens)) if start <= tokens[i][1] < end)
+
+    # Sentence-initial names (Australian, Europe): never lower case and not in the frequency list
+    tokens = [
+        (*t[:4], t[4] or (t[3] not in lowercase and t[3] not in bands)) for t in tokens
+    ]
+
+    seen = {token for _, _, _, token, _ in tokens}
+    token_base = {token: base_form(token, lemmas, seen) for token in seen}
+    token_band = {token: build_difficulty.word_band(token, bands) for token in seen}
+
+    # Unigram counts per lesson and lesson frequency per lemma
+    counts = {}          # (lesson_id, lemma) -> [count, [token positions]]
+    lesson_freq = {}     # lemma -> lessons it occurs in
+    for i, (sentence_index, _, _, token, skip) in enumerate(tokens):
+        if skip or token in STOP_WORDS or "'" in token or '’' in token or len(token) < 3:
+            continue
+        lesson_id = sentences[sentence_index][0]
+        lemma = token_base[token]
+        slot = counts.setdefault((lesson_id, lemma), [0, []])
+        slot[0] += 1
+        slot[1].append(i)
+        lesson_freq.setdefault(lemma, set()).add(lesson_id)
+
+    # N-gram counts over the whole course (within sentences, content words at both ends)
+    total = max(1, len(tokens))
+    unigram = {}
+    for _, _, _, token, _ in tokens:
+        lemma = token_base[token]
+        unigram[lemma] = unigram.get(lemma, 0) + 1
+    ngrams = {}          # tuple of lemmas -> [token start positions]
+    for size in NGRAM_SIZES:
+        for i in range(len(tokens) - size + 1):
+            window = tokens[i:i + size]
+            if window[0][0] != window[-1][0] or any(t[4] for t in window):
+                continue
+            if window[0][3] in STOP_WORDS or window[-1][3] in STOP_WORDS:
+                continue
+            if any(t[3] in STOP_WORDS and t[3] not in LINK_WORDS for t in window[1:-1]):
+                continue
+            key = tuple(token_base[t[3]] for t in window)
+            ngrams.setdefault(key, []).append(i)
+
+    lesson_count = max(1, len(lessons))
+    results = {lesson_id: [] for lesson_id, _ in lessons}
+
+    for (lesson_id, lemma), (count, positions) in counts.items():
+        if any(i in covered for i in positions):
+            continue
+        band = min(token_band[tokens[i][3]] for i in positions)
+        if band < MIN_BAND:
+            continue
+        specificity = math.log(lesson_count / len(lesson_freq[lemma])) + 1
+        taught_in = taught.get(lemma, set()) - {lesson_id}
+        score = (band - MIN_BAND + 1) * (1 + math.log(count)) * specificity * (TAUGHT_WEIGHT if taught_in else 1)
+        results[lesson_id].append(candidate(lemma, 'word', band, count, score, positions, tokens, sentences, taught_in))
+
+    collocations = {}
+    for key, starts in ngrams.items():
+        if len(starts) < MIN_NGRAM_COUNT:
+            continue
+        expected = math.prod(unigram[lemma] / total for lemma in key) * total
+        pmi = math.log2(len(starts) / expected)
+        if pmi >= MIN_PMI:
+            collocations[key] = pmi
+
+    # A shorter n-gram that only ever occurs inside a longer collocation adds nothing
+    inside = set()
+    for key in collocations:
+        if len(key) > 2:
+            for part in (key[:-1], key[1:]):
+                if part in collocations and len(ngrams[part]) == len(ngrams[key]):
+                    inside.add(part)
+
+    for key, pmi in collocations.items():
+        if key in inside:
+            continue
+        starts = ngrams[key]
+        text = ' '.join(tokens[i][3] for i in range(starts[0], starts[0] + len(key)))
+        by_lesson = {}
+        for i in starts:
+            if not any(j in covered for j in range(i, i + len(key))):
+                by_lesson.setdefault(sentences[tokens[i][0]][0], []).append(i)
+        band = max(token_band[tokens[starts[0] + k][3]] for k in range(len(key)))
+        for lesson_id, positions in by_lesson.items():
+            results[lesson_id].append(candidate(
+                text, 'collocation', max(band, build_difficulty.PHRASE_MIN_BAND), len(positions),
+                pmi / MIN_PMI * (1 + math.log(len(positions))) * max(1, band - MIN_BAND + 1),
+                positions, tokens, sentences, taught.get(text, set()) - {lesson_id}, len(key)
+            ))
+
+    for lesson_id in results:
+        ranked = sorted(results[lesson_id], key=lambda c: (-c['score'], c['text']))
+        results[lesson_id] = ranked[:MAX_CANDIDATES]
+    return results
+
+
+def candidate(text, kind, band, count, score, positions, tokens, sentences, taught_in, size=1):
+    """Candidate record with up to MAX_EXAMPLES distinct sentences (offsets of the occurrence)"""
+    examples = []
+    used = set()
+    for i in positions:
+        sentence_index, start, _, _, _ = tokens[i]
+        if sentence_index in used:
+            continue
+        used.add(sentence_index)
+        _, ref, text_of_sentence = sentences[sentence_index]
+        examples.append({"ref": ref, "text": text_of_sentence, "start": start, "end": tokens[i + size - 1][2]})
+        if len(examples) == MAX_EXAMPLES:
+            break
+    record = {
+        "text": text,
+        "kind": kind,
+        "band": band,
+        "cefr": build_difficulty.LEVELS[band - 1],
+        "count": count,
+        "score": round(score, 2),
+        "examples": examples
+    }
+    if taught_in:
+        record['taughtIn'] = sorted(taught_in)
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Propose vocabulary candidates from the reading texts')
+    parser.add_argument('--show', metavar='LESSON_ID', help='print the ranked candidates of a lesson')
+    parser.add_argument('--dry-run', action='store_true', help='report without writing the candidates file')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumentation.session(args):
+        with instrumentation.stage('json_load'):
+            lessons = [(entry['id'], data) for entry, data in lesson_config.iter_published()]
+
+        with instrumentation.stage('mine'):
+            results = mine_candidates(lessons)
+
+        print(f"\n{'='*60}")
+        print("Vocabulary Candidates:")
+        print(f"{'='*60}")
+        for lesson_id, candidates in results.items():
+            if candidates:
+                top = ', '.join(c['text'] for c in candidates[:5])
+                print(f"✓ {lesson_id}: {len(candidates)} candidates ({top}, ...)")
+
+        for c in results.get(args.show, []):
+            taught = f" (taught in {', '.join(c['taughtIn'])})" if 'taughtIn' in c else ''
+            print(f"\n  {c['score']:6.2f}  {c['text']} [{c['kind']}, {c['cefr']}, ×{c['count']}]{taught}")
+            for example in c['examples']:
+                print(f"          {example['text']}")
+
+        if not args.dry_run:
+            with instrumentation.stage('serialize'), open(CANDIDATES_PATH, 'w', encoding='utf-8') as f:
+                json.dump({"version": CANDIDATES_VERSION, "lessons": results}, f, ensure_ascii=False, indent=2)
+                f.write('\n')
+            print(f"\n✓ Saved to {CANDIDATES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Generate cloze (fill-in-the-blank) tasks from the reading paragraphs
+- reading sentences containing lesson vocabulary are found with the morphology
+  index (inflections + phrase templates), one pass over the whole course; the
+  occurrence as written (evolved, carried out) becomes the answer
+- each vocabulary entry is tested once and each sentence carries one blank;
+  entries with the fewest usable sentences choose first, then readable length wins
+- sentences an existing question already uses (same or nearly the same text) are skipped
+- tasks hold TASK_SIZE questions; the word bank adds DISTRACTORS_PER_TASK lesson
+  words of the same part of speech, inflected like an answer and absent from the
+  task's sentences
+- generated tasks ("generated": true) follow the DOCX tasks and are rebuilt each run
+
+Task: {id, title, generated, wordBank, distractors, questions: [{id, sentence, answer, translation, ref}]}
+"""
+
+import argparse
+import difflib
+
+import build_morphology
+import content_ids
+import instrumentation
+import lesson_config
+from build_alignment import sentence_offsets
+from build_examples import BLANK_RE, IDEAL_WORDS
+from build_game_banks import pos_set
+
+BLANK = '…………'
+
+TASK_SIZE = 8
+MIN_TASK_SIZE = 3           # a shorter last task joins the previous one
+DISTRACTORS_PER_TASK = 3
+MAX_ANSWER_WORDS = 3
+
+MIN_WORDS = 6
+MAX_WORDS = 35
+
+INFLECTION_SUFFIXES = ('ing', 'ed', 's')
+
+
+def question_key(sentence, answer):
+    """Normalized text of a question with its answer written in"""
+    return content_ids.normalize(BLANK_RE.sub(answer, sentence, count=1) if answer else sentence)
+
+
+def is_duplicate(key, existing):
+    """True when an existing question uses the same or nearly the same sentence"""
+    for other in existing:
+        if key == other:
+            return True
+        matcher = difflib.SequenceMatcher(None, key, other, autojunk=False)
+        if matcher.real_quick_ratio() >= content_ids.SIMILARITY and matcher.ratio() >= content_ids.SIMILARITY:
+            return True
+    return False
+
+
+def testable(pattern):
+    """Headwords that make a clean blank: no slots, at most MAX_ANSWER_WORDS words"""
+    return pattern and len(pattern) <= MAX_ANSWER_WORDS and not any(t.lstrip('?') == '*' for t in pattern)
+
+
+def sentence_translation(para, start, end):
+    """Translation of one paragraph sentence when the alignment pairs it on its own"""
+    for s0, s1, t0, t1 in para.get('alignment', []):
+        if s0 == start and s1 == end:
+            return para.get('translation', '')[t0:t1]
+    return ''
+
+
+def inflect_like(lemma, pos, answer):
+    """lemma in the answer's inflection (-ing / -ed verbs, -s nouns and verbs), so no bank word stands out"""
+    answer = answer.lower()
+    if answer == lemma or ' ' in lemma:
+        return lemma
+    for suffix in INFLECTION_SUFFIXES:
+        if answer.endswith(suffix) and not lemma.endswith(suffix):
+            allowed = pos & ({'v'} if suffix != 's' else {'n', 'v'})
+            forms = sorted(
+                (f for f in build_morphology.inflect(lemma, allowed) if f.endswith(suffix)),
+                key=lambda f: (len(f), f)
+            ) if allowed else []
+            return forms[0] if forms else None
+    return lemma
+
+
+def lesson_candidates(data, index, taught):
+    """
+    Blankable occurrences of the lesson's vocabulary in its reading
+    Returns ({entry key: [(quality, sentence number)]}, [sentence records])
+    """
+    sentences = []
+    occurrences = {}
+    for para in data.get('reading', {}).get('paragraphs', []):
+        text = para.get('text', '')
+        for start, end in sentence_offsets(text):
+            sentence = text[start:end]
+            words = len(sentence.split())
+            matches = build_morphology.find_matches(sentence, index)
+            record = {"para": para, "start": start, "end": end, "text": sentence,
+                      "keys": {key for _, _, key in matches}, "matches": {}}
+            number = len(sentences)
+            sentences.append(record)
+            if not MIN_WORDS <= words <= MAX_WORDS:
+                continue
+            for m_start, m_end, key in matches:
+                if key not in taught or m_start == 0:
+                    continue
+                answer = sentence[m_start:m_end]
+                # The same word elsewhere in the sentence would give the answer away
+                if sentence.lower().count(answer.lower()) > 1 or key in record['matches']:
+                    continue
+                record['matches'][key] = (m_start, m_end)
+                occurrences.setdefault(key, []).append((-abs(words - IDEAL_WORDS), number))
+    return occurrences, sentences
+
+
+def choose_questions(occurrences, sentences, existing):
+    """[(sentence number, entry key)] in reading order: one blank per sentence, one sentence per entry"""
+    used = set()
+    chosen = []
+    for key in sorted(occurrences, key=lambda k: (len(occurrences[k]), k)):
+        for _, number in sorted(occurrences[key], key=lambda o: (-o[0], o[1])):
+            if number in used:
+                continue
+            if is_duplicate(content_ids.normalize(sentences[number]['text']), existing):
+                continue
+            used.add(number)
+            chosen.append((number, key))
+            break
+    return sorted(chosen)
+
+
+def choose_distractors(answers, sentence_keys, entries, usage):
+    """
+    Lesson words for the bank that fit no blank of a task: per distractor, an answer
+    to imitate (same part of speech, similar length, same inflection); words offered
+    least often in the lesson so far come first
+    answers: [(answer text, entry key)]; usage counts the distractors offered per entry
+    """
+    task_keys = {key for _, key in answers}
+    answer_words = {word for answer, _ in answers for word in answer.lower().split()}
+    pool = [
+        (key, pos_set(word.get('pos', ''))) for key, word in entries.items()
+        if key not in task_keys and key not in sentence_keys and ' ' not in key and key not in answer_words
+    ]
+    taken = {answer.lower() for answer, _ in answers}
+    distractors = []
+    for i in range(DISTRACTORS_PER_TASK):
+        answer, answer_key = answers[i * len(answers) // DISTRACTORS_PER_TASK]
+        answer_pos = pos_set(entries[answer_key].get('pos', ''))
+        ranked = sorted(pool, key=lambda c: (
+            not (c[1] & answer_pos), usage.get(c[0], 0), abs(len(c[0]) - len(answer)), c[0]
+        ))
+        for key, pos in ranked:
+            form = inflect_like(key, pos, answer)
+            if form and form.lower() not in taken:
+                taken.add(form.lower())
+                distractors.append(form)
+                usage[key] = usage.get(key, 0) + 1
+                pool.remove((key, pos))
+                break
+    return distractors
+
+
+def build_tasks(data, index):
+    """Generated cloze tasks for one lesson (existing generated tasks are ignored)"""
+    entries = {}
+    for word in data.get('vocabulary', []):
+        key = build_morphology.headword_key(word.get('word', ''))
+        if key and key not in entries and testable(build_morphology.compile_pattern(word['word'])):
+            entries[key] = word
+
+    tasks = [t for t in data.get('fillInTheBlanks', {}).get('tasks', []) if not t.get('generated')]
+    existing = [question_key(q.get('sentence', ''), q.get('answer', '')) for t in tasks for q in t.get('questions', [])]
+    taken_ids = {q.get('id') for t in tasks for q in t.get('questions', [])}
+
+    occurrences, sentences = lesson_candidates(data, index, entries)
+    chosen = choose_questions(occurrences, sentences, existing)
+
+    groups = [chosen[i:i + TASK_SIZE] for i in range(0, len(chosen), TASK_SIZE)]
+    if len(groups) > 1 and len(groups[-1]) < MIN_TASK_SIZE:
+        groups[-2].extend(groups.pop())
+    if groups and len(groups[-1]) < MIN_TASK_SIZE:
+        groups.pop()
+
+    generated = []
+    usage = {}
+    for n, group in enumerate(groups, 1):
+        questions = []
+        sentence_keys = set()
+        for number, key in group:
+            record = sentences[number]
+            start, end = record['matches'][key]
+            sentence = record['text'][:start] + BLANK + record['text'][end:]
+            questions.append({
+                "id": content_ids.question_id(sentence, taken_ids),
+                "sentence": sentence,
+                "answer": record['text'][start:end],
+                "translation": sentence_translation(record['para'], record['start'], record['end']),
+                "ref": record['para'].get('id', '')
+            })
+            sentence_keys |= record['keys']
+
+        answers = [q['answer'] for q in questions]
+        distractors = choose_distractors(list(zip(answers, [key for _, key in group])), sentence_keys, entries, usage)
+        generated.append({
+            "id": f"cloze_{n}",
+            "title": f"Reading practice {n}",
+            "generated": True,
+            "wordBank": sorted(answers + distractors, key=str.lower),
+            "distractors": distractors,
+            "questions": questions
+        })
+    return generated
+
+
+def generate_cloze(lessons):
+    """
+    Replace the generated cloze tasks of every (lesson_id, data) pair
+    Returns (tasks, questions) generated
+    """
+    lessons = list(lessons)
+    index = build_morphology.build_morphology(lessons)[f"{build_morphology.MORPHOLOGY_DIR}/index.json"]
+
+    task_count = 0
+    question_count = 0
+    for lesson_id, data in lessons:
+        if not data.get('reading', {}).get('paragraphs'):
+            continue
+        generated = build_tasks(data, index)
+        fib = data.setdefault('fillInTheBlanks', {"instructions": "", "tasks": []})
+        fib['tasks'] = [t for t in fib.get('tasks', []) if not t.get('generated')] + generated
+        task_count += len(generated)
+        question_count += sum(len(t['questions']) for t in generated)
+    return task_count, question_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate cloze tasks from the reading paragraphs')
+    parser.add_argument('--dry-run', action='store_true', help='report without writing lessons')
+    parser.add_argument('--show', metavar='LESSON_ID', help='print the generated tasks of a lesson')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        with instrumentation.stage('json_load'):
+            published = list(lesson_config.iter_published())
+
+        lessons = [(entry['id'], data) for entry, data in published]
+        with instrumentation.stage('cloze'):
+            tasks, questions = generate_cloze(lessons)
+        print(f"✓ Cloze: {questions} questions in {tasks} tasks")
+
+        for lesson_id, data in lessons:
+            if lesson_id != args.show:
+                continue
+            for task in data.get('fillInTheBlanks', {}).get('tasks', []):
+                if not task.get('generated'):
+                    continue
+                print(f"\n{'='*60}\n{task['title']}: {', '.join(task['wordBank'])}\n{'='*60}")
+                for question in task['questions']:
+                    print(f"  {question['sentence']}\n    → {question['answer']}")
+
+        if not args.dry_run:
+            lesson_config.write_published(published, root)
+            print(f"✓ Updated {len(published)} lessons")
+
+
+if __name__ == "__main__":
+    main()
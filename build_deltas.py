@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Versioned lesson snapshots and JSON-patch deltas for returning clients
+- a lesson's version is the hash of its canonical JSON (sorted keys, compact)
+- when a published lesson no longer matches its snapshot (any script rewrote it),
+  an RFC 6902 patch (add / remove / replace) from the snapshot is written and the
+  snapshot moves to the new version
+- manifest entries get version plus versions, the chain of earlier versions
+  (oldest first, at most MAX_CHAIN) that have patches leading to the latest one
+- lessonService applies the patches after a client's cached version instead of
+  downloading the lesson again
+
+Snapshots: lessons/versions/<lessonId>.json (commit them, like vocab_ids.json)
+Output: public/lessons/json/versions/<lessonId>/<from>-<to>.json
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+
+import instrumentation
+import lesson_config
+
+SNAPSHOT_DIR = 'lessons/versions'
+VERSIONS_DIR = 'versions'
+MAX_CHAIN = 20
+
+
+def canonical(data):
+    """Canonical JSON text of a lesson (the hashed form)"""
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def content_version(data):
+    """Version id of a lesson: hash of its canonical JSON"""
+    return hashlib.sha1(canonical(data).encode('utf-8')).hexdigest()[:12]
+
+
+def pointer_token(key):
+    """JSON pointer escaping of one path segment"""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def diff(old, new, path=''):
+    """RFC 6902 operations turning old into new"""
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    if isinstance(old, dict):
+        ops = [{"op": "remove", "path": f"{path}/{pointer_token(key)}"} for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{pointer_token(key)}", "value": value})
+            else:
+                ops.extend(diff(old[key], value, f"{path}/{pointer_token(key)}"))
+        return ops
+
+    if isinstance(old, list):
+        return diff_list(old, new, path)
+
+    return [] if old == new else [{"op": "replace", "path": path, "value": new}]
+
+
+def diff_list(old, new, path):
+    """
+    Operations for a list: common prefix/suffix kept; when the length changed, the
+    removed or inserted block goes where the fewest remaining items differ
+    (one deleted vocabulary entry is one remove, not a shift of every later entry)
+    """
+    shortest = min(len(old), len(new))
+    prefix = 0
+    while prefix < shortest and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < shortest - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+
+    old_middle = old[prefix:len(old) - suffix]
+    new_middle = new[prefix:len(new) - suffix]
+    longer, shorter = (old_middle, new_middle) if len(old_middle) >= len(new_middle) else (new_middle, old_middle)
+    gap = len(longer) - len(shorter)
+
+    # Position of the block present only in the longer side
+    block = min(
+        range(len(shorter) + 1),
+        key=lambda k: sum(1 for i, item in enumerate(shorter) if item != longer[i if i < k else i + gap])
+    ) if gap else len(shorter)
+
+    # Item diffs first (indexes of the old list), then the block removal or insertion
+    old_is_longer = longer is old_middle
+    ops = []
+    for i, item in enumerate(shorter):
+        j = i if i < block else i + gap
+        if old_is_longer:
+            ops.extend(diff(longer[j], item, f"{path}/{prefix + j}"))
+        else:
+            ops.extend(diff(item, longer[j], f"{path}/{prefix + i}"))
+    if old_is_longer:
+        for k in reversed(range(block, block + gap)):
+            ops.append({"op": "remove", "path": f"{path}/{prefix + k}"})
+    else:
+        for k in range(block, block + gap):
+            ops.append({"op": "add", "path": f"{path}/{prefix + k}", "value": longer[k]})
+    return ops
+
+
+def apply_patch(doc, ops):
+    """Apply RFC 6902 add/remove/replace operations to a copy of doc (mirrors utils/jsonPatch.js)"""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        tokens = [t.replace('~1', '/').replace('~0', '~') for t in op['path'].split('/')[1:]]
+        if not tokens:
+            doc = copy.deepcopy(op['value'])
+            continue
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if last == '-' else int(last)
+            if op['op'] == 'add':
+                parent.insert(index, copy.deepcopy(op['value']))
+            elif op['op'] == 'remove':
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(op['value'])
+        elif op['op'] == 'remove':
+            del parent[last]
+        else:
+            parent[last] = copy.deepcopy(op['value'])
+    return doc
+
+
+def load_snapshot(lesson_id, snapshot_dir=SNAPSHOT_DIR):
+    """{version, lesson} stored for a lesson, None when it has none yet"""
+    try:
+        with open(f"{snapshot_dir}/{lesson_id}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def update_version(lesson_id, data, entry, snapshot):
+    """
+    Bring a manifest entry's version chain up to date with the lesson
+    Returns {path relative to the lessons root: patch} and the new snapshot
+    (None when the lesson did not change).
+    """
+    version = content_version(data)
+    if snapshot and snapshot['version'] == version:
+        entry['version'] = version
+        entry.setdefault('versions', [])
+        return {}, None
+
+    files = {}
+    chain = entry.get('versions', [])
+    if snapshot and entry.get('version') == snapshot['version']:
+        ops = diff(snapshot['lesson'], data)
+        # A patch must rebuild the lesson exactly and be smaller than the lesson itself
+        if apply_patch(snapshot['lesson'], ops) == data and len(canonical(ops)) < len(canonical(data)):
+            files[f"{VERSIONS_DIR}/{lesson_id}/{snapshot['version']}-{version}.json"] = ops
+            chain = (chain + [snapshot['version']])[-MAX_CHAIN:]
+        else:
+            chain = []
+    else:
+        chain = []
+
+    entry['version'] = version
+    entry['versions'] = chain
+    return files, {"version": version, "lesson": data}
+
+
+def update_versions(lessons, manifest, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Version every (lesson_id, data) pair against its snapshot
+    Returns ({relative patch path: ops}, {lesson_id: new snapshot})
+    """
+    by_id = {entry.get('id'): entry for entry in manifest.get('lessons', [])}
+    files = {}
+    snapshots = {}
+    for lesson_id, data in lessons:
+        entry = by_id.get(lesson_id)
+        if entry is None:
+            continue
+        patches, snapshot = update_version(lesson_id, data, entry, load_snapshot(lesson_id, snapshot_dir))
+        files.update(patches)
+        if snapshot:
+            snapshots[lesson_id] = snapshot
+    return files, snapshots
+
+
+def save_snapshot(lesson_id, snapshot, snapshot_dir=SNAPSHOT_DIR):
+    os.makedirs(snapshot_dir, exist_ok=True)
+    with open(f"{snapshot_dir}/{lesson_id}.json", 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Version published lessons and write JSON-patch deltas')
+    parser.add_argument('--dry-run', action='store_true', help='report without writing')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = lesson_config.lessons_root()
+    manifest_path = lesson_config.manifest_path()
+    with instrumentation.session(args):
+        with instrumentation.stage('json_load'):
+            published = list(lesson_config.iter_published(expand=False))
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest_text = f.read()
+            manifest = json.loads(manifest_text)
+
+        with instrumentation.stage('diff'):
+            files, snapshots = update_versions(((entry['id'], data) for entry, data in published), manifest)
+
+        for rel_path, ops in files.items():
+            print(f"  ✓ {rel_path}: {len(ops)} operations, {len(canonical(ops))} bytes")
+        print(f"✓ Versions: {len(snapshots)} lessons changed, {len(files)} patches")
+
+        if not args.dry_run:
+            with instrumentation.stage('serialize'):
+                lesson_config.write_artifacts(files, root)
+                for lesson_id, snapshot in snapshots.items():
+                    save_snapshot(lesson_id, snapshot)
+                with open(manifest_path, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps(manifest, ensure_ascii=False, indent=2) + ('\n' if manifest_text.endswith('\n') else ''))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Estimate how hard every lesson, paragraph and vocabulary entry is (offline)
+- vocabulary entries: frequency band from lessons/frequency_bands.txt (inflected and
+  derived forms resolve to their base word) mapped to a CEFR estimate
+- paragraphs: Flesch reading ease, Flesch-Kincaid grade and lexical coverage
+  (share of running words within the 2000 most frequent)
+- lessons: aggregate level of the text and the vocabulary, written into the
+  manifest so the lesson list can be sorted and filtered without the lesson bodies
+
+All text of the course is tokenized into one flat batch first; bands and syllable
+counts are then looked up once per distinct word and reduced per paragraph.
+
+Fields: vocabulary[].band / .cefr, reading.paragraphs[].readability,
+manifest lessons[].difficulty
+"""
+
+import argparse
+import json
+import re
+
+import build_morphology
+import instrumentation
+import lesson_config
+from build_examples import corpus_sentences
+
+BANDS_PATH = 'lessons/frequency_bands.txt'
+
+LEVELS = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']
+
+# Band of words missing from the list (C1)
+UNLISTED = 5
+
+# Readers need to know ~95% of the running words to follow a text unaided
+COVERAGE_TARGET = 0.95
+
+# Multi-word expressions are rarely taught before B1
+PHRASE_MIN_BAND = 3
+
+PREFIXES = ('counter', 'inter', 'multi', 'under', 'over', 'anti', 'self', 'non', 'mis', 'dis',
+            'pre', 'sub', 'un', 're', 'in', 'im', 'il', 'ir', 'co')
+SUFFIXES = ('ically', 'ation', 'ition', 'ment', 'ness', 'ship', 'hood', 'able', 'ible', 'less', 'ful',
+            'tion', 'sion', 'ance', 'ence', 'ity', 'ism', 'ist', 'ise', 'ize', 'ive', 'ous',
+            'ially', 'ally', 'ial', 'ic', 'al', 'ly', 'er', 'or', 'ry', 'y')
+
+TOKEN_RE = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+VOWEL_GROUP_RE = re.compile(r'[aeiouy]+')
+PAREN_RE = re.compile(r'\([^)]*\)')
+POSSESSIVE_RE = re.compile(r"['’]s$")
+
+
+def read_band_list(path=BANDS_PATH):
+    """{lemma: band} as listed; a word keeps the lowest band it is listed in"""
+    listed = {}
+    band = UNLISTED
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line.startswith('@'):
+                band = int(line[1:])
+            else:
+                for word in line.split():
+                    listed.setdefault(word, band)
+    return listed
+
+
+def load_bands(path=BANDS_PATH):
+    """{word or inflected form: band}; a word keeps the lowest band it is listed in"""
+    listed = read_band_list(path)
+    bands = dict(listed)
+    for word, word_band in listed.items():
+        for form in build_morphology.inflect(word, {'n', 'v', 'adj'}):
+            if form not in listed:
+                bands[form] = min(bands.get(form, UNLISTED), word_band)
+    return bands
+
+
+def uk_spelling(word):
+    """British spelling of a US form (the list uses British spellings)"""
+    word = re.sub(r'iz(e|es|ed|ing|ation|ations|er|ers)$', r'is\1', word)
+    word = re.sub(r'(?<=[^aeiou])or(s)?$', r'our\1', word)
+    return re.sub(r'(?<=[^aeiou])er(s)?$', r're\1', word) if word.endswith(('ter', 'ters')) else word
+
+
+def word_band(word, bands):
+    """Band of a lowercase word; a derivation of a listed word is one band harder"""
+    word = POSSESSIVE_RE.sub('', word)
+    if word in bands:
+        return bands[word]
+    if "'" in word or '’' in word:
+        return 1  # contractions of function words (don't, they're)
+
+    bases = {word, uk_spelling(word)}
+    if word.endswith('s'):
+        bases.update(re.sub(pattern, repl, word) for pattern, repl in (('s$', ''), ('es$', ''), ('ies$', 'y')))
+    for base in bases:
+        if base in bands:
+            return bands[base]
+
+    candidates = []
+    for base in bases:
+        for prefix in PREFIXES:
+            if base.startswith(prefix) and len(base) - len(prefix) >= 3:
+                candidates.append(base[len(prefix):].lstrip('-'))
+        for suffix in SUFFIXES:
+            if base.endswith(suffix) and len(base) - len(suffix) >= 3:
+                stem = base[:-len(suffix)]
+                candidates += [stem, stem + 'e', stem + 'y', stem[:-1] + 'y' if stem.endswith('i') else stem]
+    known = [bands[c] for c in candidates if c in bands]
+    return min(UNLISTED, min(known) + 1) if known else UNLISTED
+
+
+def syllables(word):
+    """Heuristic syllable count of a lowercase word"""
+    count = len(VOWEL_GROUP_RE.findall(word))
+    if count > 1 and word.endswith('e') and not word.endswith(('le', 'ee', 'ye')):
+        count -= 1
+    if count > 1 and word.endswith('ed') and not word.endswith(('ted', 'ded')):
+        count -= 1
+    return max(1, count)
+
+
+def level_name(level):
+    """Numeric level (1 = A1) -> CEFR label"""
+    return LEVELS[min(len(LEVELS), max(1, round(level))) - 1]
+
+
+def grade_level(grade):
+    """Flesch-Kincaid grade -> numeric CEFR level (grade 3 ≈ A2, 9 ≈ B2, 12 ≈ C1)"""
+    return min(6.0, max(1.0, 1 + grade / 3))
+
+
+def entry_band(text, bands):
+    """Band of a vocabulary headword: its hardest content word"""
+    text = PAREN_RE.sub(' ', text) if PAREN_RE.sub('', text).strip() else text
+    words = [t.lower() for t in TOKEN_RE.findall(text.replace('/', ' '))]
+    content = [w for w in words if w not in build_morphology.SLOT_WORDS and w not in build_morphology.FUNCTION_WORDS]
+    if not content:
+        return None
+    band = max(word_band(w, bands) for w in content)
+    return max(band, PHRASE_MIN_BAND) if len(content) > 1 else band
+
+
+def skip_token(word, position):
+    """Names inside a sentence, non-English words and stray letters carry no lexical level"""
+    if position > 0 and word[0].isupper():
+        return True
+    return not word.isascii() or (len(word) == 1 and word.lower() not in ('a', 'i'))
+
+
+def text_segments(lessons):
+    """
+    One flat batch of tokens for the whole course
+    Returns (segments, tokens, skipped): segments are (lesson_id, source, ref, start, end,
+    sentences) slices of tokens; skipped flags the tokens skipped for lexical level
+    """
+    segments = []
+    tokens = []
+    skipped = []
+    current = None
+    for lesson_id, source, ref, sentence in corpus_sentences(lessons):
+        words = TOKEN_RE.findall(sentence)
+        if not words:
+            continue
+        if current is None or current[:3] != (lesson_id, source, ref):
+            if current is not None:
+                segments.append((*current[:4], len(tokens), current[4]))
+            current = [lesson_id, source, ref, len(tokens), 0]
+        current[4] += 1
+        tokens.extend(w.lower() for w in words)
+        skipped.extend(skip_token(w, i) for i, w in enumerate(words))
+    if current is not None:
+        segments.append((*current[:4], len(tokens), current[4]))
+    return segments, tokens, skipped
+
+
+def readability(token_bands, token_syllables, lexical, sentences):
+    """Metrics of a run of text from its per-token columns"""
+    words = len(token_bands)
+    per_sentence = words / sentences
+    per_word = sum(token_syllables) / words
+    ease = 206.835 - 1.015 * per_sentence - 84.6 * per_word
+    grade = max(0.0, 0.39 * per_sentence + 11.8 * per_word - 15.59)
+
+    known = sorted(lexical)
+    coverage = sum(1 for band in known if band <= 2) / len(known) if known else 1.0
+    # Smallest band that covers the target share of running words
+    lexical_band = known[min(len(known) - 1, int(COVERAGE_TARGET * len(known)))] if known else 1
+    level = (grade_level(grade) + lexical_band) / 2
+
+    return {
+        "words": words,
+        "sentences": sentences,
+        "ease": round(ease, 1),
+        "grade": round(grade, 1),
+        "coverage": round(coverage, 3),
+        "cefr": level_name(level)
+    }, level
+
+
+def score_lessons(lessons, bands):
+    """
+    Annotate (lesson_id, data) pairs in place (vocabulary band/cefr, paragraph
+    readability) and return {lesson_id: manifest difficulty}
+    """
+    lessons = list(lessons)
+
+    # Columns over every token of the course, looked up once per distinct word
+    segments, tokens, skipped = text_segments(lessons)
+    types = set(tokens)
+    type_band = {t: word_band(t, bands) for t in types}
+    type_syllables = {t: syllables(t) for t in types}
+    token_bands = [type_band[t] for t in tokens]
+    token_syllables = [type_syllables[t] for t in tokens]
+
+    paragraphs = {}
+    texts = {}
+    for lesson_id, source, ref, start, end, sentences in segments:
+        lexical = [band for band, name in zip(token_bands[start:end], skipped[start:end]) if not name]
+        if source == 'reading':
+            paragraphs[(lesson_id, ref)] = readability(token_bands[start:end], token_syllables[start:end], lexical, sentences)[0]
+        # Reading lessons are judged on the passage, listening lessons on their questions
+        text = texts.setdefault(lesson_id, {}).setdefault(source, [[], [], [], 0])
+        text[0] += token_bands[start:end]
+        text[1] += token_syllables[start:end]
+        text[2] += lexical
+        text[3] += sentences
+
+    summaries = {}
+    for lesson_id, data in lessons:
+        for para in data.get('reading', {}).get('paragraphs', []):
+            metrics = paragraphs.get((lesson_id, para.get('id', '')))
+            if metrics:
+                para['readability'] = metrics
+
+        vocab_levels = {}
+        vocab_bands = []
+        for word in data.get('vocabulary', []):
+            band = entry_band(word.get('word', ''), bands)
+            if band is None:
+                continue
+            word['band'] = band
+            word['cefr'] = LEVELS[band - 1]
+            vocab_bands.append(band)
+            vocab_levels[word['cefr']] = vocab_levels.get(word['cefr'], 0) + 1
+
+        summary = {}
+        parts = []
+        by_source = texts.get(lesson_id, {})
+        text = by_source.get('reading') or by_source.get('question')
+        if text:
+            metrics, text_level = readability(*text)
+            summary.update({key: metrics[key] for key in ('words', 'ease', 'grade', 'coverage')})
+            parts.append(text_level)
+        if vocab_bands:
+            parts.append(sum(vocab_bands) / len(vocab_bands))
+            summary['vocabulary'] = dict(sorted(vocab_levels.items()))
+        if parts:
+            score = sum(parts) / len(parts)
+            summaries[lesson_id] = {"cefr": level_name(score), "score": round(score, 2), **summary}
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score lesson, paragraph and vocabulary difficulty')
+    parser.add_argument('--dry-run', action='store_true', help='report without writing lessons or the manifest')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        with instrumentation.stage('json_load'):
+            published = list(lesson_config.iter_published())
+            bands = load_bands()
+
+        with instrumentation.stage('difficulty'):
+            summaries = score_lessons(((entry['id'], data) for entry, data in published), bands)
+
+        print(f"\n{'='*60}")
+        print(f"{'Lesson':<32} {'Level':<6} {'Score':>6} {'Grade':>6} {'Cover':>6}")
+        print(f"{'='*60}")
+        for entry, _ in published:
+            summary = summaries.get(entry['id'])
+            if summary:
+                grade = f"{summary['grade']:.1f}" if 'grade' in summary else '-'
+                coverage = f"{summary['coverage']:.1%}" if 'coverage' in summary else '-'
+                print(f"{entry['id']:<32} {summary['cefr']:<6} {summary['score']:>6.2f} {grade:>6} {coverage:>6}")
+
+        if args.dry_run:
+            return
+
+        lesson_config.write_published(published, root)
+
+        manifest_path = lesson_config.manifest_path()
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        for entry in manifest.get('lessons', []):
+            if entry.get('id') in summaries:
+                entry['difficulty'] = summaries[entry['id']]
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"\n✓ Updated {len(published)} lessons and the manifest")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Attach an in-context example sentence (exampleFromReading) to every vocabulary entry
+- corpus: every reading paragraph sentence and every fill-in-the-blank sentence
+  (with its answer filled in) across the course
+- occurrences are found with the morphology index (inflections + phrase templates),
+  one pass over the corpus, keeping only the best candidate per entry
+- preference: same lesson, reading over exercises, then a readable sentence length
+
+exampleFromReading: {text, start, end, source, lessonId, ref}
+(start/end are character offsets of the vocabulary occurrence in text)
+"""
+
+import argparse
+import re
+
+import build_morphology
+import instrumentation
+import lesson_config
+from build_search_index import SENTENCE_RE
+
+# Blanks are underscores, dots or ellipses (like FillInTheBlanksExercise's blankPattern)
+BLANK_RE = re.compile(r'_{3,}[.…]*|[.…]{2,}')
+
+# Sentences around this many words read best as examples
+IDEAL_WORDS = 16
+
+
+def sentence_spans(text):
+    """Sentences of a paragraph (split like build_search_index.split_sentences)"""
+    start = 0
+    for match in SENTENCE_RE.finditer(text):
+        yield text[start:match.start()].strip()
+        start = match.end()
+    yield text[start:].strip()
+
+
+def corpus_sentences(lessons):
+    """Yield (lesson_id, source, ref, sentence) over the whole course"""
+    for lesson_id, data in lessons:
+        for para in data.get('reading', {}).get('paragraphs', []):
+            for sentence in sentence_spans(para.get('text', '')):
+                if sentence:
+                    yield lesson_id, 'reading', para.get('id', ''), sentence
+
+        # Generated cloze questions are reading sentences, yielded above
+        for task in data.get('fillInTheBlanks', {}).get('tasks', []):
+            if task.get('generated'):
+                continue
+            for question in task.get('questions', []):
+                sentence = question.get('sentence', '')
+                answer = question.get('answer', '')
+                if sentence and answer and BLANK_RE.search(sentence):
+                    yield lesson_id, 'question', question.get('id', ''), BLANK_RE.sub(answer, sentence, count=1)
+
+
+def sentence_score(source, sentence):
+    """Quality of a sentence as an example, independent of the lesson"""
+    words = len(sentence.split())
+    return (1 if source == 'reading' else 0, -abs(words - IDEAL_WORDS))
+
+
+def find_examples(lessons, index):
+    """
+    Best example per vocabulary entry in one pass over the corpus
+    Returns {(lesson_id, headword key): example} for same-lesson hits and
+    {headword key: example} for the best hit anywhere in the course
+    """
+    in_lesson = {}
+    anywhere = {}
+    scores = {}
+
+    for lesson_id, source, ref, sentence in corpus_sentences(lessons):
+        quality = sentence_score(source, sentence)
+        for start, end, key in build_morphology.find_matches(sentence, index):
+            example = {
+                "text": sentence,
+                "start": start,
+                "end": end,
+                "source": source,
+                "lessonId": lesson_id,
+                "ref": ref
+            }
+            for slot, target in (((lesson_id, key), in_lesson), (key, anywhere)):
+                if slot not in scores or quality > scores[slot]:
+                    scores[slot] = quality
+                    target[slot] = example
+    return in_lesson, anywhere
+
+
+def attach_examples(lessons):
+    """
+    Set exampleFromReading on every vocabulary entry of (lesson_id, data) pairs
+    Returns the number of entries with an example
+    """
+    lessons = list(lessons)
+    index = build_morphology.build_morphology(lessons)[f"{build_morphology.MORPHOLOGY_DIR}/index.json"]
+    in_lesson, anywhere = find_examples(lessons, index)
+
+    attached = 0
+    for lesson_id, data in lessons:
+        for word in data.get('vocabulary', []):
+            key = build_morphology.headword_key(word.get('word', ''))
+            example = in_lesson.get((lesson_id, key)) or anywhere.get(key)
+            if example:
+                word['exampleFromReading'] = example
+                attached += 1
+            else:
+                word.pop('exampleFromReading', None)
+    return attached
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Attach reading example sentences to vocabulary')
+    parser.add_argument('--dry-run', action='store_true', help='report without writing lessons')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        with instrumentation.stage('json_load'):
+            published = list(lesson_config.iter_published())
+
+        lessons = [(entry['id'], data) for entry, data in published]
+        with instrumentation.stage('examples'):
+            attached = attach_examples(lessons)
+
+        total = sum(len(data.get('vocabulary', [])) for _, data in lessons)
+        print(f"✓ Examples: {attached}/{total} vocabulary entries")
+
+        if not args.dry_run:
+            lesson_config.write_published(published, root)
+            print(f"✓ Updated {len(published)} lessons")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Precompute game item banks for every lesson (runs after auto_fill_vocab.py)
+- ranked multiple-choice distractors drawn from the whole course, scored by
+  part of speech, length and meaning/definition similarity
+- deterministic scramble variants for the word scramble game
+- matching-game sets with no duplicated meanings
+
+Output: public/lessons/json/games/<lessonId>.json
+"""
+
+import argparse
+import random
+
+import instrumentation
+import lesson_config
+from build_search_index import fold_text, tokenize
+
+GAMES_DIR = 'games'
+BANK_VERSION = 1
+
+DISTRACTORS_PER_WORD = 6   # client picks 3 of these
+SCRAMBLES_PER_WORD = 3
+MATCHING_PAIRS = 7         # MatchingGame numPair
+
+# Distractors this similar to the answer are treated as ambiguous
+MAX_SIMILARITY = 0.6
+
+POS_ALIASES = {
+    'n': 'n', 'noun': 'n',
+    'v': 'v', 'verb': 'v',
+    'adj': 'adj', 'adjective': 'adj',
+    'adv': 'adv', 'adverb': 'adv',
+}
+
+
+def pos_set(pos):
+    """'n,v' / 'noun' -> {'n', 'v'}"""
+    parts = [p.strip().lower() for p in (pos or '').replace('/', ',').split(',')]
+    return {POS_ALIASES[p] for p in parts if p in POS_ALIASES}
+
+
+class BankEntry:
+    """Vocabulary entry with the features used for distractor ranking"""
+    __slots__ = ('lesson_id', 'id', 'word', 'meaning', 'pos', 'tokens', 'key')
+
+    def __init__(self, lesson_id, word):
+        self.lesson_id = lesson_id
+        self.id = word.get('id', '')
+        self.word = word.get('word', '')
+        self.meaning = word.get('meaning', '')
+        self.pos = pos_set(word.get('pos', ''))
+        self.tokens = set(tokenize(f"{self.meaning} {word.get('definition', '')}"))
+        self.key = fold_text(self.meaning).strip()
+
+
+def similarity(a, b):
+    """Jaccard similarity of meaning/definition tokens"""
+    if not a.tokens or not b.tokens:
+        return 0.0
+    return len(a.tokens & b.tokens) / len(a.tokens | b.tokens)
+
+
+def distractor_score(target, candidate):
+    """Higher is a better (plausible but wrong) distractor"""
+    if target.pos and candidate.pos:
+        pos_score = 1.0 if target.pos & candidate.pos else 0.0
+    else:
+        pos_score = 0.5
+
+    longest = max(len(target.meaning), len(candidate.meaning), 1)
+    length_score = 1.0 - abs(len(target.meaning) - len(candidate.meaning)) / longest
+
+    word_longest = max(len(target.word), len(candidate.word), 1)
+    word_length_score = 1.0 - abs(len(target.word) - len(candidate.word)) / word_longest
+
+    same_lesson = 0.5 if candidate.lesson_id == target.lesson_id else 0.0
+
+    return 3 * pos_score + 2 * length_score + word_length_score + 2 * similarity(target, candidate) + same_lesson
+
+
+def rank_distractors(target, pool):
+    """Best distinct meanings to offer against target"""
+    scored = []
+    for candidate in pool:
+        if candidate is target or not candidate.meaning:
+            continue
+        if candidate.key == target.key or fold_text(candidate.word) == fold_text(target.word):
+            continue
+        if similarity(target, candidate) > MAX_SIMILARITY:
+            continue
+        scored.append((distractor_score(target, candidate), candidate.meaning))
+
+    scored.sort(key=lambda item: -item[0])
+
+    distractors = []
+    seen = set()
+    for _, meaning in scored:
+        key = fold_text(meaning).strip()
+        if key in seen:
+            continue
+        seen.add(key)
+        distractors.append(meaning)
+        if len(distractors) == DISTRACTORS_PER_WORD:
+            break
+    return distractors
+
+
+def scramble_variants(word):
+    """Deterministic scrambles of a word that differ from it (same letters as gameUtils.scrambleWord)"""
+    letters = list(word)
+    rng = random.Random(word)
+    variants = []
+    for _ in range(50):
+        rng.shuffle(letters)
+        scrambled = ''.join(letters)
+        if scrambled != word and scrambled not in variants:
+            variants.append(scrambled)
+            if len(variants) == SCRAMBLES_PER_WORD:
+                break
+    return variants
+
+
+def matching_sets(entries):
+    """Split lesson vocabulary into matching rounds without repeated meanings"""
+    remaining = [e for e in entries if e.meaning]
+    random.Random(len(remaining)).shuffle(remaining)
+
+    sets = []
+    while remaining:
+        current, keys, leftover = [], set(), []
+        for entry in remaining:
+            if len(current) < MATCHING_PAIRS and entry.key not in keys:
+                current.append(entry.id)
+                keys.add(entry.key)
+            else:
+                leftover.append(entry)
+        if len(current) < 2:
+            break
+        sets.append(current)
+        remaining = leftover
+    return sets
+
+
+def build_banks(lessons):
+    """
+    Build item banks from (lesson_id, data) pairs
+    Returns {relative path: JSON data}
+    """
+    by_lesson = {}
+    pool = []
+    for lesson_id, data in lessons:
+        entries = [BankEntry(lesson_id, w) for w in data.get('vocabulary', []) if w.get('word')]
+        by_lesson[lesson_id] = entries
+        pool.extend(entries)
+
+    files = {}
+    for lesson_id, entries in by_lesson.items():
+        items = {}
+        for entry in entries:
+            items[entry.id] = {
+                "distractors": rank_distractors(entry, pool),
+                "scrambles": scramble_variants(entry.word)
+            }
+
+        files[f"{GAMES_DIR}/{lesson_id}.json"] = {
+            "version": BANK_VERSION,
+            "lessonId": lesson_id,
+            "items": items,
+            "matchingSets": matching_sets(entries)
+        }
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build game item banks from published lessons')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        with instrumentation.stage('banks'):
+            files = build_banks(
+                (entry['id'], data) for entry, data in lesson_config.iter_published()
+            )
+
+        with instrumentation.stage('serialize'):
+            lesson_config.write_artifacts(files, root)
+
+    total_items = sum(len(bank['items']) for bank in files.values())
+    print(f"✓ Game banks: {len(files)} lessons, {total_items} items → {root}/{GAMES_DIR}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Fill empty reading paragraph main ideas with an extractive summary (offline)
+- every paragraph sentence of the course is vectorized in one batch: TF-IDF over
+  content words, document frequencies counted across all lessons
+- within a paragraph, sentences rank by TextRank: PageRank over the cosine
+  similarity graph, biased towards the opening (topic) sentence
+- the best statement (a question only sets up the idea) becomes the main idea;
+  mainIdeaConfidence says how clearly it beat the others (0 = all sentences
+  alike, 1 = single sentence or clear winner)
+- mainIdeaGenerated keeps the extracted text: a main idea that differs from it (or
+  has none) is hand-written and never replaced, so correcting a generated idea in
+  the lesson JSON sticks; generated ones are recomputed and follow text edits
+
+Fields: paragraph.mainIdea, paragraph.mainIdeaConfidence, paragraph.mainIdeaGenerated
+"""
+
+import argparse
+import math
+
+import instrumentation
+import lesson_config
+from build_alignment import sentence_offsets
+from build_candidates import STOP_WORDS
+from build_search_index import tokenize
+
+DAMPING = 0.85
+ITERATIONS = 50
+TOLERANCE = 1e-6
+
+# Kept only while mainIdea is the extracted text
+GENERATED_FIELDS = ('mainIdeaConfidence', 'mainIdeaGenerated')
+
+# Personalization weight of sentence i is 1 / (i + 1) ** LEAD_BIAS (topic sentences tend to open)
+LEAD_BIAS = 2.0
+
+
+def content_terms(sentence):
+    """Content-word terms of a sentence (plural -s folded)"""
+    terms = []
+    for token in tokenize(sentence):
+        if token in STOP_WORDS or len(token) < 3 or token.isdigit():
+            continue
+        if token.endswith('s') and not token.endswith('ss') and len(token) > 3:
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+def sentence_vectors(sentence_terms):
+    """Unit TF-IDF vectors ({term: weight}) for a batch of term lists"""
+    doc_freq = {}
+    for terms in sentence_terms:
+        for term in set(terms):
+            doc_freq[term] = doc_freq.get(term, 0) + 1
+    total = len(sentence_terms)
+
+    vectors = []
+    for terms in sentence_terms:
+        vector = {}
+        for term in terms:
+            vector[term] = vector.get(term, 0) + 1
+        for term, count in vector.items():
+            vector[term] = (1 + math.log(count)) * math.log((1 + total) / (1 + doc_freq[term]))
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        vectors.append({term: w / norm for term, w in vector.items()})
+    return vectors
+
+
+def text_rank(vectors):
+    """Lead-biased PageRank scores (summing to 1) of a paragraph's sentence vectors"""
+    n = len(vectors)
+    if n == 1:
+        return [1.0]
+
+    weights = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            small, large = sorted((vectors[i], vectors[j]), key=len)
+            similarity = sum(w * large.get(term, 0.0) for term, w in small.items())
+            weights[i][j] = weights[j][i] = similarity
+    out_weight = [sum(row) for row in weights]
+
+    bias = [1 / (i + 1) ** LEAD_BIAS for i in range(n)]
+    bias_total = sum(bias)
+    bias = [b / bias_total for b in bias]
+
+    scores = list(bias)
+    for _ in range(ITERATIONS):
+        # Sentences sharing no words with the rest hand their score back to the bias
+        dangling = sum(scores[j] for j in range(n) if not out_weight[j])
+        updated = [
+            (1 - DAMPING) * bias[i] + DAMPING * (
+                dangling * bias[i]
+                + sum(scores[j] * weights[j][i] / out_weight[j] for j in range(n) if weights[j][i])
+            )
+            for i in range(n)
+        ]
+        delta = sum(abs(a - b) for a, b in zip(updated, scores))
+        scores = updated
+        if delta < TOLERANCE:
+            break
+    return scores
+
+
+def confidence(scores):
+    """How far the best score stands above the uniform 1/n (0..1)"""
+    n = len(scores)
+    if n == 1:
+        return 1.0
+    uniform = 1 / n
+    return max(0.0, (max(scores) - uniform) / (1 - uniform))
+
+
+def is_hand_written(para):
+    """True for a main idea someone wrote or corrected (it is not the extracted text)"""
+    return bool(para.get('mainIdea')) and para['mainIdea'] != para.get('mainIdeaGenerated')
+
+
+def main_idea_text(sentence):
+    """Sentence as a main idea (written without the final full stop, like the hand-made ones)"""
+    return sentence.strip().rstrip('.').strip()
+
+
+def rank_paragraphs(lessons):
+    """
+    Best sentence of every reading paragraph of (lesson_id, data) pairs
+    Returns {(lesson_id, paragraph id): (main idea, confidence)}
+    """
+    paragraphs = []      # (lesson_id, paragraph id, [sentences])
+    batch = []
+    for lesson_id, data in lessons:
+        for para in data.get('reading', {}).get('paragraphs', []):
+            text = para.get('text', '')
+            sentences = [text[start:end] for start, end in sentence_offsets(text)]
+            if sentences:
+                paragraphs.append((lesson_id, para.get('id'), sentences))
+                batch.extend(content_terms(s) for s in sentences)
+
+    vectors = sentence_vectors(batch)
+    ranked = {}
+    offset = 0
+    for lesson_id, para_id, sentences in paragraphs:
+        scores = text_rank(vectors[offset:offset + len(sentences)])
+        offset += len(sentences)
+        # A question introduces the idea rather than stating it
+        best = max(range(len(scores)), key=lambda i: (not sentences[i].endswith('?'), scores[i], -i))
+        ranked[(lesson_id, para_id)] = (main_idea_text(sentences[best]), round(confidence(scores), 2))
+    return ranked
+
+
+def fill_main_ideas(lessons):
+    """
+    Set the extracted main idea on every paragraph without a hand-written one
+    Returns (paragraphs generated, paragraphs written by hand)
+    """
+    lessons = list(lessons)
+    ranked = rank_paragraphs(lessons)
+    generated = 0
+    by_hand = 0
+    for lesson_id, data in lessons:
+        for para in data.get('reading', {}).get('paragraphs', []):
+            if is_hand_written(para):
+                for field in GENERATED_FIELDS:
+                    para.pop(field, None)
+                by_hand += 1
+                continue
+            result = ranked.get((lesson_id, para.get('id')))
+            if result:
+                para['mainIdea'], para['mainIdeaConfidence'] = result
+                para['mainIdeaGenerated'] = para['mainIdea']
+                generated += 1
+            else:
+                para['mainIdea'] = ''
+                for field in GENERATED_FIELDS:
+                    para.pop(field, None)
+    return generated, by_hand
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill empty paragraph main ideas with an extractive summary')
+    parser.add_argument('--dry-run', action='store_true', help='report without writing lessons')
+    parser.add_argument('--show', metavar='LESSON_ID',
+                        help='print the extracted main idea of every paragraph of a lesson (next to the current one)')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        with instrumentation.stage('json_load'):
+            published = list(lesson_config.iter_published())
+
+        lessons = [(entry['id'], data) for entry, data in published]
+        if args.show:
+            ranked = rank_paragraphs(lessons)
+            for lesson_id, data in lessons:
+                if lesson_id != args.show:
+                    continue
+                for para in data.get('reading', {}).get('paragraphs', []):
+                    idea, score = ranked.get((lesson_id, para.get('id')), ('', 0))
+                    print(f"\n{'='*60}\n{para.get('id')} (confidence {score:.2f})\n{'='*60}")
+                    print(f"  Extracted: {idea}")
+                    if is_hand_written(para):
+                        print(f"  Current:   {para['mainIdea']}")
+
+        with instrumentation.stage('main_ideas'):
+            generated, by_hand = fill_main_ideas(lessons)
+        print(f"✓ Main ideas: {generated} generated, {by_hand} written by hand")
+
+        if not args.dry_run and generated:
+            lesson_config.write_published(published, root)
+            print(f"✓ Updated {len(published)} lessons")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Extract the pictures embedded in the lesson DOCX and render sized derivatives
+- the converters attach an image reference {id, type, width, height} to the
+  paragraph, task or lesson a picture belongs to (id = content hash, so the same
+  picture in several lessons is stored once)
+- originals are copied from the DOCX zip; AVIF and WebP derivatives are rendered
+  at a few widths (never wider than the original) with ImageMagick or ffmpeg
+- each reference gets src plus variants [{src, type, width, height}] so clients
+  pick the smallest file that fits; files are named by hash and never change
+- pictures only referenced outside the document body (list bullets) are ignored
+
+Output: public/lessons/json/media/<hash>[-<width>].<ext> + media/manifest.json
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import struct
+import subprocess
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import instrumentation
+import lesson_config
+
+MEDIA_DIR = 'media'
+MANIFEST_VERSION = 1
+
+WIDTHS = (320, 640, 1280)
+QUALITY = 70
+
+# Derivative formats in <picture> order (smallest first): extension -> MIME type
+FORMATS = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+}
+
+# Raster types that can be measured and resized; others (emf, wmf, svg) are kept as is
+RASTER_TYPES = {'png', 'jpeg', 'gif', 'bmp', 'webp'}
+
+# Image tools in order of preference: name -> command resizing src into out (format from the extension)
+RESIZERS = {
+    'magick': lambda src, out, width, height: ['magick', f'{src}[0]', '-resize', f'{width}x{height}!',
+                                               '-strip', '-quality', str(QUALITY), out],
+    'convert': lambda src, out, width, height: ['convert', f'{src}[0]', '-resize', f'{width}x{height}!',
+                                                '-strip', '-quality', str(QUALITY), out],
+    'ffmpeg': lambda src, out, width, height: ['ffmpeg', '-loglevel', 'error', '-y', '-i', src,
+                                               '-frames:v', '1', '-vf', f'scale={width}:{height}',
+                                               *FFMPEG_CODECS[out.rsplit('.', 1)[-1]], out],
+}
+
+FFMPEG_CODECS = {
+    'avif': ['-c:v', 'libaom-av1', '-still-picture', '1', '-crf', '32'],
+    'webp': ['-c:v', 'libwebp', '-quality', str(QUALITY)],
+}
+
+
+def media_id(blob):
+    """Content hash naming a picture"""
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def image_type(name, blob):
+    """File type from the signature, falling back to the file extension"""
+    if blob.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if blob.startswith(b'\xff\xd8'):
+        return 'jpeg'
+    if blob[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if blob.startswith(b'BM'):
+        return 'bmp'
+    if blob[:4] == b'RIFF' and blob[8:12] == b'WEBP':
+        return 'webp'
+    ext = name.rsplit('.', 1)[-1].lower() if '.' in name else 'bin'
+    return 'jpeg' if ext == 'jpg' else ext
+
+
+def jpeg_size(blob):
+    """(width, height) from the first JPEG frame header"""
+    i = 2
+    while i + 9 < len(blob):
+        if blob[i] != 0xFF:
+            i += 1
+            continue
+        marker = blob[i + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+            i += 1 if marker == 0xFF else 2
+            continue
+        length = struct.unpack('>H', blob[i + 2:i + 4])[0]
+        # SOF0-SOF15 except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>HH', blob[i + 5:i + 9])
+            return width, height
+        i += 2 + length
+    return None
+
+
+def image_size(kind, blob):
+    """(width, height) read from the file header, None when unknown"""
+    try:
+        if kind == 'png':
+            return struct.unpack('>II', blob[16:24])
+        if kind == 'gif':
+            return struct.unpack('<HH', blob[6:10])
+        if kind == 'bmp':
+            width, height = struct.unpack('<ii', blob[18:26])
+            return width, abs(height)
+        if kind == 'jpeg':
+            return jpeg_size(blob)
+        if kind == 'webp':
+            chunk = blob[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', blob[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b'VP8L':
+                bits = int.from_bytes(blob[21:25], 'little')
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8X':
+                return int.from_bytes(blob[24:27], 'little') + 1, int.from_bytes(blob[27:30], 'little') + 1
+    except struct.error:
+        pass
+    return None
+
+
+def image_ref(name, blob):
+    """Reference stored in the lesson JSON for an embedded picture"""
+    kind = image_type(name, blob)
+    ref = {"id": media_id(blob), "type": kind}
+    size = image_size(kind, blob) if kind in RASTER_TYPES else None
+    if size and all(size):
+        ref['width'], ref['height'] = size
+    return ref
+
+
+def iter_image_refs(data):
+    """Image references of a lesson: lesson, reading paragraphs and exercise tasks"""
+    yield from data.get('images', [])
+    for para in data.get('reading', {}).get('paragraphs', []):
+        yield from para.get('images', [])
+    for task in data.get('fillInTheBlanks', {}).get('tasks', []):
+        yield from task.get('images', [])
+
+
+def docx_media(path):
+    """{media id: bytes} of the pictures stored in a DOCX file"""
+    blobs = {}
+    try:
+        with zipfile.ZipFile(path) as docx:
+            for name in docx.namelist():
+                if name.startswith('word/media/'):
+                    blob = docx.read(name)
+                    blobs[media_id(blob)] = blob
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"  ⚠ Cannot read media from {path}: {e}")
+    return blobs
+
+
+def find_tool():
+    """First available image tool name, or None"""
+    return next((name for name in RESIZERS if shutil.which(name)), None)
+
+
+def derivative_widths(width):
+    """Widths to render: the standard widths below the original, then the original (capped)"""
+    widths = [w for w in WIDTHS if w < width]
+    if width <= WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def render(tool, src, out, width, height):
+    """Resize one picture into a derivative; returns True on success"""
+    try:
+        subprocess.run(RESIZERS[tool](src, out, width, height), check=True, capture_output=True)
+        return os.path.exists(out)
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"  ✗ Failed to render {os.path.basename(out)}: {e}")
+        if os.path.exists(out):
+            os.remove(out)
+        return False
+
+
+def build_media(lessons, blobs, root, tool, workers=4, dry_run=False):
+    """
+    Copy originals and render missing derivatives under root/media, filling
+    src/variants into every image reference of the (lesson_id, data) pairs.
+    With dry_run nothing is copied or rendered (references and manifest are what a real run would give).
+    Returns ({relative manifest path: manifest}, number of files rendered).
+    """
+    out_dir = f"{root}/{MEDIA_DIR}"
+    entries = {}
+    refs = []
+    jobs = []
+
+    for lesson_id, data in lessons:
+        for ref in iter_image_refs(data):
+            refs.append(ref)
+            if ref['id'] in entries:
+                continue
+            blob = blobs.get(ref['id'])
+            if blob is None:
+                print(f"  ⚠ {lesson_id}: picture {ref['id']} not found in the DOCX sources")
+                continue
+
+            src = f"{MEDIA_DIR}/{ref['id']}.{ref['type']}"
+            if not dry_run and not os.path.exists(f"{root}/{src}"):
+                os.makedirs(out_dir, exist_ok=True)
+                with open(f"{root}/{src}", 'wb') as f:
+                    f.write(blob)
+
+            entry = {"src": src, "type": ref['type'], "variants": []}
+            width, height = ref.get('width'), ref.get('height')
+            if width and height:
+                entry['width'], entry['height'] = width, height
+                for ext, mime in FORMATS.items():
+                    for w in derivative_widths(width):
+                        variant = {
+                            "src": f"{MEDIA_DIR}/{ref['id']}-{w}.{ext}",
+                            "type": mime,
+                            "width": w,
+                            "height": max(1, round(height * w / width))
+                        }
+                        entry['variants'].append(variant)
+                        if not os.path.exists(f"{root}/{variant['src']}"):
+                            jobs.append((f"{root}/{src}", variant))
+            entries[ref['id']] = entry
+
+    rendered = 0
+    planned = set()
+    if jobs and tool and dry_run:
+        planned = {variant['src'] for _, variant in jobs}
+        rendered = len(jobs)
+    elif jobs and tool:
+        # Resizing runs in subprocesses, so threads render in parallel
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                lambda job: render(tool, job[0], f"{root}/{job[1]['src']}", job[1]['width'], job[1]['height']),
+                jobs
+            ))
+        rendered = sum(results)
+    elif jobs:
+        print(f"  ⚠ No image tool ({', '.join(RESIZERS)}) found, {len(jobs)} derivatives not rendered")
+
+    # Only derivatives present on disk (or that a dry run would render) are listed
+    for entry in entries.values():
+        entry['variants'] = [
+            v for v in entry['variants'] if v['src'] in planned or os.path.exists(f"{root}/{v['src']}")
+        ]
+    for ref in refs:
+        if ref['id'] in entries:
+            ref['src'] = entries[ref['id']]['src']
+            ref['variants'] = entries[ref['id']]['variants']
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "entries": entries
+    }
+    return {f"{MEDIA_DIR}/manifest.json": manifest}, rendered
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract DOCX pictures and render sized AVIF/WebP derivatives')
+    parser.add_argument('--workers', type=int, default=4, help='parallel render jobs')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    tool = find_tool()
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        sources = {lesson['id']: lesson['source'] for lesson in lesson_config.load_lessons()}
+        published = list(lesson_config.iter_published())
+
+        with instrumentation.stage('extract'):
+            blobs = {}
+            for entry, _ in published:
+                if entry['id'] in sources:
+                    blobs.update(docx_media(sources[entry['id']]))
+
+        with instrumentation.stage('render'):
+            files, rendered = build_media(
+                ((entry['id'], data) for entry, data in published),
+                blobs, root, tool, workers=args.workers
+            )
+
+        with instrumentation.stage('serialize'):
+            lesson_config.write_artifacts(files, root)
+        # Lessons carry the resolved src/variants of their pictures
+        lesson_config.write_published(
+            [(entry, data) for entry, data in published if any(True for _ in iter_image_refs(data))], root
+        )
+
+    manifest = files[f"{MEDIA_DIR}/manifest.json"]
+    print(f"✓ Media: {len(manifest['entries'])} pictures ({rendered} derivatives rendered"
+          f"{' with ' + tool if tool else ''}) → {root}/{MEDIA_DIR}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Offline morphology for matching text to vocabulary (no network, no NLP models)
+- inflections are generated forward from every headword (plural, 3rd person, -ed,
+  -ing, comparatives) plus a table of irregular verbs and nouns
+- phrase entries become templates: 'Rid sb of sth' -> rid * of,
+  '(Offer) superb (facilities)' -> ?offer superb
+- participles in phrases also match the verb ('get involved' ~ 'involves')
+- templates are indexed by their possible first lemma, so matching a text is
+  one dictionary lookup per token
+
+Output: public/lessons/json/morphology/index.json
+    forms     {inflected form: lemma}
+    patterns  [[headword, [token, ...]], ...]   token: lemma | a|b | * (slot) | ?optional
+    starts    {lemma: [pattern index, ...]}
+"""
+
+import argparse
+import re
+
+import instrumentation
+import lesson_config
+from build_game_banks import pos_set
+from build_search_index import fold_text
+
+MORPHOLOGY_DIR = 'morphology'
+INDEX_VERSION = 1
+
+# A slot (sb / sth) matches a noun phrase of up to this many tokens
+SLOT_MAX = 4
+
+# Longer "headwords" are sentences captured by the converter, not vocabulary
+MAX_PATTERN_TOKENS = 8
+
+SLOT_WORDS = {'sb', 'sth', 'smb', 'smth', 'sbd', 'someone', 'something', 'somebody', 'one'}
+
+# Function words are matched literally and never inflected
+FUNCTION_WORDS = {
+    'a', 'an', 'the', 'of', 'in', 'on', 'at', 'to', 'for', 'from', 'with', 'by', 'as',
+    'into', 'onto', 'about', 'up', 'down', 'out', 'off', 'over', 'and', 'or', 'not',
+    'your', 'my', 'his', 'her', 'their', 'our', 'its', 'no', 'all', 'than',
+}
+
+IRREGULAR_VERBS = {
+    'be': ['am', 'is', 'are', 'was', 'were', 'been', 'being'],
+    'have': ['has', 'had', 'having'],
+    'do': ['does', 'did', 'done', 'doing'],
+    'go': ['goes', 'went', 'gone', 'going'],
+    'arise': ['arose', 'arisen'], 'bear': ['bore', 'borne', 'born'], 'beat': ['beaten'],
+    'become': ['became'], 'begin': ['began', 'begun'], 'bend': ['bent'], 'bind': ['bound'],
+    'bite': ['bit', 'bitten'], 'blow': ['blew', 'blown'], 'break': ['broke', 'broken'],
+    'bring': ['brought'], 'build': ['built'], 'burn': ['burnt'], 'buy': ['bought'],
+    'catch': ['caught'], 'choose': ['chose', 'chosen'], 'come': ['came'], 'cost': [],
+    'cut': [], 'deal': ['dealt'], 'dig': ['dug'], 'draw': ['drew', 'drawn'],
+    'dream': ['dreamt'], 'drink': ['drank', 'drunk'], 'drive': ['drove', 'driven'],
+    'eat': ['ate', 'eaten'], 'fall': ['fell', 'fallen'], 'feed': ['fed'], 'feel': ['felt'],
+    'fight': ['fought'], 'find': ['found'], 'fly': ['flew', 'flown'], 'forbid': ['forbade', 'forbidden'],
+    'forget': ['forgot', 'forgotten'], 'forgive': ['forgave', 'forgiven'], 'freeze': ['froze', 'frozen'],
+    'get': ['got', 'gotten'], 'give': ['gave', 'given'], 'grow': ['grew', 'grown'],
+    'hang': ['hung'], 'hear': ['heard'], 'hide': ['hid', 'hidden'], 'hit': [], 'hold': ['held'],
+    'hurt': [], 'keep': ['kept'], 'know': ['knew', 'known'], 'lay': ['laid'], 'lead': ['led'],
+    'lean': ['leant'], 'learn': ['learnt'], 'leave': ['left'], 'lend': ['lent'], 'let': [],
+    'lie': ['lay', 'lain'], 'light': ['lit'], 'lose': ['lost'], 'make': ['made'], 'mean': ['meant'],
+    'meet': ['met'], 'mislead': ['misled'], 'overcome': ['overcame'], 'pay': ['paid'], 'put': [],
+    'quit': [], 'read': [], 'rid': [], 'ride': ['rode', 'ridden'], 'ring': ['rang', 'rung'],
+    'rise': ['rose', 'risen'], 'run': ['ran'], 'say': ['said'], 'see': ['saw', 'seen'],
+    'seek': ['sought'], 'sell': ['sold'], 'send': ['sent'], 'set': [], 'shake': ['shook', 'shaken'],
+    'shine': ['shone'], 'shoot': ['shot'], 'show': ['shown'], 'shrink': ['shrank', 'shrunk'],
+    'shut': [], 'sing': ['sang', 'sung'], 'sink': ['sank', 'sunk'], 'sit': ['sat'],
+    'sleep': ['slept'], 'slide': ['slid'], 'speak': ['spoke', 'spoken'], 'spend': ['spent'],
+    'spin': ['spun'], 'spread': [], 'stand': ['stood'], 'steal': ['stole', 'stolen'],
+    'stick': ['stuck'], 'strike': ['struck'], 'swim': ['swam', 'swum'], 'take': ['took', 'taken'],
+    'teach': ['taught'], 'tear': ['tore', 'torn'], 'tell': ['told'], 'think': ['thought'],
+    'throw': ['threw', 'thrown'], 'understand': ['understood'], 'undertake': ['undertook', 'undertaken'],
+    'upset': [], 'wake': ['woke', 'woken'], 'wear': ['wore', 'worn'], 'win': ['won'],
+    'withdraw': ['withdrew', 'withdrawn'], 'write': ['wrote', 'written'],
+}
+
+IRREGULAR_NOUNS = {
+    'child': ['children'], 'person': ['people'], 'man': ['men'], 'woman': ['women'],
+    'foot': ['feet'], 'tooth': ['teeth'], 'mouse': ['mice'], 'goose': ['geese'],
+    'crisis': ['crises'], 'analysis': ['analyses'], 'basis': ['bases'], 'thesis': ['theses'],
+    'hypothesis': ['hypotheses'], 'phenomenon': ['phenomena'], 'criterion': ['criteria'],
+    'medium': ['media'], 'datum': ['data'], 'bacterium': ['bacteria'], 'fungus': ['fungi'],
+    'nucleus': ['nuclei'], 'cactus': ['cacti'], 'life': ['lives'], 'knife': ['knives'],
+    'leaf': ['leaves'], 'wife': ['wives'], 'half': ['halves'], 'shelf': ['shelves'],
+    'wolf': ['wolves'], 'thief': ['thieves'],
+}
+
+IRREGULAR_ADJECTIVES = {
+    'good': ['better', 'best'], 'bad': ['worse', 'worst'], 'far': ['further', 'farther', 'furthest'],
+    'little': ['less', 'least'], 'many': ['more', 'most'], 'much': ['more', 'most'],
+}
+
+VOWEL_RE = re.compile(r'[aeiou]+')
+CVC_RE = re.compile(r'[^aeiou][aeiou][^aeiouwxy]$')
+TOKEN_RE = re.compile(r"[^\W_]+(?:['’][^\W_]+)?")
+
+
+def s_forms(word):
+    """Plural / third person forms"""
+    if re.search(r'(s|x|z|ch|sh)$', word):
+        return {word + 'es'}
+    if re.search(r'[^aeiou]y$', word):
+        return {word[:-1] + 'ies'}
+    if word.endswith('o'):
+        return {word + 's', word + 'es'}
+    return {word + 's'}
+
+
+def doubled(word):
+    """Stems with the final consonant doubled ('plan' -> 'plann'), plus the plain stem"""
+    stems = {word}
+    if CVC_RE.search(word) and len(VOWEL_RE.findall(word)) <= 2:
+        stems.add(word + word[-1])
+    return stems
+
+
+def verb_forms(word):
+    """-s, -ed and -ing forms of a regular verb"""
+    forms = s_forms(word)
+    if word.endswith('e'):
+        forms.add(word + 'd')
+    elif re.search(r'[^aeiou]y$', word):
+        forms.add(word[:-1] + 'ied')
+    else:
+        forms.update(stem + 'ed' for stem in doubled(word))
+
+    if word.endswith('ie'):
+        forms.add(word[:-2] + 'ying')
+    elif word.endswith('e') and not word.endswith(('ee', 'ye', 'oe')):
+        forms.add(word[:-1] + 'ing')
+    else:
+        forms.update(stem + 'ing' for stem in doubled(word))
+    return forms
+
+
+def adjective_forms(word):
+    """Comparative and superlative of short adjectives"""
+    if len(VOWEL_RE.findall(word)) > 2:
+        return set()
+    if word.endswith('e'):
+        return {word + 'r', word + 'st'}
+    if re.search(r'[^aeiou]y$', word):
+        return {word[:-1] + 'ier', word[:-1] + 'iest'}
+    return {stem + suffix for stem in doubled(word) for suffix in ('er', 'est')}
+
+
+def inflect(lemma, pos=None):
+    """All inflected forms of a lemma; pos is a pos_set (empty = noun and verb)"""
+    if lemma in FUNCTION_WORDS or len(lemma) < 2:
+        return set()
+    pos = pos or {'n', 'v'}
+
+    forms = set()
+    if 'n' in pos:
+        forms.update(IRREGULAR_NOUNS.get(lemma) or s_forms(lemma))
+    if 'v' in pos:
+        forms.update(verb_forms(lemma))
+        forms.update(IRREGULAR_VERBS.get(lemma, []))
+    if 'adj' in pos:
+        forms.update(IRREGULAR_ADJECTIVES.get(lemma) or adjective_forms(lemma))
+    forms.discard(lemma)
+    return forms
+
+
+def headword_key(text):
+    """Key that identifies a vocabulary entry ('Be/ get involved (in sth)' -> 'be/ get involved (in sth)')"""
+    return ' '.join(fold_text(text).split())
+
+
+def participle_alternatives(token):
+    """'involved' -> 'involved|involve|involv' (the spurious stem inflects harmlessly)"""
+    core = token.lstrip('?')
+    if len(core) <= 5 or not core.endswith('ed') or core.endswith('eed') or '|' in core:
+        return token
+    stem = core[:-2]
+    bases = [core[:-1], stem]
+    if len(stem) > 2 and stem[-1] == stem[-2]:
+        bases.append(stem[:-1])   # planned -> plan
+    elif stem.endswith('i'):
+        bases.append(stem[:-1] + 'y')  # studied -> study
+    return token + '|' + '|'.join(bases)
+
+
+def compile_pattern(text):
+    """
+    Template tokens of a headword:
+    'Rid sb of sth' -> ['rid', '*', 'of']
+    '(Offer) superb (facilities)' -> ['?offer', 'superb']
+    'Be/ get involved (in sth)' -> ['be|get', 'involved|involve|involv']
+    """
+    # 'Convert A into B': capital A/B placeholders are slots when both appear
+    if re.search(r'\bA\b', text) and re.search(r'\bB\b', text):
+        text = re.sub(r'\b[AB]\b', 'sth', text)
+
+    tokens = []
+    optional = 0
+    join_next = False
+    for part in re.findall(r"[()/]|[a-z]+(?:['’][a-z]+)?", fold_text(text)):
+        if part == '(':
+            optional += 1
+        elif part == ')':
+            optional = max(0, optional - 1)
+        elif part == '/':
+            join_next = bool(tokens)
+        else:
+            token = '*' if re.sub(r"['’]s$", '', part) in SLOT_WORDS else part
+            if join_next and token != '*' and tokens[-1].lstrip('?') != '*':
+                tokens[-1] += '|' + token
+            else:
+                tokens.append(('?' if optional else '') + token)
+            join_next = False
+
+    # 'get involved' should also match 'involves': add the candidate base forms
+    if len(tokens) > 1:
+        tokens = [participle_alternatives(token) for token in tokens]
+
+    # Leading/trailing slots and optional parts never decide a match
+    while tokens and (tokens[-1].lstrip('?') == '*' or tokens[-1].startswith('?')):
+        tokens.pop()
+    while tokens and tokens[0] == '*':
+        tokens.pop(0)
+    return tokens
+
+
+def first_lemmas(pattern):
+    """Lemmas a text may start with to match the pattern"""
+    lemmas = set()
+    for token in pattern:
+        core = token.lstrip('?')
+        if core != '*':
+            lemmas.update(core.split('|'))
+        if not token.startswith('?'):
+            break
+    return lemmas
+
+
+def build_morphology(lessons):
+    """
+    Build the morphology index from (lesson_id, data) pairs
+    Returns {relative path: JSON data}
+    """
+    patterns = {}
+    lemma_pos = {}
+    for _, data in lessons:
+        for word in data.get('vocabulary', []):
+            key = headword_key(word.get('word', ''))
+            if not key or key in patterns:
+                continue
+            pattern = compile_pattern(word['word'])
+            if not pattern or len(pattern) > MAX_PATTERN_TOKENS:
+                continue
+            patterns[key] = pattern
+
+            # The entry's part of speech applies to a single-word headword only
+            pos = pos_set(word.get('pos', '')) if len(pattern) == 1 else set()
+            for token in pattern:
+                for lemma in token.lstrip('?').split('|'):
+                    if lemma != '*':
+                        lemma_pos.setdefault(lemma, set()).update(pos or {'n', 'v'})
+
+    forms = {}
+    for lemma in sorted(lemma_pos):
+        for form in sorted(inflect(lemma, lemma_pos[lemma])):
+            # A course lemma is never rewritten to another lemma
+            if form not in lemma_pos:
+                forms.setdefault(form, lemma)
+
+    pattern_list = sorted(patterns.items())
+    starts = {}
+    for idx, (_, pattern) in enumerate(pattern_list):
+        for lemma in first_lemmas(pattern):
+            starts.setdefault(lemma, []).append(idx)
+
+    return {f"{MORPHOLOGY_DIR}/index.json": {
+        "version": INDEX_VERSION,
+        "slotMax": SLOT_MAX,
+        "forms": dict(sorted(forms.items())),
+        "patterns": [[key, pattern] for key, pattern in pattern_list],
+        "starts": dict(sorted(starts.items()))
+    }}
+
+
+def tokenize_spans(text):
+    """(folded token, start, end) for every word in the original text"""
+    return [(fold_text(m.group(0)).replace('’', "'"), m.start(), m.end()) for m in TOKEN_RE.finditer(text)]
+
+
+def match_pattern(lemmas, i, pattern, j=0):
+    """End token index if pattern[j:] matches lemmas from i, else -1"""
+    if j == len(pattern):
+        return i
+    token = pattern[j]
+    optional = token.startswith('?')
+    core = token.lstrip('?')
+
+    if core == '*':
+        for n in range(1, SLOT_MAX + 1):
+            if i + n <= len(lemmas):
+                end = match_pattern(lemmas, i + n, pattern, j + 1)
+                if end >= 0:
+                    return end
+    elif i < len(lemmas) and lemmas[i] in core.split('|'):
+        end = match_pattern(lemmas, i + 1, pattern, j + 1)
+        if end >= 0:
+            return end
+
+    return match_pattern(lemmas, i, pattern, j + 1) if optional else -1
+
+
+def find_matches(text, index):
+    """
+    Vocabulary occurrences in a text: [(start, end, headword key)] by character offset
+    Longest match wins where matches overlap.
+    """
+    spans = tokenize_spans(text)
+    lemmas = [index['forms'].get(token, token) for token, _, _ in spans]
+    patterns = index['patterns']
+
+    found = []
+    for i, lemma in enumerate(lemmas):
+        for idx in index['starts'].get(lemma, []):
+            key, pattern = patterns[idx]
+            end = match_pattern(lemmas, i, pattern)
+            if end > i:
+                found.append((i, end, key))
+
+    found.sort(key=lambda m: (-(m[1] - m[0]), m[0]))
+    taken = set()
+    matches = []
+    for start, end, key in found:
+        if taken.isdisjoint(range(start, end)):
+            taken.update(range(start, end))
+            matches.append((spans[start][1], spans[end - 1][2], key))
+    return sorted(matches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the inflection/phrase index from published lessons')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        with instrumentation.stage('morphology'):
+            files = build_morphology(
+                (entry['id'], data) for entry, data in lesson_config.iter_published()
+            )
+
+        with instrumentation.stage('serialize'):
+            lesson_config.write_artifacts(files, root)
+
+    index = files[f"{MORPHOLOGY_DIR}/index.json"]
+    print(f"✓ Morphology: {len(index['forms'])} inflected forms, {len(index['patterns'])} patterns "
+          f"→ {root}/{MORPHOLOGY_DIR}/")
+
+
+if __name__ == "__main__":
+    main()
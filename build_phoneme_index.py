@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Normalize IPA pronunciations and build a course-wide phoneme index
+- canonical IPA: no slashes, syllable dots or diacritics, one symbol per sound
+  (ʧ → tʃ, ɹ → r, ɛ → e, g → ɡ, ':' → ː, ...); junk captured between slashes is dropped
+- variant tag: 'us' (ɝ ɚ t̬ oʊ, post-vocalic r), 'uk' (əʊ ɒ ɪə eə ʊə), 'mixed' or ''
+- phrases whose IPA covers only one word are composed from single-word entries
+  elsewhere in the course, or flagged with ipaPartial
+- phoneme index: phoneme -> words, plus minimal pairs between single words
+
+Vocabulary entries get: ipa, ipaVariant (and ipaPartial when incomplete)
+Output: public/lessons/json/phonemes/index.json
+"""
+
+import argparse
+import re
+import unicodedata
+
+import instrumentation
+import lesson_config
+from build_search_index import fold_text
+
+PHONEME_DIR = 'phonemes'
+INDEX_VERSION = 1
+
+# Lookalike symbols and notation differences between dictionaries
+REPLACEMENTS = [
+    ('ʧ', 'tʃ'), ('ʤ', 'dʒ'), ('ɹ', 'r'), ('ɫ', 'l'), ('g', 'ɡ'),
+    ('ɛ', 'e'), ('ɨ', 'ɪ'), ('ᵻ', 'ɪ'), ("'", 'ˈ'), (':', 'ː'),
+]
+
+# Removed from the canonical form (syllable marks, tie bars, optional-sound brackets)
+STRIP_CHARS = set('./·‿()[]͜͡')
+
+IPA_LETTERS = set('abdefhijklmnoprstuvwzæðŋɑɒɔəɚɜɝɡɪʃʊʌʒθˈˌː ')
+
+# Multi-symbol phonemes, longest first
+MULTI_PHONEMES = sorted([
+    'aɪ', 'aʊ', 'ɔɪ', 'eɪ', 'oʊ', 'əʊ', 'ɪə', 'eə', 'ʊə', 'tʃ', 'dʒ',
+    'iː', 'uː', 'ɑː', 'ɔː', 'ɜː', 'ɝː',
+], key=len, reverse=True)
+
+US_MARKERS = re.compile(r'[ɝɚ]|̬|oʊ')
+US_R = re.compile(r'[ɑɔɪeɛʊəɜ]ː?[rɹ](?![aeiouæɑɒɔəɛɜɪʊʌ])')
+UK_MARKERS = re.compile(r'əʊ|ɒ|ɪə|eə|ʊə')
+
+# Placeholders in phrase entries that are never pronounced
+PHRASE_FILLERS = {'sth', 'sb', "sb's", 'sbd', 'smth', 'st'}
+
+
+def ipa_variant(raw):
+    """'us', 'uk', 'mixed' or '' (neutral) from the raw transcription"""
+    us = bool(US_MARKERS.search(raw))
+    uk = bool(UK_MARKERS.search(raw))
+    # A post-vocalic r only marks US when nothing is clearly UK ('ˌdɪs.əˈpɪər')
+    us = us or (not uk and bool(US_R.search(raw)))
+    if us and uk:
+        return 'mixed'
+    return 'us' if us else 'uk' if uk else ''
+
+
+def canonical_ipa(raw):
+    """Canonical IPA of a raw pronunciation ('/ˈpɝː.pəs/' -> 'ˈpɝːpəs'), '' if not IPA"""
+    text = unicodedata.normalize('NFD', (raw or '').strip())
+    text = ''.join(c for c in text if not unicodedata.combining(c) and c not in STRIP_CHARS)
+    for old, new in REPLACEMENTS:
+        text = text.replace(old, new)
+    text = ' '.join(text.split())
+
+    # Words captured between slashes ('/ on a voluntary basis /') are not IPA
+    if not text or any(c not in IPA_LETTERS for c in text):
+        return ''
+    if ' ' in text and text.isascii():
+        return ''
+    return unicodedata.normalize('NFC', text)
+
+
+def phonemes(ipa):
+    """Split canonical IPA into phonemes (stress marks and spaces dropped)"""
+    result = []
+    i = 0
+    while i < len(ipa):
+        if ipa[i] in 'ˈˌ ':
+            i += 1
+            continue
+        multi = next((m for m in MULTI_PHONEMES if ipa.startswith(m, i)), None)
+        if multi:
+            result.append(multi)
+            i += len(multi)
+        elif ipa[i] == 'ː' and result:
+            result[-1] += 'ː'
+            i += 1
+        else:
+            result.append(ipa[i])
+            i += 1
+    return result
+
+
+def phrase_words(text):
+    """Pronounced words of a vocabulary entry ('(Offer) superb (facilities)' -> [...])"""
+    words = re.findall(r"[a-z]+(?:['-][a-z]+)*", fold_text(text))
+    return [w for w in words if w not in PHRASE_FILLERS]
+
+
+def normalize_entry(word, lexicon):
+    """Set ipa / ipaVariant / ipaPartial on one vocabulary entry"""
+    raw = word.get('pronunciation', '')
+    ipa = canonical_ipa(raw)
+    variant = ipa_variant(raw) if ipa else ''
+    partial = False
+
+    words = phrase_words(word.get('word', ''))
+    if len(words) > 1 and ' ' not in ipa:
+        # Pharmaceutical research: /ˌfɑːr.məˈsuː.t̬ɪ.kəl/ covers one word only
+        parts = [lexicon.get(w) for w in words]
+        if all(parts):
+            ipa = ' '.join(part[0] for part in parts)
+            variants = {part[1] for part in parts} - {''}
+            variant = variants.pop() if len(variants) == 1 else ('mixed' if variants else '')
+        elif ipa:
+            partial = True
+
+    word['ipa'] = ipa
+    word['ipaVariant'] = variant
+    if partial:
+        word['ipaPartial'] = True
+    else:
+        word.pop('ipaPartial', None)
+
+
+def build_lexicon(lessons):
+    """Single word -> (canonical ipa, variant) from every lesson"""
+    lexicon = {}
+    for _, data in lessons:
+        for word in data.get('vocabulary', []):
+            words = phrase_words(word.get('word', ''))
+            ipa = canonical_ipa(word.get('pronunciation', ''))
+            if len(words) == 1 and ipa and ' ' not in ipa:
+                lexicon.setdefault(words[0], (ipa, ipa_variant(word['pronunciation'])))
+    return lexicon
+
+
+def normalize_lessons(lessons):
+    """Normalize pronunciations in place across (lesson_id, data) pairs"""
+    lessons = list(lessons)
+    lexicon = build_lexicon(lessons)
+    for _, data in lessons:
+        for word in data.get('vocabulary', []):
+            normalize_entry(word, lexicon)
+    return lessons
+
+
+def minimal_pairs(words):
+    """Index pairs of single words whose phonemes differ in exactly one position"""
+    buckets = {}
+    for idx, (text, ipa, _, _) in enumerate(words):
+        if ' ' in ipa or len(phrase_words(text)) != 1:
+            continue
+        sounds = phonemes(ipa)
+        for i in range(len(sounds)):
+            key = tuple(sounds[:i]) + ('_',) + tuple(sounds[i + 1:])
+            buckets.setdefault(key, []).append((idx, sounds[i]))
+
+    pairs = set()
+    for members in buckets.values():
+        for n, (a, sound_a) in enumerate(members):
+            for b, sound_b in members[n + 1:]:
+                # Spelling variants of one word ('Convert' kənˈvɜːt / kənˈvɝːt) are not pairs
+                if sound_a != sound_b and phrase_words(words[a][0]) != phrase_words(words[b][0]):
+                    pairs.add((a, b, sound_a, sound_b))
+    return sorted(pairs)
+
+
+def build_phoneme_index(lessons):
+    """
+    Build the phoneme index from normalized (lesson_id, data) pairs
+    Returns {relative path: JSON data}
+    """
+    words = []    # [word, ipa, variant, [[lessonId, wordId], ...]]
+    by_key = {}
+    for lesson_id, data in lessons:
+        for word in data.get('vocabulary', []):
+            if not word.get('ipa'):
+                continue
+            key = (fold_text(word['word']).strip(), word['ipa'])
+            if key not in by_key:
+                by_key[key] = len(words)
+                words.append([word['word'], word['ipa'], word.get('ipaVariant', ''), []])
+            words[by_key[key]][3].append([lesson_id, word.get('id', '')])
+
+    index = {}
+    for idx, (_, ipa, _, _) in enumerate(words):
+        for sound in dict.fromkeys(phonemes(ipa)):
+            index.setdefault(sound, []).append(idx)
+
+    return {f"{PHONEME_DIR}/index.json": {
+        "version": INDEX_VERSION,
+        "words": words,
+        "phonemes": dict(sorted(index.items())),
+        "minimalPairs": [list(pair) for pair in minimal_pairs(words)]
+    }}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the phoneme index from published lessons')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        with instrumentation.stage('normalize'):
+            lessons = normalize_lessons(
+                (entry['id'], data) for entry, data in lesson_config.iter_published()
+            )
+
+        with instrumentation.stage('index'):
+            files = build_phoneme_index(lessons)
+
+        with instrumentation.stage('serialize'):
+            lesson_config.write_artifacts(files, root)
+
+    index = files[f"{PHONEME_DIR}/index.json"]
+    print(f"✓ Phoneme index: {len(index['words'])} words, {len(index['phonemes'])} phonemes, "
+          f"{len(index['minimalPairs'])} minimal pairs → {root}/{PHONEME_DIR}/")
+    print("  ℹ Run 'python run_pipeline.py --stages phonemes' to store ipa fields in the lessons")
+
+
+if __name__ == "__main__":
+    main()
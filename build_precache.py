@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Precache manifest and packed offline bundles for the service worker (public/sw.js)
+- every published file (lessons, game banks, search shards, indexes, audio, media)
+  is listed with its content hash and size
+- files are grouped into priority tiers: core (manifest and course-wide indexes),
+  one group per unit (its lessons, game banks, audio clips and pictures; the app
+  asks for the current unit first) and search shards last
+- each group is packed into one immutable file, so a group installs with a single
+  request: "ELPK", uint32 header length (little endian), JSON header
+  {"files": [{url, size, type}]}, then the file bodies in header order
+- runs after everything else has been written (last pipeline stage)
+
+Output: public/lessons/json/precache.json + offline/<group>.<hash>.pack
+"""
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import struct
+
+import build_audio
+import build_media
+import instrumentation
+import lesson_config
+
+PRECACHE_FILE = 'precache.json'
+OFFLINE_DIR = 'offline'
+PRECACHE_VERSION = 1
+PACK_MAGIC = b'ELPK'
+
+# Not precached: generated packs, export bundles, delta patches (only fetched on update)
+EXCLUDED_DIRS = {OFFLINE_DIR, 'bundles', 'versions'}
+
+# Course-wide files every page may need
+CORE_FILES = {
+    'manifest.json',
+    'vocabulary.json',
+    'search/index.json',
+    'audio/manifest.json',
+    'media/manifest.json',
+    'phonemes/index.json',
+    'morphology/index.json',
+}
+
+PRIORITY_CORE = 0
+PRIORITY_UNIT = 1
+PRIORITY_SEARCH = 2
+
+CONTENT_TYPES = {
+    '.json': 'application/json',
+    '.opus': 'audio/ogg',
+    '.mp3': 'audio/mpeg',
+    '.avif': 'image/avif',
+    '.webp': 'image/webp',
+}
+
+
+def content_type(path):
+    """MIME type the service worker serves a file with"""
+    ext = os.path.splitext(path)[1].lower()
+    return CONTENT_TYPES.get(ext) or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+def file_hash(path):
+    """Content hash of a published file"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def published_files(root):
+    """Relative paths of every precachable file under the lessons root"""
+    files = []
+    for folder, dirs, names in os.walk(root):
+        rel_folder = os.path.relpath(folder, root).replace(os.sep, '/')
+        if rel_folder == '.':
+            rel_folder = ''
+            dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+        for name in names:
+            rel_path = f"{rel_folder}/{name}" if rel_folder else name
+            if rel_path != PRECACHE_FILE:
+                files.append(rel_path)
+    return sorted(files)
+
+
+def unit_of(entry, data):
+    """Unit number of a lesson ('Unit 4' -> 4, unknown -> 0)"""
+    match = re.search(r'\d+', entry.get('unit') or data.get('metadata', {}).get('unit', ''))
+    return int(match.group(0)) if match else 0
+
+
+def lesson_files(lesson_id, file_name, data, audio_entries):
+    """Files a lesson needs offline besides the shared indexes"""
+    files = [file_name, f"games/{lesson_id}.json"]
+    for key in build_audio.collect_texts([(lesson_id, data)]):
+        if key in audio_entries:
+            files.append(f"{build_audio.AUDIO_DIR}/{audio_entries[key]}")
+    for ref in build_media.iter_image_refs(data):
+        files.extend(src for src in [ref.get('src')] + [v['src'] for v in ref.get('variants', [])] if src)
+    return files
+
+
+def load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def group_files(root, published):
+    """[(group name, priority, unit, [relative paths])] covering every published file"""
+    available = set(published_files(root))
+    audio_entries = load_json(f"{root}/{build_audio.AUDIO_DIR}/manifest.json").get('entries', {})
+
+    units = {}
+    for entry, data in published:
+        unit = unit_of(entry, data)
+        files = lesson_files(entry['id'], entry['fileName'], data, audio_entries)
+        units.setdefault(unit, []).extend(f for f in files if f in available)
+
+    groups = [('core', PRIORITY_CORE, None, sorted(available & CORE_FILES))]
+    claimed = set(groups[0][3])
+    for unit in sorted(units):
+        files = sorted(set(units[unit]))
+        groups.append((f"unit-{unit}", PRIORITY_UNIT, unit, files))
+        claimed.update(files)
+
+    rest = sorted(available - claimed)
+    if rest:
+        groups.append(('search', PRIORITY_SEARCH, None, rest))
+    return groups
+
+
+def write_pack(root, name, files, hashes):
+    """Pack a group's files into offline/<name>.<hash>.pack; returns (relative path, hash, size)"""
+    pack_hash = hashlib.sha1(''.join(f"{f}:{hashes[f]}\n" for f in files).encode('utf-8')).hexdigest()[:16]
+    rel_path = f"{OFFLINE_DIR}/{name}.{pack_hash}.pack"
+    path = f"{root}/{rel_path}"
+    if not os.path.exists(path):
+        header = json.dumps({"files": [
+            {"url": f, "size": os.path.getsize(f"{root}/{f}"), "type": content_type(f)} for f in files
+        ]}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'wb') as out:
+            out.write(PACK_MAGIC + struct.pack('<I', len(header)) + header)
+            for f in files:
+                with open(f"{root}/{f}", 'rb') as src:
+                    out.write(src.read())
+        os.replace(path + '.tmp', path)
+    return rel_path, pack_hash, os.path.getsize(path)
+
+
+def build_precache(root=None, published=None):
+    """Write the packs and precache.json; returns the precache manifest"""
+    root = root or lesson_config.lessons_root()
+    if published is None:
+        published = list(lesson_config.iter_published())
+
+    groups = group_files(root, published)
+    paths = sorted({f for _, _, _, files in groups for f in files})
+    hashes = {f: file_hash(f"{root}/{f}") for f in paths}
+
+    precache = {
+        "version": PRECACHE_VERSION,
+        "files": {f: {"hash": hashes[f], "size": os.path.getsize(f"{root}/{f}")} for f in paths},
+        "groups": []
+    }
+    packs = set()
+    for name, priority, unit, files in groups:
+        pack, pack_hash, size = write_pack(root, name, files, hashes)
+        packs.add(pack)
+        group = {"name": name, "priority": priority, "files": files,
+                 "pack": {"url": pack, "hash": pack_hash, "size": size}}
+        if unit is not None:
+            group['unit'] = unit
+        precache['groups'].append(group)
+
+    # Packs of earlier builds
+    offline_dir = f"{root}/{OFFLINE_DIR}"
+    for name in os.listdir(offline_dir):
+        if f"{OFFLINE_DIR}/{name}" not in packs:
+            os.remove(f"{offline_dir}/{name}")
+
+    lesson_config.write_artifacts({PRECACHE_FILE: precache}, root)
+    return precache
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write the precache manifest and offline packs')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumentation.session(args):
+        with instrumentation.stage('precache'):
+            precache = build_precache()
+
+    print(f"\n{'='*60}")
+    print("Precache Summary:")
+    print(f"{'='*60}")
+    for group in precache['groups']:
+        print(f"✓ {group['name']:8} priority {group['priority']}: {len(group['files'])} files, "
+              f"{group['pack']['size'] / 1024:.1f} KB → {group['pack']['url']}")
+    total = sum(f['size'] for f in precache['files'].values())
+    print(f"  Total: {len(precache['files'])} files, {total / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Build a static full-text search index over all lessons
+- documents: reading sentences, vocabulary entries and fill-in-the-blank sentences
+- Vietnamese-aware normalization: lowercase + diacritics folding (đ → d)
+- positional postings (delta-encoded) so the app can answer phrase queries
+- sharded by first character of the term; documents stored in fixed-size chunks
+
+Output (public/lessons/json/search/):
+    index.json          lessons, kinds, shard list, document chunk size
+    terms-<c>.json      {term: [docDelta, count, posDelta, ...]}
+    docs-<n>.json       [[lessonIdx, kind, ref, text], ...]
+"""
+
+import argparse
+import re
+import unicodedata
+
+import instrumentation
+import lesson_config
+
+SEARCH_DIR = 'search'
+INDEX_VERSION = 1
+DOCS_PER_CHUNK = 400
+
+# Document kinds (index in this list is stored in each document)
+KINDS = ['vocabulary', 'reading', 'question']
+
+# Position gap between fields of one document so phrases never span fields
+FIELD_GAP = 8
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def fold_text(text):
+    """Lowercase and strip diacritics ('Bệnh tật' -> 'benh tat')"""
+    text = text.lower().replace('đ', 'd')
+    decomposed = unicodedata.normalize('NFD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    """Folded tokens of a text"""
+    return TOKEN_RE.findall(fold_text(text))
+
+
+def split_sentences(text):
+    """Split paragraph text into sentences"""
+    return [s.strip() for s in SENTENCE_RE.split(text) if s.strip()]
+
+
+def lesson_documents(data):
+    """
+    Yield (kind, ref, fields) for every searchable unit of a lesson
+    fields: list of texts indexed with a position gap between them
+    """
+    for word in data.get('vocabulary', []):
+        if word.get('word'):
+            fields = [word['word'], word.get('meaning', ''), word.get('definition', '')]
+            yield 'vocabulary', word.get('id', ''), [f for f in fields if f]
+
+    for para in data.get('reading', {}).get('paragraphs', []):
+        for sentence in split_sentences(para.get('text', '')):
+            yield 'reading', para.get('id', ''), [sentence]
+
+    # Generated cloze tasks (build_cloze) repeat reading sentences already indexed above
+    for task in data.get('fillInTheBlanks', {}).get('tasks', []):
+        if task.get('generated'):
+            continue
+        for question in task.get('questions', []):
+            if question.get('sentence'):
+                yield 'question', question.get('id', ''), [question['sentence']]
+
+
+def build_index(lessons):
+    """
+    Build the index files from (lesson_id, data) pairs
+    Returns {relative path: JSON data}
+    """
+    lesson_ids = []
+    docs = []
+    postings = {}  # term -> [(doc_id, [positions])]
+
+    for lesson_id, data in lessons:
+        lesson_idx = len(lesson_ids)
+        lesson_ids.append(lesson_id)
+
+        for kind, ref, fields in lesson_documents(data):
+            doc_id = len(docs)
+            docs.append([lesson_idx, KINDS.index(kind), ref, ' — '.join(fields)])
+
+            positions = {}
+            offset = 0
+            for field in fields:
+                tokens = tokenize(field)
+                for pos, token in enumerate(tokens):
+                    positions.setdefault(token, []).append(offset + pos)
+                offset += len(tokens) + FIELD_GAP
+
+            for term, term_positions in positions.items():
+                postings.setdefault(term, []).append((doc_id, term_positions))
+
+    # Shard terms by first character; postings are delta-encoded
+    shards = {}
+    for term in sorted(postings):
+        encoded = []
+        last_doc = 0
+        for doc_id, positions in postings[term]:
+            encoded.append(doc_id - last_doc)
+            encoded.append(len(positions))
+            last_pos = 0
+            for pos in positions:
+                encoded.append(pos - last_pos)
+                last_pos = pos
+            last_doc = doc_id
+        shards.setdefault(term[0], {})[term] = encoded
+
+    files = {}
+    for key, terms in shards.items():
+        files[f"{SEARCH_DIR}/terms-{key}.json"] = terms
+
+    chunk_count = 0
+    for start in range(0, len(docs), DOCS_PER_CHUNK):
+        files[f"{SEARCH_DIR}/docs-{chunk_count}.json"] = docs[start:start + DOCS_PER_CHUNK]
+        chunk_count += 1
+
+    files[f"{SEARCH_DIR}/index.json"] = {
+        "version": INDEX_VERSION,
+        "lessons": lesson_ids,
+        "kinds": KINDS,
+        "shards": sorted(shards),
+        "docCount": len(docs),
+        "termCount": len(postings),
+        "docsPerChunk": DOCS_PER_CHUNK,
+        "docChunks": chunk_count
+    }
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the static lesson search index from published lessons')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    root = lesson_config.lessons_root()
+    with instrumentation.session(args):
+        with instrumentation.stage('index'):
+            files = build_index(
+                (entry['id'], data) for entry, data in lesson_config.iter_published()
+            )
+
+        with instrumentation.stage('serialize'):
+            lesson_config.write_artifacts(files, root)
+
+    meta = files[f"{SEARCH_DIR}/index.json"]
+    print(f"✓ Search index: {meta['docCount']} documents, {meta['termCount']} terms, "
+          f"{len(meta['shards'])} shards → {root}/{SEARCH_DIR}/")
+
+
+if __name__ == "__main__":
+    main()
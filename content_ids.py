@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Content-derived ids for vocabulary entries and exercise questions
+- an id is a hash of the normalized content (headword / question sentence), so
+  inserting or deleting an entry in the DOCX leaves every other id unchanged
+- normalization ignores case, spacing, punctuation and the blank style (…… / ___)
+- repeated content in one lesson gets a numbered suffix in document order
+- reconcile() maps the ids of the previous build to the new ones (same content,
+  or edited content that is still close), so the vid registry, delta patches and
+  stored progress follow renamed entries instead of starting over
+
+word_<hash>  vocabulary entry      fib_<hash>  fill-in-the-blank question
+"""
+
+import difflib
+import hashlib
+import re
+import unicodedata
+
+HASH_LENGTH = 8
+SIMILARITY = 0.75   # minimum difflib ratio for an edited entry to keep its history
+
+BLANK_RE = re.compile(r'_{2,}|…+|\.{3,}')
+PUNCTUATION_RE = re.compile(r"[^\w\s'_]")
+
+
+def normalize(text):
+    """Content key of a headword or sentence"""
+    text = unicodedata.normalize('NFKC', text or '').lower().replace('’', "'")
+    text = BLANK_RE.sub(' _ ', text)
+    return ' '.join(PUNCTUATION_RE.sub(' ', text).split())
+
+
+def content_id(prefix, text, taken):
+    """Id for text, unique within taken (which it is added to)"""
+    base = f"{prefix}_{hashlib.sha1(normalize(text).encode('utf-8')).hexdigest()[:HASH_LENGTH]}"
+    new_id = base
+    n = 2
+    while new_id in taken:
+        new_id = f"{base}_{n}"
+        n += 1
+    taken.add(new_id)
+    return new_id
+
+
+def word_id(word, taken):
+    """Id of a vocabulary entry"""
+    return content_id('word', word, taken)
+
+
+def question_id(sentence, taken):
+    """Id of a fill-in-the-blank question"""
+    return content_id('fib', sentence, taken)
+
+
+def iter_questions(data):
+    """Questions of every exercise task"""
+    for task in data.get('fillInTheBlanks', {}).get('tasks', []):
+        yield from task.get('questions', [])
+
+
+def match_items(old_items, new_items):
+    """
+    {old id: new id} for (id, text) lists: equal content first, then the closest
+    remaining text above SIMILARITY; ids present in both builds are left out
+    """
+    new_ids = {item_id for item_id, _ in new_items}
+    old_left = [(item_id, normalize(text)) for item_id, text in old_items if item_id not in new_ids]
+    old_ids = {item_id for item_id, _ in old_items}
+    new_left = [(item_id, normalize(text)) for item_id, text in new_items if item_id not in old_ids]
+
+    mapping = {}
+    by_text = {}
+    for item_id, key in new_left:
+        by_text.setdefault(key, []).append(item_id)
+    unmatched = []
+    for item_id, key in old_left:
+        if by_text.get(key):
+            mapping[item_id] = by_text[key].pop(0)
+        else:
+            unmatched.append((item_id, key))
+
+    # Edited entries: best pairs first
+    claimed = set(mapping.values())
+    candidates = [(item_id, key) for item_id, key in new_left if item_id not in claimed]
+    pairs = []
+    for old_id, old_key in unmatched:
+        for new_id, new_key in candidates:
+            matcher = difflib.SequenceMatcher(None, old_key, new_key, autojunk=False)
+            if matcher.real_quick_ratio() >= SIMILARITY and matcher.quick_ratio() >= SIMILARITY:
+                ratio = matcher.ratio()
+                if ratio >= SIMILARITY:
+                    pairs.append((ratio, old_id, new_id))
+    used_old, used_new = set(), set()
+    for _, old_id, new_id in sorted(pairs, key=lambda p: -p[0]):
+        if old_id not in used_old and new_id not in used_new:
+            mapping[old_id] = new_id
+            used_old.add(old_id)
+            used_new.add(new_id)
+    return mapping
+
+
+def reconcile(previous, data):
+    """{old id: new id} for the vocabulary and questions renamed since the previous build"""
+    if not previous:
+        return {}
+    mapping = match_items(
+        [(w.get('id'), w.get('word', '')) for w in previous.get('vocabulary', [])],
+        [(w.get('id'), w.get('word', '')) for w in data.get('vocabulary', [])]
+    )
+    mapping.update(match_items(
+        [(q.get('id'), q.get('sentence', '')) for q in iter_questions(previous)],
+        [(q.get('id'), q.get('sentence', '')) for q in iter_questions(data)]
+    ))
+    return mapping
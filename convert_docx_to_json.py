@@ -1,14 +1,24 @@
 #!/usr/bin/env python3
 """
-Script to convert listening DOCX files to JSON format
+Script to convert listening DOCX files to JSON format (one pass over docx_structure blocks)
 - vocabulary: all words in one array (with definition OR pronunciation OR word type)
 - fillInTheBlanks.tasks: grouped by tasks with proper wordBank
 """
 
 from docx import Document
-import json
+import argparse
 import re
 
+import build_media
+import content_ids
+import docx_answers
+import docx_structure
+import instrumentation
+import lesson_config
+import vocab_store
+
+BLANK_RE = re.compile(r'…{2,}')
+
 def extract_pronunciation(text):
     """Extract pronunciation from text like '/ˈpɝː.pəs/'"""
     match = re.search(r'/[^/]+/', text)
@@ -19,8 +29,8 @@ def extract_word_type(text):
     match = re.search(r'\(([nvadj,]+)\)', text)
     return match.group(1) if match else ""
 
-def is_vocabulary_word(line, next_line):
-    """Check if a line is a vocabulary word"""
+def is_vocabulary_word(line):
+    """Check if a line is a vocabulary word (pronunciation or word type)"""
     # Has pronunciation
     if '/' in line and line.count('/') >= 2:
         return True
@@ -29,18 +39,12 @@ def is_vocabulary_word(line, next_line):
     if re.search(r'\([nvadj,]+\)', line):
         return True
 
-    # Next line has definition
-    if next_line and next_line.startswith('Definition:'):
-        return True
-
     return False
 
-def parse_vocabulary_line(lines, start_idx):
-    """Parse a vocabulary entry from the document lines"""
+def parse_vocabulary_line(line, meaning=""):
+    """Parse a vocabulary entry line (meaning comes from its Definition: line)"""
     vocab = {}
 
-    line = lines[start_idx]
-
     # Extract word (before tabs or word type)
     # Remove word type and pronunciation first
     word_clean = re.sub(r'\([nvadj,]+\)', '', line)  # Remove (n), (v), etc.
@@ -50,19 +54,26 @@ def parse_vocabulary_line(lines, start_idx):
 
     vocab['word'] = word
     vocab['pronunciation'] = extract_pronunciation(line)
-
-    # Parse definition from next line if exists
-    meaning = ""
-    if start_idx + 1 < len(lines):
-        def_line = lines[start_idx + 1]
-        if def_line.startswith('Definition:'):
-            meaning = def_line.replace('Definition:', '').strip()
-
     vocab['meaning'] = meaning
     vocab['definition'] = meaning
 
     return vocab
 
+def word_list(block):
+    """
+    Words of a word-list block: a table, or a line like
+    "Từ vựng: word1 / word2 / word3"; None for other blocks
+    """
+    if block.is_table:
+        return [cell for row in block.rows for cell in row if cell] or None
+
+    line = block.text
+    if any(keyword in line.lower() for keyword in ['từ vựng:', 'round', 'vocabulary:']) and ':' in line:
+        # Split by / or comma
+        words = re.split(r'[/,]', line.split(':', 1)[1])
+        return [w.strip() for w in words if w.strip()]
+    return None
+
 def is_valid_question(text):
     """Check if a text line is a valid fill-in-the-blank question"""
     if not ('………' in text or '……' in text):
@@ -84,13 +95,18 @@ def is_valid_question(text):
     return True
 
 def parse_docx_to_json(docx_path, unit_number, title):
-    """Parse DOCX file and convert to JSON structure"""
+    """
+    Parse DOCX file and convert to JSON structure
+    One forward pass over the document blocks: Task headers open a task,
+    vocabulary lines (plus their Definition: line) fill it, and an Exercise
+    header takes the latest word list since the previous header as its word
+    bank (or the task's vocabulary) and collects questions until the next header.
+    Answers come from underlined/highlighted bank words and answer-key sections.
+    Pictures become image references (build_media) on the task they appear under.
+    """
 
     doc = Document(docx_path)
 
-    # Extract all paragraphs
-    paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-
     # Initialize JSON structure
     data = {
         "metadata": {
@@ -104,24 +120,55 @@ def parse_docx_to_json(docx_path, unit_number, title):
         }
     }
 
-    # Parse vocabulary and tasks
     current_task = None
     current_task_vocab_words = []  # Track vocab words for current task
-    vocab_id = 1
-    fib_id = 1
+    listed_words = None            # Latest word list since the last Task/Exercise header
+    in_exercise = False            # Collecting questions after an Exercise header
+    answer_key = docx_answers.AnswerKey()
+    last_vocab = None              # Entry waiting for its Definition: line
+    previous_line = None           # Unclaimed line, a vocabulary word if a Definition: follows
+    taken_ids = set()
+
+    def add_vocabulary(line, meaning=""):
+        vocab = parse_vocabulary_line(line, meaning)
+        if not vocab.get('word'):
+            return None
+        # A word listed again in a later task is the same entry (enriched once)
+        key = vocab_store.word_key(vocab['word'])
+        for known in data['vocabulary']:
+            if vocab_store.word_key(known['word']) == key:
+                for field, value in vocab.items():
+                    if value and not known.get(field):
+                        known[field] = value
+                current_task_vocab_words.append(known['word'])
+                return known
+        vocab['id'] = content_ids.word_id(vocab['word'], taken_ids)
+        vocab['exampleSimple'] = ""
+        data['vocabulary'].append(vocab)
+        current_task_vocab_words.append(vocab['word'])
+        return vocab
+
+    for block in docx_structure.iter_blocks(doc):
+        line = block.text
+        pending_vocab, last_vocab = last_vocab, None
+        pending_line, previous_line = previous_line, None
+
+        images = [build_media.image_ref(name, blob) for name, blob in block.images]
+        if images:
+            (current_task if current_task else data).setdefault('images', []).extend(images)
+        if not line and not block.is_table:
+            # Picture-only paragraph: the entry/line above still waits for its Definition:
+            last_vocab, previous_line = pending_vocab, pending_line
+            continue
 
-    i = 0
-    while i < len(paragraphs):
-        line = paragraphs[i]
-        next_line = paragraphs[i + 1] if i + 1 < len(paragraphs) else ""
+        if answer_key.feed(block):
+            continue
 
         # Detect Task header
         if line.startswith('Task'):
-            # Save previous task if exists
             if current_task and (current_task['wordBank'] or current_task['questions']):
                 data['fillInTheBlanks']['tasks'].append(current_task)
 
-            # Start new task
             task_number = len(data['fillInTheBlanks']['tasks']) + 1
             current_task = {
                 "id": f"task_{task_number}",
@@ -130,160 +177,102 @@ def parse_docx_to_json(docx_path, unit_number, title):
                 "questions": []
             }
             current_task_vocab_words = []
-            i += 1
+            listed_words = None
+            in_exercise = False
             continue
 
-        # Detect Exercise header - now we need to find wordBank
+        # Detect Exercise header: the word bank is already known
         if line.startswith('Exercise') and current_task:
-            # Look backward from here to find the word list (before "Exercise")
-            # Typically there's a line like "Từ vựng: word1, word2, word3..."
-            # Or the words are listed above
-            j = i - 1
-            temp_words = []
-
-            # Look for word list in previous few lines
-            while j >= 0 and j > i - 20:  # Check up to 20 lines back
-                prev_line = paragraphs[j]
-
-                # Stop if we hit another Exercise or Task
-                if prev_line.startswith('Task') or prev_line.startswith('Exercise'):
-                    break
-
-                # Check if this line lists words (contains commas or is a vocabulary word)
-                # Common patterns: "Từ vựng: word1 / word2 / word3"
-                if any(keyword in prev_line.lower() for keyword in ['từ vựng:', 'round', 'vocabulary:']):
-                    # Extract words after colon
-                    if ':' in prev_line:
-                        words_part = prev_line.split(':', 1)[1]
-                        # Split by / or comma
-                        words = re.split(r'[/,]', words_part)
-                        temp_words = [w.strip() for w in words if w.strip()]
-                        break
-
-                j -= 1
-
-            # If we found words, use them; otherwise use vocabulary from current task
-            if temp_words:
-                current_task['wordBank'] = temp_words
-            else:
-                current_task['wordBank'] = current_task_vocab_words.copy()
-
-            # Collect questions for this exercise
-            i += 1
-            while i < len(paragraphs):
-                next_line = paragraphs[i]
-
-                # Stop if we hit next Task or Exercise
-                if next_line.startswith('Task') or next_line.startswith('Exercise'):
-                    break
-
-                # Check if it's a valid question
-                if is_valid_question(next_line):
-                    question = {
-                        "id": f"fib_{fib_id:03d}",
-                        "sentence": next_line,
-                        "answer": "",
-                        "translation": ""
-                    }
-                    current_task['questions'].append(question)
-                    fib_id += 1
-
-                i += 1
-
+            current_task['wordBank'] = listed_words or current_task_vocab_words.copy()
+            listed_words = None
+            in_exercise = True
             continue
 
-        # Parse vocabulary (if we're in a task and it's a vocab word)
-        if current_task and is_vocabulary_word(line, next_line):
-            vocab = parse_vocabulary_line(paragraphs, i)
-            if vocab.get('word'):
-                vocab['id'] = f"word_{vocab_id:03d}"
-                vocab['exampleSimple'] = ""
-
-                # Add to main vocabulary array
-                data['vocabulary'].append(vocab)
-
-                # Track for current task
-                current_task_vocab_words.append(vocab['word'])
+        if in_exercise:
+            # Underlined/highlighted bank word: the answer (written into the blank or next to it)
+            marked = None
+            if block.marks and block.numbering:
+                marked = docx_answers.formatted_answer(block, current_task['wordBank'], BLANK_RE, '………')
+            if marked or is_valid_question(line):
+                sentence, answer = marked or (line, "")
+                current_task['questions'].append({
+                    "id": content_ids.question_id(sentence, taken_ids),
+                    "sentence": sentence,
+                    "answer": answer,
+                    "translation": ""
+                })
+            continue
 
-                vocab_id += 1
+        words = word_list(block)
+        if words:
+            listed_words = words
 
-            # Skip next line if it's a definition
-            if next_line.startswith('Definition:'):
-                i += 2
-            else:
-                i += 1
+        if not current_task or block.is_table:
             continue
 
-        i += 1
+        # Definition: line of the entry above (or of a line without word type)
+        if line.startswith('Definition:'):
+            meaning = line.replace('Definition:', '').strip()
+            if pending_vocab is not None:
+                pending_vocab['meaning'] = pending_vocab['definition'] = meaning
+                continue
+            if pending_line is not None:
+                add_vocabulary(pending_line, meaning)
+                continue
+
+        if is_vocabulary_word(line):
+            last_vocab = add_vocabulary(line)
+        else:
+            previous_line = line
 
     # Don't forget to save the last task
     if current_task and (current_task['wordBank'] or current_task['questions']):
         data['fillInTheBlanks']['tasks'].append(current_task)
 
-    # Remove empty tasks
-    data['fillInTheBlanks']['tasks'] = [
-        task for task in data['fillInTheBlanks']['tasks']
-        if task['wordBank'] or task['questions']
-    ]
+    for item in answer_key.apply(data['fillInTheBlanks']['tasks']):
+        print(f"  ⚠ Answer key entry matches no question ({item})")
 
     return data
 
 def main():
     """Main conversion function"""
 
-    files_to_convert = [
-        {
-            "path": "lessons/listening/Unit 1 - PRE-CLASS.docx",
-            "unit": "1",
-            "title": "Dolphin Conservation Trust",
-            "output": "public/lessons/json/unit1-listening.json"
-        },
-        {
-            "path": "lessons/listening/Unit 2 - PRE-CLASS - PS CAMPING.docx",
-            "unit": "2",
-            "title": "PS Camping",
-            "output": "public/lessons/json/unit2-listening.json"
-        },
-        {
-            "path": "lessons/listening/Unit 3 - PRE-CLASS - a.VOLUNTEERING.docx",
-            "unit": "3",
-            "title": "Volunteering Work",
-            "output": "public/lessons/json/unit3-listening.json"
-        }
-    ]
+    parser = argparse.ArgumentParser(description='Convert listening DOCX files to lesson JSON')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumentation.session(args):
+        convert_all()
+
+def convert_all():
+    """
+    Convert every listening DOCX in the lesson list
+    The published lesson's translations, enrichment and vids carry over (run_pipeline.convert_lessons).
+    """
+    import run_pipeline   # imports this module
+
+    instrumentation.instrument(globals(), {'Document': 'docx_load'})
+    instrumentation.instrument(vars(run_pipeline), {'parse_docx_to_json': 'classify'})
+
+    files_to_convert = lesson_config.load_lessons(lesson_type='listening')
+    converted = run_pipeline.convert_lessons(files_to_convert)
 
     for file_info in files_to_convert:
-        print(f"\nConverting {file_info['path']}...")
-
-        try:
-            data = parse_docx_to_json(
-                file_info['path'],
-                file_info['unit'],
-                file_info['title']
-            )
-
-            # Save to JSON file
-            with open(file_info['output'], 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            print(f"✓ Saved to {file_info['output']}")
-            print(f"  - Vocabulary: {len(data['vocabulary'])} words (all in one array)")
-            print(f"  - Fill-in-blank tasks: {len(data['fillInTheBlanks']['tasks'])}")
-
-            total_questions = sum(
-                len(task['questions'])
-                for task in data['fillInTheBlanks']['tasks']
-            )
-            print(f"  - Total questions: {total_questions}")
-
-            # Show task breakdown
-            for task in data['fillInTheBlanks']['tasks']:
-                print(f"    • {task['id']}: {len(task['wordBank'])} words in bank, {len(task['questions'])} questions")
-
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            import traceback
-            traceback.print_exc()
+        data = converted.get(file_info['id'])
+        if data is None:
+            print(f"\n✗ {file_info['source']}: not converted (see the convert stage above)")
+            continue
+
+        print(f"\n✓ Converted {file_info['source']} → {file_info['output']}")
+        print(f"  - Vocabulary: {len(data['vocabulary'])} words (all in one array)")
+        print(f"  - Fill-in-blank tasks: {len(data['fillInTheBlanks']['tasks'])}")
+
+        questions = [q for task in data['fillInTheBlanks']['tasks'] for q in task['questions']]
+        print(f"  - Total questions: {len(questions)} ({sum(1 for q in questions if q['answer'])} with answers from the DOCX)")
+
+        # Show task breakdown
+        for task in data['fillInTheBlanks']['tasks']:
+            print(f"    • {task['id']}: {len(task['wordBank'])} words in bank, {len(task['questions'])} questions")
 
 if __name__ == "__main__":
     main()
@@ -2,82 +2,138 @@
 """
 Script to convert reading DOCX files to JSON format
 Includes: metadata, vocabulary, reading (with paragraphs), fillInTheBlanks
+Structure comes from list numbering, tables and bold runs (docx_structure),
+read in one pass over the document
 """
 
 from docx import Document
-import json
+import argparse
 import re
 
-def extract_pronunciation(text):
-    """Extract pronunciation from text like '/ˈpɝː.pəs/'"""
-    match = re.search(r'/[^/]+/', text)
-    return match.group(0) if match else ""
-
-def extract_pos(text):
-    """Extract part of speech like (n), (v), (adj), (adv)"""
-    match = re.search(r'\(([nvadj,]+)\)', text)
-    return match.group(1) if match else ""
-
-def extract_meaning(text):
-    """Extract meaning after colon"""
-    if ':' in text:
-        parts = text.split(':', 1)
-        return parts[1].strip()
-    return ""
-
-def parse_vocabulary_line(line):
+import build_media
+import content_ids
+import docx_answers
+import docx_structure
+import instrumentation
+import lesson_config
+import vocab_store
+
+# Section and line patterns
+TASK_RE = re.compile(r'^(Task|Exercise)\s*\d*\s*:?|^VOCAB(ULARY)?\s*:', re.IGNORECASE)
+READING_TASK_RE = re.compile(r'\bread (the|this|again)\b|đọc (lại )?(cả )?bài', re.IGNORECASE)
+READING_RE = re.compile(r'^READING COMPREHENSION', re.IGNORECASE)
+SUMMARY_RE = re.compile(r'^(Main idea (đoạn|các đoạn|của)|Hình dung|Paragraph [A-Z]\s*:)', re.IGNORECASE)
+LABEL_RE = re.compile(r'^([A-Z])(?:\.\s*|\s+)main idea\b', re.IGNORECASE)
+LETTER_RE = re.compile(r'^([A-Z])\.?$')
+MAIN_IDEA_RE = re.compile(r'^main idea\b', re.IGNORECASE)
+BLANK_RE = re.compile(r'_{3,}|…|\.{4,}')
+CONTINUATION_RE = re.compile(r'^(Definition|Example|E\.\s?g)\s*[.:]?\s*', re.IGNORECASE)
+
+# Vocabulary entry columns
+POS_RE = re.compile(r'\(\s*((?:adj|adv|prep|conj|pron|n|v)(?:\s*[,/]\s*(?:adj|adv|prep|conj|pron|n|v))*)\s*\)')
+IPA_CHARS = set('ˈˌəɪʊʃʒθðŋɔæɑɜʌːɚɝɒɡ')
+HEADWORD_MAX_WORDS = 7
+BANK_ITEM_MAX_WORDS = 5
+
+def is_pronunciation(column):
+    """Column with an IPA transcription (with or without slashes)"""
+    return column.startswith('/') or any(char in IPA_CHARS for char in column)
+
+def parse_entry(text):
     """
-    Parse vocabulary from format:
-    Disease 		(n) 	/ˈdɪˌziːz/ 		: bệnh tật
+    Parse a vocabulary entry into its columns:
+    'Disease \t\t(n) \t/ˈdɪˌziːz/ \t\t: bệnh tật', 'Tropical \t(adj)\tˈtrɒpɪkəl\tNhiệt đới',
+    'Undoubted problems (n): những vấn đề ...'
+    Returns None when the text is not shaped like an entry.
     """
-    # Clean multiple tabs/spaces
-    line = re.sub(r'\s+', ' ', line)
-
-    # Extract components
-    pronunciation = extract_pronunciation(line)
-    pos = extract_pos(line)
-    meaning = extract_meaning(line)
-
-    # Extract word (before pronunciation or pos)
-    word = line
-    if pronunciation:
-        word = line.split(pronunciation)[0]
-    word = re.sub(r'\([^)]+\)', '', word).strip()
-
-    return {
+    columns = [c.strip() for c in text.split('\t') if c.strip(' .')]
+    if len(columns) == 1 and ':' in text and POS_RE.search(text.split(':', 1)[0]):
+        columns = [c.strip() for c in text.split(':', 1)]
+    if not columns:
+        return None
+
+    head = columns[0].lstrip('⇒=>-• ')
+    pos = POS_RE.search(head)
+    word = POS_RE.sub('', head).strip(' :')
+    if not word or len(word.split()) > HEADWORD_MAX_WORDS or BLANK_RE.search(word):
+        return None
+
+    entry = {
         'word': word,
-        'pronunciation': pronunciation,
-        'pos': pos,
-        'meaning': meaning,
+        'pronunciation': '',
+        'pos': pos.group(1).replace(' ', '') if pos else '',
+        'meaning': '',
         'definition': '',
         'exampleSimple': ''
     }
-
-def is_vocabulary_line(line):
-    """Check if line is a vocabulary entry"""
-    # Has pronunciation OR part of speech OR colon
-    return bool(
-        re.search(r'/[^/]+/', line) or
-        re.search(r'\([nvadj,]+\)', line) or
-        (':' in line and len(line.split(':')) == 2)
-    )
-
-def is_paragraph_marker(line):
-    """Check if line is a paragraph marker like 'A. Main idea:' or 'SEARCHING FOR NEW MEDICINES.'"""
-    # Match A., B., C., etc. OR all caps title
-    return bool(
-        re.match(r'^[A-Z]\.\s+Main idea:', line) or
-        (line.isupper() and len(line.split()) >= 2)
-    )
+    meanings = []
+    for column in columns[1:]:
+        only_pos = POS_RE.fullmatch(column)
+        if only_pos:
+            entry['pos'] = entry['pos'] or only_pos.group(1).replace(' ', '')
+        elif CONTINUATION_RE.match(column):
+            add_continuation(entry, column)
+        elif is_pronunciation(column) and not meanings:
+            ipa = column.strip('/ ')
+            entry['pronunciation'] = ' '.join(filter(None, [entry['pronunciation'], f"/{ipa}/"]))
+        else:
+            meanings.append(column.lstrip('/: ').strip())
+    entry['meaning'] = entry['meaning'] or ' '.join(filter(None, meanings))
+    return entry
+
+def add_continuation(entry, line):
+    """Definition: / Example: / E.g. line under an entry"""
+    label = CONTINUATION_RE.match(line)
+    value = line[label.end():].strip()
+    if label.group(1).lower() == 'definition':
+        entry['meaning'] = entry['meaning'] or value
+    else:
+        entry['exampleSimple'] = entry['exampleSimple'] or value
+
+def is_entry_line(block, entry_lists):
+    """
+    Vocabulary entry: word columns separated by tabs, or 'Word (pos): meaning';
+    any item of a list that already holds entries (entry_lists) is one too
+    """
+    text = block.text
+    if block.heading is not None or BLANK_RE.search(text) or text.endswith('?'):
+        return False
+    if block.numbering and block.numbering[0] in entry_lists:
+        return True
+    columns = [c for c in text.split('\t') if c.strip(' .')]
+    if len(columns) >= 2:
+        return True
+    head = text.split(':', 1)[0]
+    return ':' in text and bool(POS_RE.search(head)) and len(head.split()) <= HEADWORD_MAX_WORDS
+
+def is_question(text):
+    """Fill-in-the-blank sentence (not a dotted answer line)"""
+    if not BLANK_RE.search(text) or TASK_RE.match(text) or SUMMARY_RE.match(text):
+        return False
+    return len(re.sub(r'[_….\s]', '', text)) >= 5
+
+def bank_word(text):
+    """Word bank item without its part of speech"""
+    return POS_RE.sub('', text).strip(' \t.')
 
 def parse_reading_docx(docx_path, unit_number):
-    """Parse reading DOCX file and convert to JSON structure"""
+    """
+    Parse reading DOCX file and convert to JSON structure
+    One forward pass over the document blocks (docx_structure):
+    - vocabulary: lines shaped like entries (Task 1 list and the glossaries
+      between the reading paragraphs) with their Definition:/Example: lines
+    - word banks: tables, or numbered lists of short items; without one the
+      words listed since the previous exercise are the bank
+    - questions: sentences with a blank; a new bank starts a new task
+    - answers: underlined/highlighted bank words and answer-key sections (docx_answers)
+    - pictures: image references (build_media) on the reading paragraph they sit in, or
+      on the exercise task that follows them; the rest go to the lesson's images
+    - reading: the bold title line, then paragraphs labelled 'A. Main idea:',
+      'A<tab>MAIN IDEA:' or a standalone 'A'; text before the first label is an intro
+    """
 
     doc = Document(docx_path)
 
-    # Extract all paragraphs
-    paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-
     # Initialize JSON structure
     data = {
         "metadata": {
@@ -94,276 +150,252 @@ def parse_reading_docx(docx_path, unit_number):
             "tasks": []
         }
     }
-
-    # State tracking
-    vocab_id = 1
-    fib_id = 1
+    vocabulary = {}          # normalized headword -> entry (Task 1 list and glossaries merged)
+    tasks = data['fillInTheBlanks']['tasks']
+    paragraphs = data['reading']['paragraphs']
+
+    # Exercise state
+    header = ""              # Latest task header or instruction line
+    header_tasks = {}        # header -> tasks started under it
+    entry_lists = set()      # numIds of lists holding vocabulary entries
+    group_words = []         # Words listed since the last question
+    bank = []                # Explicit word bank waiting for its questions
+    bank_list = None         # numId of the list the bank is read from
     current_task = None
-    current_paragraph = None
-    reading_started = False
-
-    i = 0
-    while i < len(paragraphs):
-        line = paragraphs[i]
-
-        # Detect reading title (all caps ending with period, like "SEARCHING FOR NEW MEDICINES.")
-        # Skip "READING COMPREHENSION:" which is just a section header
-        if line.isupper() and len(line.split()) >= 2 and not reading_started:
-            # Only accept if it ends with period (actual title) or doesn't contain colon
-            if line.endswith('.') or ':' not in line:
-                # Remove trailing period
-                title = line.rstrip('.')
-                data['reading']['title'] = title
-                data['metadata']['title'] = title
-                reading_started = True
-                i += 1
-                continue
+    taken_ids = set()        # Content ids given so far (vocabulary and questions)
+    last_entry = None        # Entry the next Definition:/Example: line belongs to
 
-        # Detect paragraph marker (A. Main idea:, B. Main idea:, etc.)
-        if re.match(r'^([A-G])\.\s+Main idea:', line):
-            # Save previous paragraph if exists
-            if current_paragraph and current_paragraph.get('text'):
-                data['reading']['paragraphs'].append(current_paragraph)
-
-            # Extract paragraph letter
-            para_letter = line[0].lower()
-
-            # Start new paragraph
-            current_paragraph = {
-                "id": f"para_{para_letter}",
-                "label": para_letter.upper(),
-                "text": "",
-                "translation": "",
-                "mainIdea": ""
-            }
-            i += 1
-
-            # Collect inline vocabulary and content for this paragraph
-            while i < len(paragraphs):
-                next_line = paragraphs[i]
-
-                # Stop if we hit next paragraph marker or end
-                if re.match(r'^[A-G]\.\s+Main idea:', next_line):
-                    break
-
-                # Check if it's vocabulary note (word followed by translation)
-                # Format: "Rainforest (n): rừng mưa nhiệt đới"
-                # We'll skip these - they're already in vocabulary section
-                if is_vocabulary_line(next_line) and ':' in next_line:
-                    i += 1
-                    continue
-
-                # Skip if it's main idea placeholder
-                if '………' in next_line:
-                    i += 1
-                    continue
-
-                # Accumulate text content
-                if next_line and not next_line.startswith('Task'):
-                    if current_paragraph['text']:
-                        current_paragraph['text'] += ' '
-                    current_paragraph['text'] += next_line
-
-                i += 1
+    answer_key = docx_answers.AnswerKey()
+    pending_images = []      # Pictures waiting for the next exercise task
 
+    # Reading state
+    in_reading = False
+    current_paragraph = None
+    pending_label = None     # Standalone 'A' line, waiting for its 'Main idea:' line
+
+    def add_entry(entry):
+        key = vocab_store.word_key(entry['word'])
+        known = vocabulary.get(key)
+        if known is None:
+            entry = {"id": content_ids.word_id(entry['word'], taken_ids), **entry}
+            vocabulary[key] = entry
+            return entry
+        for field, value in entry.items():
+            if value and not known[field]:
+                known[field] = value
+        return known
+
+    def start_paragraph(label):
+        nonlocal current_paragraph
+        current_paragraph = {
+            "id": f"para_{label.lower()}",
+            "label": label,
+            "text": "",
+            "translation": "",
+            "mainIdea": ""
+        }
+        paragraphs.append(current_paragraph)
+
+    for block in docx_structure.iter_blocks(doc):
+        text = block.text
+        continuation, last_entry = last_entry, None
+
+        images = [build_media.image_ref(name, blob) for name, blob in block.images]
+        if images:
+            if in_reading and current_paragraph is not None:
+                current_paragraph.setdefault('images', []).extend(images)
+            elif in_reading:
+                data.setdefault('images', []).extend(images)
+            else:
+                pending_images.extend(images)
+        if not text and not block.is_table:
             continue
 
-        # Parse vocabulary from Task 1
-        if line.startswith('Task 1:') or line.startswith('Task 1 :'):
-            i += 1
-            # Collect vocabulary until Task 2
-            while i < len(paragraphs):
-                vocab_line = paragraphs[i]
+        if answer_key.feed(block):
+            continue
 
-                if vocab_line.startswith('Task'):
-                    break
+        if block.is_table:
+            if not in_reading:
+                bank = [bank_word(cell) for row in block.rows for cell in row if bank_word(cell)]
+                bank_list = None
+            continue
 
-                if is_vocabulary_line(vocab_line):
-                    vocab = parse_vocabulary_line(vocab_line)
-                    if vocab.get('word'):
-                        vocab['id'] = f"word_{vocab_id:03d}"
-                        data['vocabulary'].append(vocab)
-                        vocab_id += 1
+        if TASK_RE.match(text) or READING_RE.match(text):
+            # A header after the passage ends the reading section
+            if paragraphs and in_reading and not READING_RE.match(text):
+                in_reading = False
+            elif READING_RE.match(text) or READING_TASK_RE.search(text):
+                in_reading = True
+            header = text
+            continue
 
-                i += 1
+        # Definition:/Example: lines belong to the entry above
+        if continuation is not None and CONTINUATION_RE.match(text):
+            add_continuation(continuation, text)
+            last_entry = continuation
             continue
 
-        # Parse fill-in-the-blank tasks (similar to listening)
-        if line.startswith('Task') and 'Task 1' not in line:
-            # Save previous task
-            if current_task and (current_task.get('wordBank') or current_task.get('questions')):
-                data['fillInTheBlanks']['tasks'].append(current_task)
-
-            task_number = len(data['fillInTheBlanks']['tasks']) + 1
-            current_task = {
-                "id": f"task_{task_number}",
-                "title": line,
-                "wordBank": [],
-                "questions": []
-            }
-
-            i += 1
-
-            # Collect word bank and questions
-            temp_words = []
-            while i < len(paragraphs):
-                next_line = paragraphs[i]
-
-                # Stop if we hit another Task or reading section
-                if next_line.startswith('Task') or is_paragraph_marker(next_line):
-                    break
-
-                # Check if it's a word for word bank
-                # Single word lines between task header and questions
-                if len(next_line.split()) == 1 and next_line.isalpha():
-                    temp_words.append(next_line.strip())
-                    i += 1
-                    continue
-
-                # Check if it's a question (contains blanks __)
-                if '__' in next_line or '………' in next_line:
-                    # If we have accumulated words, use them as word bank
-                    if temp_words and not current_task['wordBank']:
-                        current_task['wordBank'] = temp_words.copy()
-                        temp_words = []
-
-                    question = {
-                        "id": f"fib_{fib_id:03d}",
-                        "sentence": next_line,
-                        "answer": "",
-                        "translation": ""
+        if is_entry_line(block, set() if in_reading else entry_lists) and not (in_reading and LABEL_RE.match(text)):
+            entry = parse_entry(text)
+            if entry:
+                if block.numbering:
+                    entry_lists.add(block.numbering[0])
+                last_entry = add_entry(entry)
+                if not in_reading:
+                    group_words.append(entry['word'])
+                continue
+
+        if not in_reading:
+            # A plain sentence under an entry is its example
+            if continuation is not None and not block.numbering and not BLANK_RE.search(text):
+                continuation['exampleSimple'] = continuation['exampleSimple'] or text
+                last_entry = continuation
+                continue
+
+            # Underlined/highlighted bank word: the answer (written into the blank or next to it)
+            question_bank = bank or (current_task['wordBank'] if current_task else group_words)
+            marked = docx_answers.formatted_answer(block, question_bank, BLANK_RE, '________') if block.marks else None
+            if marked and not BLANK_RE.search(text) and not block.numbering:
+                marked = None
+
+            if marked or is_question(text):
+                if bank:
+                    current_task = None
+                if current_task is None:
+                    current_task = {
+                        "id": f"task_{len(tasks) + 1}",
+                        "title": header,
+                        "wordBank": bank or group_words,
+                        "questions": []
                     }
-                    current_task['questions'].append(question)
-                    fib_id += 1
+                    if pending_images:
+                        current_task['images'], pending_images = pending_images, []
+                    tasks.append(current_task)
+                    header_tasks.setdefault(header, []).append(current_task)
+                    bank, bank_list, group_words = [], None, []
+                sentence, answer = marked or (text, "")
+                current_task['questions'].append({
+                    "id": content_ids.question_id(sentence, taken_ids),
+                    "sentence": sentence,
+                    "answer": answer,
+                    "translation": ""
+                })
+                continue
+
+            if block.numbering and len(text.split()) <= BANK_ITEM_MAX_WORDS and not text.endswith('?'):
+                if block.numbering[0] != bank_list:
+                    bank, bank_list = [], block.numbering[0]
+                bank.append(bank_word(text))
+                current_task = None
+                continue
+
+            if not block.numbering and not BLANK_RE.search(text):
+                # Instruction line of the exercise below (worksheets without Task headers)
+                header = text
+                current_task = None
+            continue
 
-                i += 1
+        # Reading section
+        if SUMMARY_RE.match(text) or not re.sub(r'[_….\s]', '', text):
+            continue
+
+        label = LABEL_RE.match(text)
+        letter = LETTER_RE.match(text)
+        if label or letter:
+            if data['reading']['title'] or paragraphs or label:
+                if label:
+                    start_paragraph(label.group(1).upper())
+                else:
+                    pending_label = letter.group(1).upper()
+                continue
+
+        if pending_label and MAIN_IDEA_RE.match(text):
+            start_paragraph(pending_label)
+            pending_label = None
+            continue
 
+        if not data['reading']['title'] and not paragraphs:
+            title = block.leading('bold') or (text if text.isupper() or block.heading is not None else '')
+            if title and not block.numbering:
+                data['reading']['title'] = title.strip().rstrip('.:').strip()
+                data['metadata']['title'] = data['reading']['title']
             continue
 
-        i += 1
+        # Passage text
+        if current_paragraph is None:
+            start_paragraph('Intro')
+        current_paragraph['text'] = ' '.join(filter(None, [current_paragraph['text'], ' '.join(text.split())]))
+
+    # Exercises split into several word banks under one header
+    for header_group in header_tasks.values():
+        if len(header_group) > 1:
+            for number, task in enumerate(header_group, 1):
+                task['title'] = f"{task['title']} - Group {number}"
 
-    # Save last paragraph
-    if current_paragraph and current_paragraph.get('text'):
-        data['reading']['paragraphs'].append(current_paragraph)
+    for item in answer_key.apply(tasks):
+        print(f"  ⚠ Answer key entry matches no question ({item})")
 
-    # Save last task
-    if current_task and (current_task.get('wordBank') or current_task.get('questions')):
-        data['fillInTheBlanks']['tasks'].append(current_task)
+    if pending_images:
+        (current_task if current_task else data).setdefault('images', []).extend(pending_images)
 
-    # Remove empty tasks
-    data['fillInTheBlanks']['tasks'] = [
-        task for task in data['fillInTheBlanks']['tasks']
-        if task.get('wordBank') or task.get('questions')
-    ]
+    data['vocabulary'] = list(vocabulary.values())
+    data['reading']['paragraphs'] = [p for p in paragraphs if p['text']]
 
     return data
 
 def main():
     """Main conversion function"""
 
-    files_to_convert = [
-        {
-            "path": "lessons/reading/Unit 1 - c.Saving bugs to find new drug - đọc hiểu.docx",
-            "unit": "1",
-            "output": "public/lessons/json/unit1-reading.json"
-        },
-        {
-            "path": "lessons/reading/Unit 2 - c. AUSTRALIAN CULTURE - đọc hiểu.docx",
-            "unit": "2",
-            "output": "public/lessons/json/unit2-reading-australian.json"
-        },
-        {
-            "path": "lessons/reading/Unit 2 - c.Autumn leaves - đọc hiểu.docx",
-            "unit": "2",
-            "output": "public/lessons/json/unit2-reading-autumn.json"
-        },
-        {
-            "path": "lessons/reading/Unit 3 - c. Battle against malaria.docx",
-            "unit": "3",
-            "output": "public/lessons/json/unit3-reading-malaria.json"
-        },
-        {
-            "path": "lessons/reading/Unit 3 - c.Mekete project - đọc hiểu.docx",
-            "unit": "3",
-            "output": "public/lessons/json/unit3-reading-mekete.json"
-        },
-        {
-            "path": "lessons/reading/Unit 3 - c.Sahara.docx",
-            "unit": "3",
-            "output": "public/lessons/json/unit3-reading-sahara.json"
-        },
-        {
-            "path": "lessons/reading/Unit 4 - c. SEARCHING FOR NEW MEDICINES - đọc hiểu.docx",
-            "unit": "4",
-            "output": "public/lessons/json/unit4-reading.json"
-        },
-        {
-            "path": "lessons/reading/Unit 4 - c. WHAT'S IN THE NAME.docx",
-            "unit": "4",
-            "output": "public/lessons/json/unit4-reading-name.json"
-        },
-        {
-            "path": "lessons/reading/Unit 4 - c.Should we try - đọc hiểu.docx",
-            "unit": "4",
-            "output": "public/lessons/json/unit4-should-we-try.json"
-        },
-        {
-            "path": "lessons/reading/Unit 5 - c. Crop-growing skyscrapers.docx",
-            "unit": "5",
-            "output": "public/lessons/json/unit5-reading-crops.json"
-        },
-        {
-            "path": "lessons/reading/Unit 5 - c.ORGANIC FOOD.docx",
-            "unit": "5",
-            "output": "public/lessons/json/unit5-reading-organic.json"
-        },
-        {
-            "path": "lessons/reading/Unit 5 - stadium - file word.docx",
-            "unit": "5",
-            "output": "public/lessons/json/unit5-reading-stadium.json"
-        }
-    ]
+    parser = argparse.ArgumentParser(description='Convert reading DOCX files to lesson JSON')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumentation.session(args):
+        convert_all()
+
+def convert_all():
+    """
+    Convert every reading DOCX in the lesson list
+    The published lesson's translations, enrichment and vids carry over (run_pipeline.convert_lessons).
+    """
+    import run_pipeline   # imports this module
+
+    instrumentation.instrument(globals(), {'Document': 'docx_load'})
+    instrumentation.instrument(vars(run_pipeline), {'parse_reading_docx': 'classify'})
+
+    files_to_convert = lesson_config.load_lessons(lesson_type='reading')
+    converted = run_pipeline.convert_lessons(files_to_convert)
 
     success_count = 0
     fail_count = 0
 
     for file_info in files_to_convert:
         print(f"\n{'='*60}")
-        print(f"Converting: {file_info['path']}")
+        print(f"Converted: {file_info['source']}")
         print(f"{'='*60}")
 
-        try:
-            data = parse_reading_docx(
-                file_info['path'],
-                file_info['unit']
-            )
-
-            # Save to JSON file
-            with open(file_info['output'], 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            print(f"✓ Saved to {file_info['output']}")
-            print(f"  - Title: {data['metadata']['title']}")
-            print(f"  - Vocabulary: {len(data['vocabulary'])} words")
-            print(f"  - Reading paragraphs: {len(data['reading']['paragraphs'])}")
-            print(f"  - Fill-in-blank tasks: {len(data['fillInTheBlanks']['tasks'])}")
-
-            # Show paragraph breakdown
-            for para in data['reading']['paragraphs']:
-                char_count = len(para.get('text', ''))
-                print(f"    • {para['id']} ({para['label']}): {char_count} chars")
-
-            # Show task breakdown
-            total_questions = sum(len(task['questions']) for task in data['fillInTheBlanks']['tasks'])
-            print(f"  - Total questions: {total_questions}")
-
-            success_count += 1
-
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            import traceback
-            traceback.print_exc()
+        data = converted.get(file_info['id'])
+        if data is None:
+            print("✗ Error: not converted (see the convert stage above)")
             fail_count += 1
+            continue
+
+        print(f"✓ {file_info['output']}")
+        print(f"  - Title: {data['metadata']['title']}")
+        print(f"  - Vocabulary: {len(data['vocabulary'])} words")
+        print(f"  - Reading paragraphs: {len(data['reading']['paragraphs'])}")
+        print(f"  - Fill-in-blank tasks: {len(data['fillInTheBlanks']['tasks'])}")
+
+        # Show paragraph breakdown
+        for para in data['reading']['paragraphs']:
+            char_count = len(para.get('text', ''))
+            print(f"    • {para['id']} ({para['label']}): {char_count} chars")
+
+        # Show task breakdown
+        questions = [q for task in data['fillInTheBlanks']['tasks'] for q in task['questions']]
+        print(f"  - Total questions: {len(questions)} ({sum(1 for q in questions if q['answer'])} with answers from the DOCX)")
+
+        success_count += 1
 
     print(f"\n{'='*60}")
     print(f"Conversion Summary:")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Answers found in the lesson DOCX, read during the converters' single pass
+- answer-key sections: an "Answer key" / "Đáp án" header followed by lines such as
+  "1. employ  2. pleased", "1-employ, 2-pleased", numbered list items, with
+  optional "Task 2" / "Exercise 1" lines starting the answers of the next task
+- formatted answers: an underlined or highlighted word-bank word in a question
+  (a sentence with the answer written in becomes a question with a blank)
+Bold is not an answer marker: the worksheets use it for glosses.
+"""
+
+import re
+
+KEY_HEADER_RE = re.compile(r'^(answer\s*keys?|answers\s*:|keys?\s*:|đáp án)\s*:?\s*', re.IGNORECASE)
+KEY_GROUP_RE = re.compile(r'^(Task|Exercise|Group|Part)\s*(\d+)\s*[:.)-]?\s*', re.IGNORECASE)
+KEY_NUMBER_RE = re.compile(r'(?:^|[\s,;]+)(\d{1,2})\s*[.):\-–]\s*')
+ANSWER_MARKS = ('underline', 'highlight')
+
+
+def clean_answer(text):
+    """Answer text without list punctuation"""
+    return re.sub(r'\s+', ' ', text).strip(' \t,;.:()[]"\'')
+
+
+def answer_key_of(word):
+    """Comparison key for bank words and marked spans"""
+    return re.sub(r'[^\w\s\'-]', '', word.lower()).strip()
+
+
+def matches_bank(span, bank):
+    """True when a marked span is one of the bank words (allowing an inflected ending)"""
+    span = answer_key_of(span)
+    if not re.search(r'[^\W\d_]{2}', span):
+        return False
+    for word in bank:
+        word = answer_key_of(word)
+        if not word:
+            continue
+        stem = word[:max(3, len(word) - 2)]
+        if span == word or (span.startswith(stem) and len(span.split()) == len(word.split())):
+            return True
+    return False
+
+
+def formatted_answer(block, bank, blank_re, blank):
+    """
+    Answer marked in a question block: (sentence, answer) or None
+    A sentence with a blank keeps its text; a sentence with the answer written
+    in gets the marked span replaced by blank.
+    """
+    for start, end, fmt in block.marks:
+        if fmt not in ANSWER_MARKS:
+            continue
+        span = block.text[start:end]
+        if not matches_bank(span, bank):
+            continue
+        answer = clean_answer(span)
+        if blank_re.search(block.text):
+            return block.text, answer
+        lead = len(span) - len(span.lstrip())
+        trail = len(span) - len(span.rstrip())
+        sentence = block.text[:start + lead] + blank + block.text[end - trail:]
+        return sentence, answer
+    return None
+
+
+class AnswerKey:
+    """Answer-key section collected while the converter walks the document"""
+    __slots__ = ('groups', 'active', 'explicit_groups')
+
+    def __init__(self):
+        self.groups = []            # [[(number or None, answer)]]
+        self.active = False
+        self.explicit_groups = False
+
+    def feed(self, block):
+        """Take a block if it belongs to the answer key; returns True when consumed"""
+        if block.is_table:
+            if not self.active:
+                return False
+            for row in block.rows:
+                self.add_text(' '.join(cell for cell in row if cell), numbered=False)
+            return True
+
+        header = KEY_HEADER_RE.match(block.text)
+        if header:
+            self.active = True
+            self.groups.append([])
+            self.add_text(block.text[header.end():], numbered=False)
+            return True
+        if not self.active:
+            return False
+
+        self.add_text(block.text, numbered=block.numbering is not None)
+        return True
+
+    def add_text(self, text, numbered):
+        group = KEY_GROUP_RE.match(text)
+        if group:
+            if self.groups and not self.groups[-1] and not self.explicit_groups:
+                self.groups.pop()
+            self.explicit_groups = True
+            self.groups.append([])
+            text = text[group.end():]
+        if not text.strip():
+            return
+
+        parts = KEY_NUMBER_RE.split(' ' + text)
+        if len(parts) == 1:
+            # One answer per line / list item
+            self.add(None, parts[0])
+            return
+        if clean_answer(parts[0]):
+            self.add(None, parts[0])
+        for i in range(1, len(parts) - 1, 2):
+            self.add(int(parts[i]), parts[i + 1])
+
+    def add(self, number, text):
+        answer = clean_answer(text)
+        if not answer:
+            return
+        current = self.groups[-1]
+        last = current[-1][0] if current else 0
+        # Numbering that starts again without a Task line: next task's answers
+        if number is not None and last is not None and number <= last and not self.explicit_groups:
+            self.groups.append([])
+            current = self.groups[-1]
+        current.append((number, answer))
+
+    def apply(self, tasks):
+        """
+        Fill empty questions[].answer from the key
+        One group: numbers run over all questions in order; several groups: one per task.
+        Returns descriptions of the answers that matched no question.
+        """
+        unmatched = []
+        groups = [group for group in self.groups if group]
+        if not groups:
+            return unmatched
+
+        if len(groups) == 1:
+            targets = [[question for task in tasks for question in task['questions']]]
+        else:
+            targets = [task['questions'] for task in tasks]
+
+        for group_index, group in enumerate(groups):
+            questions = targets[group_index] if group_index < len(targets) else []
+            position = 0
+            for number, answer in group:
+                position = number if number is not None else position + 1
+                if 1 <= position <= len(questions):
+                    question = questions[position - 1]
+                    question['answer'] = question['answer'] or answer
+                else:
+                    unmatched.append(f"key {group_index + 1}.{position}: {answer}")
+        return unmatched
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Structural view of a lesson DOCX for the converters
+- iter_blocks walks the document body once, in order: paragraphs, tables and
+  content controls, skipping empty paragraphs
+- each block keeps the paragraph style, heading level, list numbering
+  (numId, level) and bold / underline / highlight spans of its runs
+- tables come back as rows of cell texts (merged cells only once)
+- images embedded in a paragraph or table come back as (file name, bytes);
+  paragraphs holding only a picture are kept as blocks with empty text
+
+Usage:
+    python docx_structure.py "lessons/reading/Unit 5 - c.ORGANIC FOOD.docx"
+"""
+
+from docx import Document
+from docx.enum.text import WD_UNDERLINE
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+import argparse
+import re
+
+P = qn('w:p')
+TBL = qn('w:tbl')
+SDT = qn('w:sdt')
+SDT_CONTENT = qn('w:sdtContent')
+RUN = qn('w:r')
+DELETED = qn('w:del')
+TR = qn('w:tr')
+TC = qn('w:tc')
+BLIP = qn('a:blip')
+BLIP_EMBED = qn('r:embed')
+VML_IMAGE = '{urn:schemas-microsoft-com:vml}imagedata'
+VML_ID = qn('r:id')
+
+HEADING_RE = re.compile(r'Heading (\d)')
+
+
+class Block:
+    """One paragraph or table of the document body"""
+    __slots__ = ('kind', 'text', 'style', 'heading', 'numbering', 'marks', 'rows', 'images')
+
+    def __init__(self, kind, text='', style='', heading=None, numbering=None, marks=(), rows=(), images=()):
+        self.kind = kind            # 'paragraph' or 'table'
+        self.text = text            # stripped, non-breaking spaces as spaces
+        self.style = style          # paragraph style name
+        self.heading = heading      # 0 for Title, 1-9 for Heading N, else None
+        self.numbering = numbering  # (numId, level) for list items, else None
+        self.marks = marks          # [(start, end, format)] offsets into text
+        self.rows = rows            # table: [[cell text]]
+        self.images = images        # [(file name, bytes)] embedded pictures
+
+    @property
+    def is_table(self):
+        return self.kind == 'table'
+
+    def spans(self, fmt):
+        """Texts of the runs with a format ('bold', 'underline', 'highlight')"""
+        return [self.text[start:end].strip() for start, end, name in self.marks
+                if name == fmt and self.text[start:end].strip()]
+
+    def leading(self, fmt):
+        """Text of the formatted span the paragraph starts with ('' if none)"""
+        for start, end, name in self.marks:
+            if name == fmt and not self.text[:start].strip():
+                return self.text[start:end].strip()
+        return ''
+
+    def covered(self, fmt):
+        """True when every letter of the paragraph has the format"""
+        if not self.text:
+            return False
+        flags = bytearray(len(self.text))
+        for start, end, name in self.marks:
+            if name == fmt:
+                flags[start:end] = b'\x01' * (end - start)
+        return all(flags[i] or not char.isalnum() for i, char in enumerate(self.text))
+
+    def __repr__(self):
+        if self.is_table:
+            return f"Block(table, {self.rows!r})"
+        return f"Block({self.style!r}, {self.numbering}, {self.text[:40]!r})"
+
+
+def run_formats(run):
+    """Formats of a run, including the ones set by its character style"""
+    formats = []
+    bold = run.bold
+    if bold is None and run.style is not None:
+        bold = run.style.font.bold
+    if bold:
+        formats.append('bold')
+    if run.underline not in (None, False, WD_UNDERLINE.NONE):
+        formats.append('underline')
+    if run.font.highlight_color is not None:
+        formats.append('highlight')
+    return formats
+
+
+def style_numbering(style):
+    """numPr of a paragraph style or the styles it is based on"""
+    while style is not None:
+        ppr = style.element.pPr
+        if ppr is not None and ppr.numPr is not None:
+            return ppr.numPr
+        style = style.base_style
+    return None
+
+
+def numbering_of(element, style):
+    """(numId, level) of a list paragraph, None otherwise (numId 0 switches numbering off)"""
+    ppr = element.pPr
+    num_pr = ppr.numPr if ppr is not None and ppr.numPr is not None else style_numbering(style)
+    if num_pr is None or num_pr.numId is None or num_pr.numId.val == 0:
+        return None
+    level = num_pr.ilvl.val if num_pr.ilvl is not None else 0
+    return (num_pr.numId.val, level)
+
+
+def images_of(element, part):
+    """Embedded pictures (DrawingML or VML) under an element: [(file name, bytes)]"""
+    images = []
+    for node in element.iter(BLIP, VML_IMAGE):
+        rel_id = node.get(BLIP_EMBED) if node.tag == BLIP else node.get(VML_ID)
+        image_part = part.related_parts.get(rel_id) if rel_id else None
+        if image_part is not None:
+            images.append((image_part.partname.split('/')[-1], image_part.blob))
+    return images
+
+
+def paragraph_block(element, parent):
+    """Block for a w:p element, None when it has neither text nor pictures"""
+    pieces = []
+    marks = []
+    length = 0
+    for r in element.iter(RUN):
+        if r.getparent().tag == DELETED:
+            continue
+        run = Run(r, parent)
+        text = run.text
+        if not text:
+            continue
+        for fmt in run_formats(run):
+            # Adjacent runs with the same format form one span
+            if marks and marks[-1][1] == length and marks[-1][2] == fmt:
+                marks[-1][1] = length + len(text)
+            else:
+                marks.append([length, length + len(text), fmt])
+        pieces.append(text)
+        length += len(text)
+
+    raw = ''.join(pieces).replace('\xa0', ' ')
+    text = raw.strip()
+    images = images_of(element, parent.part)
+    if not text and not images:
+        return None
+
+    offset = len(raw) - len(raw.lstrip())
+    marks = [(max(0, start - offset), min(len(text), end - offset), fmt)
+             for start, end, fmt in marks
+             if end - offset > 0 and start - offset < len(text)]
+
+    style = Paragraph(element, parent).style
+    style_name = style.name if style is not None else ''
+
+    heading = None
+    match = HEADING_RE.match(style_name)
+    if match:
+        heading = int(match.group(1))
+    elif style_name == 'Title':
+        heading = 0
+
+    return Block('paragraph', text, style_name, heading, numbering_of(element, style), marks, images=images)
+
+
+def table_block(element, part):
+    """Block for a w:tbl element (rows of cell texts)"""
+    rows = []
+    for tr in element.iterchildren(TR):
+        cells = []
+        for tc in tr.iterchildren(TC):
+            text = ' '.join(''.join(t.text or '' for t in p.iter(qn('w:t'))) for p in tc.iterchildren(P))
+            text = re.sub(r'\s+', ' ', text.replace('\xa0', ' ')).strip()
+            cells.append(text)
+        rows.append(cells)
+    return Block('table', rows=rows, images=images_of(element, part))
+
+
+def iter_elements(body):
+    """Body-level paragraphs and tables in document order (content controls unwrapped)"""
+    for child in body.iterchildren():
+        if child.tag == SDT:
+            content = child.find(SDT_CONTENT)
+            if content is not None:
+                yield from iter_elements(content)
+        elif child.tag in (P, TBL):
+            yield child
+
+
+def iter_blocks(doc):
+    """Yield the Blocks of a python-docx Document in one pass"""
+    body = doc.element.body
+    parent = doc._body
+    for element in iter_elements(body):
+        if element.tag == TBL:
+            yield table_block(element, parent.part)
+        else:
+            block = paragraph_block(element, parent)
+            if block is not None:
+                yield block
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print the structural blocks of a DOCX file')
+    parser.add_argument('docx', help='DOCX file')
+    args = parser.parse_args()
+
+    for block in iter_blocks(Document(args.docx)):
+        if block.is_table:
+            print(f"{'TABLE':12} {block.rows}")
+            continue
+        number = f"#{block.numbering[0]}.{block.numbering[1]}" if block.numbering else ''
+        marks = ' '.join(f"[{fmt[0].upper()}:{block.text[start:end]}]" for start, end, fmt in block.marks)
+        pictures = ' '.join(f"[IMG:{name}]" for name, _ in block.images)
+        print(f"{block.style[:12]:12} {number:6} {block.text!r} {marks} {pictures}".rstrip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Export combined course bundles (whole course + one per unit) from the published lessons
+- lessons are read one at a time and streamed out item by item (entries are
+  encoded as they are, without intermediate copies), so peak memory stays at
+  roughly one lesson no matter how large the course grows.
+
+Usage:
+    python export_bundle.py                    # bundles/course.json + bundles/unit-N.json
+    python export_bundle.py --unit 3 --memory  # only unit 3, report peak memory
+"""
+
+import argparse
+import json
+import os
+import re
+import tracemalloc
+
+import instrumentation
+import lesson_config
+
+BUNDLE_DIR = 'bundles'
+
+
+class StreamingJSONWriter:
+    """
+    Incremental JSON writer: containers are opened and closed explicitly and values
+    are encoded chunk by chunk, so the whole document never exists in memory.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        self._first = []  # one flag per open container
+
+    def _prefix(self, key):
+        if self._first:
+            if not self._first[-1]:
+                self.f.write(',')
+            self._first[-1] = False
+        if key is not None:
+            self.f.write(json.dumps(key, ensure_ascii=False) + ':')
+
+    def begin_object(self, key=None):
+        self._prefix(key)
+        self.f.write('{')
+        self._first.append(True)
+
+    def end_object(self):
+        self._first.pop()
+        self.f.write('}')
+
+    def begin_array(self, key=None):
+        self._prefix(key)
+        self.f.write('[')
+        self._first.append(True)
+
+    def end_array(self):
+        self._first.pop()
+        self.f.write(']')
+
+    def value(self, obj, key=None):
+        self._prefix(key)
+        for chunk in self.encoder.iterencode(obj):
+            self.f.write(chunk)
+
+
+def write_lesson(writer, entry, data):
+    """Stream one lesson into an open lessons array"""
+    writer.begin_object()
+    writer.value(entry['id'], 'id')
+    writer.value(entry.get('typeLesson', ''), 'typeLesson')
+    writer.value(data.get('metadata', {}), 'metadata')
+
+    writer.begin_array('vocabulary')
+    for word in data.get('vocabulary', []):
+        writer.value(word)
+    writer.end_array()
+
+    reading = data.get('reading')
+    if reading:
+        writer.begin_object('reading')
+        writer.value(reading.get('title', ''), 'title')
+        writer.begin_array('paragraphs')
+        for para in reading.get('paragraphs', []):
+            writer.value(para)
+        writer.end_array()
+        writer.end_object()
+
+    fib = data.get('fillInTheBlanks', {})
+    writer.begin_object('fillInTheBlanks')
+    writer.value(fib.get('instructions', ''), 'instructions')
+    writer.begin_array('tasks')
+    for task in fib.get('tasks', []):
+        writer.begin_object()
+        for key, value in task.items():
+            if key != 'questions':
+                writer.value(value, key)
+        writer.begin_array('questions')
+        for question in task.get('questions', []):
+            writer.value(question)
+        writer.end_array()
+        writer.end_object()
+    writer.end_array()
+    writer.end_object()
+
+    writer.end_object()
+
+
+def unit_number(data):
+    """'Unit 4' -> '4'"""
+    match = re.search(r'\d+', data.get('metadata', {}).get('unit', ''))
+    return match.group(0) if match else '0'
+
+
+class Bundle:
+    """An output bundle file with its streaming writer"""
+
+    def __init__(self, path, title):
+        self.path = path
+        self.f = open(path, 'w', encoding='utf-8')
+        self.writer = StreamingJSONWriter(self.f)
+        self.count = 0
+        self.writer.begin_object()
+        self.writer.value(title, 'title')
+        self.writer.begin_array('lessons')
+
+    def add(self, entry, data):
+        write_lesson(self.writer, entry, data)
+        self.count += 1
+
+    def close(self):
+        self.writer.end_array()
+        self.writer.value(self.count, 'lessonCount')
+        self.writer.end_object()
+        self.f.close()
+
+
+def export_bundles(units=None, course=True):
+    """Stream every published lesson into the course bundle and its unit bundle"""
+    config = lesson_config.load_config()
+    lessons_root = config.get('lessonsRoot', 'public/lessons/json')
+    out_dir = f"{lessons_root}/{BUNDLE_DIR}"
+    os.makedirs(out_dir, exist_ok=True)
+
+    with open(lesson_config.manifest_path(), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    store = lesson_config.lessons_store()
+
+    bundles = {}
+    if course and not units:
+        bundles['course'] = Bundle(f"{out_dir}/course.json", 'All units')
+
+    try:
+        for entry in manifest.get('lessons', []):
+            instrumentation.set_lesson(entry['fileName'].rsplit('/', 1)[-1])
+            try:
+                with instrumentation.stage('json_load'):
+                    data = lesson_config.read_lesson(f"{lessons_root}/{entry['fileName']}", store)
+            except FileNotFoundError:
+                print(f"⚠ File not found: {entry['fileName']}, skipping...")
+                continue
+
+            unit = unit_number(data)
+            if units and unit not in units:
+                continue
+
+            if unit not in bundles:
+                bundles[unit] = Bundle(f"{out_dir}/unit-{unit}.json", f"Unit {unit}")
+
+            with instrumentation.stage('serialize'):
+                bundles[unit].add(entry, data)
+                if 'course' in bundles:
+                    bundles['course'].add(entry, data)
+
+            # Only one lesson is ever held in memory
+            del data
+    finally:
+        for bundle in bundles.values():
+            bundle.close()
+
+    return bundles
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export combined course and unit bundles')
+    parser.add_argument('--unit', action='append', help='only export these unit numbers')
+    parser.add_argument('--no-course', action='store_true', help='skip the whole-course bundle')
+    parser.add_argument('--memory', action='store_true', help='report peak Python memory')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.memory:
+        tracemalloc.start()
+
+    with instrumentation.session(args):
+        bundles = export_bundles(units=args.unit, course=not args.no_course)
+
+    print(f"\n{'='*60}")
+    print("Bundle Summary:")
+    print(f"{'='*60}")
+    for bundle in bundles.values():
+        size = os.path.getsize(bundle.path)
+        print(f"✓ {bundle.path}: {bundle.count} lessons, {size / 1024:.1f} KB")
+
+    if args.memory:
+        _, peak = tracemalloc.get_traced_memory()
+        print(f"  Peak memory: {peak / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,13 @@ Script to fill in answers and translations for fill-in-the-blank questions
 New format: vocabulary separate, fillInTheBlanks.tasks grouped
 """
 
-import json
+import argparse
 
-def fill_unit1_answers():
-    """Fill answers for Unit 1 - Dolphin Conservation Trust"""
+import instrumentation
+import lesson_config
 
-    with open('public/lessons/json/unit1-listening.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def unit1_answers():
+    """Answers and translations for Unit 1 - Dolphin Conservation Trust, one list per task"""
 
     # Task 1 answers - matching exact sentences
     task1_answers = [
@@ -52,27 +52,10 @@ def fill_unit1_answers():
         ("shipping", "Công ty cung cấp miễn phí vận chuyển cho đơn hàng trên $50.")
     ]
 
-    # Apply answers to fillInTheBlanks.tasks
-    tasks_data = [task1_answers, task2_answers, task3_answers, task4_answers]
+    return [task1_answers, task2_answers, task3_answers, task4_answers]
 
-    for task_idx, answers in enumerate(tasks_data):
-        if task_idx < len(data['fillInTheBlanks']['tasks']):
-            for q_idx, (answer, translation) in enumerate(answers):
-                if q_idx < len(data['fillInTheBlanks']['tasks'][task_idx]['questions']):
-                    data['fillInTheBlanks']['tasks'][task_idx]['questions'][q_idx]['answer'] = answer
-                    data['fillInTheBlanks']['tasks'][task_idx]['questions'][q_idx]['translation'] = translation
-
-    # Save back
-    with open('public/lessons/json/unit1-listening.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-    print("✓ Unit 1 completed")
-
-def fill_unit2_answers():
-    """Fill answers for Unit 2 - PS Camping"""
-
-    with open('public/lessons/json/unit2-listening.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def unit2_answers():
+    """Answers and translations for Unit 2 - PS Camping, one list per task"""
 
     # Task 1 answers
     task1_answers = [
@@ -107,27 +90,10 @@ def fill_unit2_answers():
         ("fridge", "Hãy bảo quản thức ăn trong tủ lạnh.")
     ]
 
-    # Apply answers
-    tasks_data = [task1_answers, task2_answers, task3_answers]
-
-    for task_idx, answers in enumerate(tasks_data):
-        if task_idx < len(data['fillInTheBlanks']['tasks']):
-            for q_idx, (answer, translation) in enumerate(answers):
-                if q_idx < len(data['fillInTheBlanks']['tasks'][task_idx]['questions']):
-                    data['fillInTheBlanks']['tasks'][task_idx]['questions'][q_idx]['answer'] = answer
-                    data['fillInTheBlanks']['tasks'][task_idx]['questions'][q_idx]['translation'] = translation
-
-    # Save back
-    with open('public/lessons/json/unit2-listening.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-    print("✓ Unit 2 completed")
+    return [task1_answers, task2_answers, task3_answers]
 
-def fill_unit3_answers():
-    """Fill answers for Unit 3 - Volunteering Work"""
-
-    with open('public/lessons/json/unit3-listening.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def unit3_answers():
+    """Answers and translations for Unit 3 - Volunteering Work, one list per task"""
 
     # Task 1 answers
     task1_answers = [
@@ -162,28 +128,65 @@ def fill_unit3_answers():
         ("getting back to", "Tôi mong được quay lại làm việc sau kỳ nghỉ.")
     ]
 
-    # Apply answers
-    tasks_data = [task1_answers, task2_answers, task3_answers]
+    return [task1_answers, task2_answers, task3_answers]
+
+# Lesson id -> answer list builder
+ANSWER_SETS = {
+    'unit1-listening': unit1_answers,
+    'unit2-listening': unit2_answers,
+    'unit3-listening': unit3_answers,
+}
+
+LESSONS_DIR = 'public/lessons/json/listening'
+
+def apply_answers(data, lesson_id):
+    """
+    Fill answers and translations into a lesson dict in place; returns True if the lesson has an answer set
+    Answers already read from the DOCX (answer key, underlined words) take precedence over the typed ones.
+    """
+    answer_set = ANSWER_SETS.get(lesson_id)
+    if not answer_set:
+        return False
+
+    tasks_data = answer_set()
 
     for task_idx, answers in enumerate(tasks_data):
         if task_idx < len(data['fillInTheBlanks']['tasks']):
             for q_idx, (answer, translation) in enumerate(answers):
                 if q_idx < len(data['fillInTheBlanks']['tasks'][task_idx]['questions']):
-                    data['fillInTheBlanks']['tasks'][task_idx]['questions'][q_idx]['answer'] = answer
-                    data['fillInTheBlanks']['tasks'][task_idx]['questions'][q_idx]['translation'] = translation
+                    question = data['fillInTheBlanks']['tasks'][task_idx]['questions'][q_idx]
+                    question['answer'] = question['answer'] or answer
+                    question['translation'] = translation
+
+    return True
+
+def fill_lesson_file(lesson_id):
+    """Load a listening lesson, apply its answers and save it back"""
+    path = f"{LESSONS_DIR}/{lesson_id}.json"
+
+    with instrumentation.stage('json_load'):
+        data = lesson_config.read_lesson(path)
+
+    apply_answers(data, lesson_id)
 
     # Save back
-    with open('public/lessons/json/unit3-listening.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with instrumentation.stage('serialize'):
+        lesson_config.write_lesson(path, data)
 
-    print("✓ Unit 3 completed")
+    print(f"✓ {lesson_id} completed")
 
 def main():
-    print("Filling in answers and translations...\n")
-    fill_unit1_answers()
-    fill_unit2_answers()
-    fill_unit3_answers()
-    print("\n✅ All units completed!")
+    parser = argparse.ArgumentParser(description='Fill answers and translations for listening lessons')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumentation.session(args):
+        print("Filling in answers and translations...\n")
+        for lesson_id in ANSWER_SETS:
+            instrumentation.set_lesson(f"{lesson_id}.json")
+            with instrumentation.stage('fill_answers'):
+                fill_lesson_file(lesson_id)
+        print("\n✅ All units completed!")
 
 if __name__ == "__main__":
     main()
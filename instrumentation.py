@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Shared instrumentation for the lesson pipeline scripts
+- stage timers (self time, nested stages supported)
+- per-lesson timing table printed in the run summary
+- --profile output: cProfile stats (.prof) or flamegraph-ready folded stacks (.folded)
+
+Everything is a no-op until a session is enabled, so normal runs pay nothing.
+"""
+
+import cProfile
+import time
+from contextlib import contextmanager, nullcontext
+
+GLOBAL_LESSON = '(global)'
+
+_enabled = False
+_lesson = GLOBAL_LESSON
+_stack = []         # [[stage_name, child_seconds], ...]
+_self_times = {}    # lesson -> {stage: seconds}
+_folded = {}        # "lesson;stage;substage" -> seconds
+_NULL = nullcontext()
+
+
+def is_enabled():
+    """Return True when stage timing is active"""
+    return _enabled
+
+
+def reset():
+    """Forget all collected timings"""
+    global _lesson
+    _lesson = GLOBAL_LESSON
+    _stack.clear()
+    _self_times.clear()
+    _folded.clear()
+
+
+def set_lesson(name):
+    """Attribute the following stages to a lesson (row in the timing table)"""
+    global _lesson
+    if _enabled:
+        _lesson = name or GLOBAL_LESSON
+
+
+def stage(name):
+    """
+    Context manager timing a pipeline stage
+    Returns a shared null context when instrumentation is disabled
+    """
+    return _timed_stage(name) if _enabled else _NULL
+
+
+@contextmanager
+def _timed_stage(name):
+    frame = [name, 0.0]
+    _stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _stack.pop()
+        if _stack:
+            _stack[-1][1] += elapsed
+
+        self_time = max(elapsed - frame[1], 0.0)
+        per_lesson = _self_times.setdefault(_lesson, {})
+        per_lesson[name] = per_lesson.get(name, 0.0) + self_time
+
+        key = ';'.join([_lesson] + [f[0] for f in _stack] + [name])
+        _folded[key] = _folded.get(key, 0.0) + self_time
+
+
+def timed(stage_name, func):
+    """Wrap a function so every call is recorded under stage_name"""
+    def wrapper(*args, **kwargs):
+        with _timed_stage(stage_name):
+            return func(*args, **kwargs)
+
+    wrapper.__name__ = getattr(func, '__name__', stage_name)
+    wrapper.__doc__ = getattr(func, '__doc__', None)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def instrument(namespace, stages):
+    """
+    Replace functions in a module namespace (usually globals()) with timed wrappers
+    stages: {function_name: stage_name}
+    Does nothing when instrumentation is disabled, so the hot path is untouched.
+    """
+    if not _enabled:
+        return
+
+    for func_name, stage_name in stages.items():
+        func = namespace.get(func_name)
+        if func is None or hasattr(func, '__wrapped__'):
+            continue
+        namespace[func_name] = timed(stage_name, func)
+
+
+def add_arguments(parser):
+    """Add the shared --timings / --profile flags to an argparse parser"""
+    parser.add_argument(
+        '--timings', action='store_true',
+        help='print a per-lesson stage timing table in the summary'
+    )
+    parser.add_argument(
+        '--profile', metavar='PATH',
+        help='write profile output (PATH.prof = cProfile stats, PATH.folded = flamegraph stacks); implies --timings'
+    )
+
+
+@contextmanager
+def session(args):
+    """
+    Run a script body with instrumentation configured from parsed args
+    Prints the timing table and writes the profile on exit.
+    """
+    global _enabled
+
+    timings = getattr(args, 'timings', False)
+    profile_path = getattr(args, 'profile', None)
+
+    if not (timings or profile_path):
+        yield
+        return
+
+    reset()
+    _enabled = True
+    profiler = None
+    if profile_path and not profile_path.endswith('.folded'):
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        _enabled = False
+
+        print_summary()
+
+        if profile_path:
+            if profiler:
+                profiler.dump_stats(profile_path)
+            else:
+                write_folded(profile_path)
+            print(f"✓ Profile written to {profile_path}")
+
+
+def write_folded(path):
+    """Write collected stages as folded stacks (input for flamegraph.pl / speedscope)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for key, seconds in sorted(_folded.items()):
+            # flamegraph tools expect integer sample counts; use microseconds
+            f.write(f"{key.replace(' ', '_')} {int(seconds * 1_000_000)}\n")
+
+
+def print_summary():
+    """Print the per-lesson stage timing table"""
+    if not _self_times:
+        return
+
+    stages = []
+    for per_lesson in _self_times.values():
+        for name in per_lesson:
+            if name not in stages:
+                stages.append(name)
+
+    lesson_width = max(len('Lesson'), *(len(name) for name in _self_times))
+    col_width = max(9, *(len(name) for name in stages))
+
+    header = f"{'Lesson':<{lesson_width}}  " + '  '.join(f"{s:>{col_width}}" for s in stages)
+    header += f"  {'total':>{col_width}}"
+
+    print(f"\n{'='*60}")
+    print("Stage timings (seconds, self time):")
+    print(f"{'='*60}")
+    print(header)
+    print('-' * len(header))
+
+    totals = {s: 0.0 for s in stages}
+    for lesson_name, per_lesson in _self_times.items():
+        cells = []
+        for s in stages:
+            seconds = per_lesson.get(s, 0.0)
+            totals[s] += seconds
+            cells.append(f"{seconds:>{col_width}.3f}")
+        row_total = sum(per_lesson.values())
+        print(f"{lesson_name:<{lesson_width}}  " + '  '.join(cells) + f"  {row_total:>{col_width}.3f}")
+
+    print('-' * len(header))
+    total_cells = '  '.join(f"{totals[s]:>{col_width}.3f}" for s in stages)
+    print(f"{'TOTAL':<{lesson_width}}  " + total_cells + f"  {sum(totals.values()):>{col_width}.3f}")
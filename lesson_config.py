@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Lesson list for the content pipeline
+- lessons/pipeline.json lists every lesson (id, type, source DOCX, unit, title)
+- DOCX files in the source folders that are not listed yet are discovered automatically
+- published lessons are read and written through read_lesson / write_lesson, which
+  expand and compact references to the shared vocabulary store (vocab_store)
+"""
+
+import json
+import os
+import re
+
+import instrumentation
+import vocab_store
+
+CONFIG_PATH = 'lessons/pipeline.json'
+
+
+def load_config(config_path=CONFIG_PATH):
+    """Load the pipeline config"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def lesson_paths(lesson, lessons_root):
+    """Add fileName (relative to the lessons root) and output path to a lesson entry"""
+    lesson['fileName'] = f"{lesson['type']}/{lesson['id']}.json"
+    lesson['output'] = f"{lessons_root}/{lesson['fileName']}"
+    return lesson
+
+
+def slugify(text):
+    """Lowercase ASCII slug for generated lesson ids"""
+    text = re.sub(r'[^a-z0-9]+', '-', text.lower())
+    return text.strip('-')
+
+
+def discover_lesson(path, lesson_type):
+    """
+    Derive a lesson entry from a DOCX file name such as
+    'Unit 5 - c.ORGANIC FOOD.docx' or 'Unit 2 - PRE-CLASS - PS CAMPING.docx'
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    match = re.match(r'Unit\s*(\d+)\s*-?\s*(.*)', name, re.IGNORECASE)
+    unit = match.group(1) if match else '0'
+    rest = match.group(2) if match else name
+
+    # Drop the worksheet prefixes and Vietnamese suffixes used in the file names
+    rest = re.sub(r'PRE-CLASS\s*-?\s*', '', rest, flags=re.IGNORECASE)
+    rest = re.sub(r'^[a-z]\.\s*', '', rest.strip())
+    rest = re.split(r'\s+-\s+', rest)[0].strip()
+
+    lesson = {
+        "id": '-'.join(filter(None, [f"unit{unit}", lesson_type, slugify(rest)])),
+        "type": lesson_type,
+        "source": path.replace(os.sep, '/'),
+        "unit": unit,
+        "discovered": True
+    }
+    if lesson_type == 'listening':
+        lesson['title'] = rest.title()
+    return lesson
+
+
+def load_lessons(config_path=CONFIG_PATH, discover=True, lesson_type=None):
+    """
+    Return the lesson list: configured lessons first, then discovered DOCX files
+    Each entry has id, type, source, unit, (title), fileName and output.
+    """
+    config = load_config(config_path)
+    lessons_root = config.get('lessonsRoot', 'public/lessons/json')
+
+    lessons = [dict(lesson) for lesson in config.get('lessons', [])]
+    known_sources = {os.path.normpath(l['source']) for l in lessons}
+
+    if discover:
+        for source_type, directory in config.get('sourceDirs', {}).items():
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                path = os.path.join(directory, name)
+                if not name.endswith('.docx') or name.startswith('~$'):
+                    continue
+                if os.path.normpath(path) in known_sources:
+                    continue
+                lessons.append(discover_lesson(path, source_type))
+
+    if lesson_type:
+        lessons = [l for l in lessons if l['type'] == lesson_type]
+
+    return [lesson_paths(lesson, lessons_root) for lesson in lessons]
+
+
+def manifest_path(config_path=CONFIG_PATH):
+    """Path of the published lesson manifest"""
+    return load_config(config_path).get('manifest', 'public/lessons/json/manifest.json')
+
+
+def lessons_root(config_path=CONFIG_PATH):
+    """Folder holding the published lesson JSON"""
+    return load_config(config_path).get('lessonsRoot', 'public/lessons/json')
+
+
+def iter_published(config_path=CONFIG_PATH, expand=True):
+    """
+    Yield (manifest entry, lesson data) for every lesson in the published manifest
+    Vocabulary references are expanded unless expand is False (the file as published).
+    """
+    root = lessons_root(config_path)
+    with open(manifest_path(config_path), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    store = vocab_store.load_store(root) if expand else None
+
+    for entry in manifest.get('lessons', []):
+        try:
+            with open(f"{root}/{entry['fileName']}", 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            print(f"⚠ File not found: {entry['fileName']}, skipping...")
+            continue
+        yield entry, vocab_store.expand_lesson(data, store) if expand else data
+
+
+def read_lesson(path, store=None):
+    """Published lesson with its vocabulary references expanded"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return vocab_store.expand_lesson(data, lessons_store() if store is None else store)
+
+
+def write_lesson(path, data, store=None):
+    """Write a lesson (indented), referencing the vocabulary store where it can"""
+    compact = vocab_store.compact_lesson(data, lessons_store() if store is None else store)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(compact, f, ensure_ascii=False, indent=2)
+
+
+def lessons_store(config_path=CONFIG_PATH):
+    """Entries of the published vocabulary store"""
+    return vocab_store.load_store(lessons_root(config_path))
+
+
+def write_published(published, root=None):
+    """Write back (manifest entry, lesson data) pairs, one timed serialize stage per lesson"""
+    root = root or lessons_root()
+    store = lessons_store()
+    for entry, data in published:
+        instrumentation.set_lesson(entry['fileName'].rsplit('/', 1)[-1])
+        with instrumentation.stage('serialize'):
+            write_lesson(f"{root}/{entry['fileName']}", data, store)
+
+
+def write_artifacts(files, root=None):
+    """Write generated {relative path: data} files compactly under the lessons root"""
+    root = root or lessons_root()
+    for rel_path, data in files.items():
+        path = f"{root}/{rel_path}"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
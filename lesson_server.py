@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Local lesson server for authoring and classroom use (asyncio, standard library only)
+- serves public/lessons/json under <base>lessons/json/ and optionally a built app
+  (dist/) under <base>, so one machine can serve a lab of students
+- strong ETags from the content hash (same hash as precache.json), If-None-Match → 304
+- gzip / brotli negotiated from Accept-Encoding: precompressed .gz / .br siblings
+  are used when present, otherwise the compressed body is made once and kept in memory
+  (brotli only when the brotli module is installed)
+- single byte ranges (audio seeking), If-Range, 416 for unsatisfiable ranges
+- hash-named files (offline packs, media, delta patches) are cached as immutable,
+  everything else is revalidated with its ETag
+- /metrics: request, byte, status and latency counters in Prometheus text format
+
+Usage:
+    python lesson_server.py                          # http://127.0.0.1:8000/english-learning/lessons/json/
+    python lesson_server.py --host 0.0.0.0 --app dist  # classroom: app + lessons on the LAN
+    python lesson_server.py --load-test 200          # in another terminal: 200 keep-alive clients
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import time
+from email.utils import formatdate
+from urllib.parse import unquote
+
+import lesson_config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BASE_PATH = '/english-learning/'   # vite.config.js base
+LESSONS_PATH = 'lessons/json/'
+METRICS_PATH = '/metrics'
+
+MAX_HEADER_BYTES = 16 * 1024
+KEEP_ALIVE_SECONDS = 15
+MIN_COMPRESS_BYTES = 512
+
+COMPRESSIBLE_TYPES = {'application/json', 'application/javascript', 'text/javascript', 'text/css',
+                      'text/html', 'text/plain', 'image/svg+xml', 'application/manifest+json'}
+
+# Files named by content hash never change
+IMMUTABLE_DIRS = ('offline/', 'media/', 'versions/')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+
+CONTENT_TYPES = {
+    '.json': 'application/json',
+    '.js': 'text/javascript',
+    '.opus': 'audio/ogg',
+    '.mp3': 'audio/mpeg',
+    '.avif': 'image/avif',
+    '.webp': 'image/webp',
+    '.pack': 'application/octet-stream',
+}
+
+# (upper bound in seconds) buckets of the latency histogram
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+STATUS_TEXT = {200: 'OK', 206: 'Partial Content', 304: 'Not Modified', 400: 'Bad Request',
+               404: 'Not Found', 405: 'Method Not Allowed', 416: 'Range Not Satisfiable',
+               500: 'Internal Server Error'}
+
+RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+
+class CachedFile:
+    """A file body with its hash and compressed forms, reloaded when the file changes"""
+
+    __slots__ = ('path', 'stamp', 'body', 'hash', 'type', 'encoded')
+
+    def __init__(self, path, stamp, body):
+        self.path = path
+        self.stamp = stamp
+        self.body = body
+        self.hash = hashlib.sha1(body).hexdigest()[:16]
+        ext = os.path.splitext(path)[1].lower()
+        self.type = CONTENT_TYPES.get(ext) or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.encoded = {}   # 'br' / 'gzip' -> bytes (None when not worth it)
+
+    def compressible(self):
+        return self.type in COMPRESSIBLE_TYPES and len(self.body) >= MIN_COMPRESS_BYTES
+
+    def encoding(self, name):
+        """Body compressed with gzip or br (precompressed sibling first), None when unavailable"""
+        if name not in self.encoded:
+            self.encoded[name] = self._encode(name)
+        return self.encoded[name]
+
+    def _encode(self, name):
+        sibling = f"{self.path}.{'gz' if name == 'gzip' else 'br'}"
+        try:
+            if os.stat(sibling).st_mtime_ns >= self.stamp[0]:
+                with open(sibling, 'rb') as f:
+                    return f.read()
+        except OSError:
+            pass
+        if name == 'gzip':
+            body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        elif brotli is not None:
+            body = brotli.compress(self.body, quality=11)
+        else:
+            return None
+        return body if len(body) < len(self.body) else None
+
+
+class FileCache:
+    """Path -> CachedFile, checked against the file's mtime and size on every request"""
+
+    def __init__(self):
+        self.files = {}
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self.files.get(path)
+        if cached is not None and cached.stamp == stamp:
+            self.hits += 1
+            return cached
+        with open(path, 'rb') as f:
+            cached = CachedFile(path, stamp, f.read())
+        self.files[path] = cached
+        self.loads += 1
+        return cached
+
+
+class Metrics:
+    """Counters exposed on /metrics"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = {}          # (method, status) -> count
+        self.bytes_sent = {}        # encoding -> body bytes
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.connections = 0
+        self.connections_total = 0
+
+    def record(self, method, status, encoding, size, seconds):
+        key = (method, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self.bytes_sent[encoding] = self.bytes_sent.get(encoding, 0) + size
+        self.latency_sum += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.latency[i] += 1
+                break
+        else:
+            self.latency[-1] += 1
+
+    def render(self, cache):
+        lines = [
+            '# TYPE lesson_server_requests_total counter',
+            *(f'lesson_server_requests_total{{method="{m}",status="{s}"}} {n}'
+              for (m, s), n in sorted(self.requests.items())),
+            '# TYPE lesson_server_response_bytes_total counter',
+            *(f'lesson_server_response_bytes_total{{encoding="{e}"}} {n}'
+              for e, n in sorted(self.bytes_sent.items())),
+            '# TYPE lesson_server_request_seconds histogram',
+        ]
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), self.latency):
+            cumulative += count
+            lines.append(f'lesson_server_request_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines += [
+            f'lesson_server_request_seconds_sum {self.latency_sum:.6f}',
+            f'lesson_server_request_seconds_count {cumulative}',
+            '# TYPE lesson_server_connections gauge',
+            f'lesson_server_connections {self.connections}',
+            '# TYPE lesson_server_connections_total counter',
+            f'lesson_server_connections_total {self.connections_total}',
+            '# TYPE lesson_server_cache_files gauge',
+            f'lesson_server_cache_files {len(cache.files)}',
+            '# TYPE lesson_server_cache_hits_total counter',
+            f'lesson_server_cache_hits_total {cache.hits}',
+            '# TYPE lesson_server_cache_loads_total counter',
+            f'lesson_server_cache_loads_total {cache.loads}',
+            '# TYPE lesson_server_uptime_seconds gauge',
+            f'lesson_server_uptime_seconds {time.time() - self.started:.0f}',
+        ]
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def accepted_encodings(header):
+    """Encodings the client accepts (q > 0), in the server's order of preference"""
+    accepted = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        match = re.search(r'q=([\d.]+)', params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return [name for name in ('br', 'gzip') if accepted.get(name, accepted.get('*', 0)) > 0]
+
+
+def etag_matches(header, etag):
+    """If-None-Match comparison (weak, as RFC 9110 requires for it)"""
+    if header.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in header.split(','))
+
+
+def parse_range(header, size):
+    """(start, end) inclusive of a single byte range, 'invalid' when unsatisfiable, None to ignore"""
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None   # multiple ranges or other units: the full body is sent
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            return 'invalid'
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return 'invalid'
+    return start, end
+
+
+class LessonServer:
+    """Maps request paths to files and builds responses"""
+
+    def __init__(self, lessons_root, app_dir=None, base=BASE_PATH):
+        self.lessons_root = os.path.realpath(lessons_root)
+        self.app_dir = os.path.realpath(app_dir) if app_dir else None
+        self.base = '/' + base.strip('/') + '/' if base.strip('/') else '/'
+        self.cache = FileCache()
+        self.metrics = Metrics()
+
+    def resolve(self, url_path):
+        """(file path, path relative to the lessons root or None) for a request path"""
+        path = url_path.split('?', 1)[0].split('#', 1)[0]
+        path = unquote(path)
+        for prefix in (self.base + LESSONS_PATH, '/' + LESSONS_PATH):
+            if path.startswith(prefix):
+                rel = path[len(prefix):]
+                return self.safe_join(self.lessons_root, rel), rel
+        if self.app_dir and path.startswith(self.base):
+            rel = path[len(self.base):] or 'index.html'
+            full = self.safe_join(self.app_dir, rel)
+            # Client-side routes fall back to the app shell
+            if full and not os.path.isfile(full) and '.' not in os.path.basename(rel):
+                full = os.path.join(self.app_dir, 'index.html')
+            return full, None
+        return None, None
+
+    @staticmethod
+    def safe_join(root, rel):
+        full = os.path.realpath(os.path.join(root, rel))
+        return full if full == root or full.startswith(root + os.sep) else None
+
+    def respond(self, method, target, headers):
+        """(status, headers dict, body bytes, encoding label) for one request"""
+        if method not in ('GET', 'HEAD'):
+            return 405, {'Allow': 'GET, HEAD'}, b'', 'identity'
+
+        if target.split('?', 1)[0] == METRICS_PATH:
+            body = self.metrics.render(self.cache)
+            return 200, {'Content-Type': 'text/plain; version=0.0.4', 'Cache-Control': 'no-store'}, body, 'identity'
+
+        path, rel = self.resolve(target)
+        cached = self.cache.get(path) if path else None
+        if cached is None:
+            return 404, {'Content-Type': 'text/plain'}, b'Not found\n', 'identity'
+
+        out = {
+            'Content-Type': cached.type,
+            'Cache-Control': IMMUTABLE_CACHE if rel and rel.startswith(IMMUTABLE_DIRS) else REVALIDATE_CACHE,
+            'Accept-Ranges': 'bytes',
+        }
+
+        # Compressed representations have their own strong ETag
+        encoding = 'identity'
+        body = cached.body
+        range_header = headers.get('range')
+        if cached.compressible():
+            out['Vary'] = 'Accept-Encoding'
+            if not range_header:
+                for name in accepted_encodings(headers.get('accept-encoding', '')):
+                    encoded = cached.encoding(name)
+                    if encoded is not None:
+                        encoding, body = name, encoded
+                        out['Content-Encoding'] = name
+                        break
+        etag = f'"{cached.hash}"' if encoding == 'identity' else f'"{cached.hash}-{encoding}"'
+        out['ETag'] = etag
+
+        if 'if-none-match' in headers and etag_matches(headers['if-none-match'], etag):
+            out.pop('Content-Type')
+            return 304, out, b'', encoding
+
+        if range_header and headers.get('if-range', etag) == etag:
+            byte_range = parse_range(range_header, len(body))
+            if byte_range == 'invalid':
+                return 416, {'Content-Range': f'bytes */{len(body)}'}, b'', encoding
+            if byte_range:
+                start, end = byte_range
+                out['Content-Range'] = f'bytes {start}-{end}/{len(body)}'
+                return 206, out, body[start:end + 1], encoding
+
+        return 200, out, body, encoding
+
+    async def handle(self, reader, writer):
+        """One connection: HTTP/1.1 requests until close or idle timeout"""
+        self.metrics.connections += 1
+        self.metrics.connections_total += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_SECONDS)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        ConnectionError):
+                    break
+                start = time.perf_counter()
+
+                lines = head.decode('latin-1').split('\r\n')
+                parts = lines[0].split(' ')
+                if len(parts) != 3:
+                    writer.write(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+                    break
+                method, target, version = parts
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(':')
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                # Request bodies are not used; discard them so the connection stays usable
+                length = int(headers.get('content-length', '0') or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                try:
+                    status, out, body, encoding = self.respond(method, target, headers)
+                except Exception as e:
+                    print(f"✗ {method} {target}: {e}")
+                    status, out, body, encoding = 500, {'Content-Type': 'text/plain'}, b'Server error\n', 'identity'
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+                out['Content-Length'] = str(len(body))
+                out['Date'] = formatdate(usegmt=True)
+                out['Connection'] = 'keep-alive' if keep_alive else 'close'
+                response = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+                response += [f"{name}: {value}" for name, value in out.items()]
+                writer.write(('\r\n'.join(response) + '\r\n\r\n').encode('latin-1'))
+                sent = 0
+                if method != 'HEAD' and status != 304:
+                    writer.write(body)
+                    sent = len(body)
+                await writer.drain()
+                self.metrics.record(method, status, encoding, sent, time.perf_counter() - start)
+
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.metrics.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(server, host, port):
+    listener = await asyncio.start_server(server.handle, host, port, limit=MAX_HEADER_BYTES, backlog=1024)
+    print(f"✓ Lessons: http://{host}:{port}{server.base}{LESSONS_PATH} → {server.lessons_root}")
+    if server.app_dir:
+        print(f"✓ App:     http://{host}:{port}{server.base} → {server.app_dir}")
+    print(f"ℹ Metrics: http://{host}:{port}{METRICS_PATH} (brotli {'on' if brotli else 'off: pip install brotli'})")
+    async with listener:
+        await listener.serve_forever()
+
+
+async def fetch_loop(host, port, paths, count, latencies, failures):
+    """One keep-alive client issuing count GET requests over paths"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(count):
+            path = paths[i % len(paths)]
+            start = time.perf_counter()
+            writer.write((f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+                          "Accept-Encoding: br, gzip\r\n\r\n").encode('latin-1'))
+            head = await reader.readuntil(b'\r\n\r\n')
+            status = int(head.split(b' ', 2)[1])
+            length = int(re.search(rb'\r\nContent-Length: (\d+)', head).group(1))
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                failures.append(status)
+    finally:
+        writer.close()
+
+
+async def load_test(host, port, base, clients, requests):
+    """Hit every lesson file with concurrent keep-alive clients and report throughput"""
+    root = lesson_config.lessons_root()
+    paths = [f"{base}{LESSONS_PATH}{entry['fileName']}" for entry, _ in lesson_config.iter_published()]
+    paths.append(f"{base}{LESSONS_PATH}manifest.json")
+
+    latencies = []
+    failures = []
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(fetch_loop(host, port, paths[i % len(paths):] + paths[:i % len(paths)], requests, latencies, failures)
+          for i in range(clients)),
+        return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    errors = [r for r in results if isinstance(r, Exception)]
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+
+    print(f"\n{'='*60}")
+    print(f"Load test: {clients} clients × {requests} requests ({len(paths)} files under {root})")
+    print(f"{'='*60}")
+    print(f"  Completed: {len(latencies)} requests in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)")
+    print(f"  Latency:   p50 {percentile(0.5):.1f} ms, p95 {percentile(0.95):.1f} ms, p99 {percentile(0.99):.1f} ms")
+    if failures or errors:
+        print(f"  ⚠ {len(failures)} error responses, {len(errors)} failed clients"
+              f"{': ' + str(errors[0]) if errors else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve lessons with ETags, compression and range requests')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (0.0.0.0 for the classroom LAN)')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--base', default=BASE_PATH, help='URL base of the app (vite.config.js base)')
+    parser.add_argument('--root', help=f'lessons root (default: lessonsRoot in {lesson_config.CONFIG_PATH})')
+    parser.add_argument('--app', metavar='DIR', help='also serve a built app (e.g. dist) under the base')
+    parser.add_argument('--load-test', type=int, metavar='CLIENTS',
+                        help='run concurrent clients against a running server instead of serving')
+    parser.add_argument('--requests', type=int, default=100, help='requests per load-test client')
+    args = parser.parse_args()
+
+    base = '/' + args.base.strip('/') + '/' if args.base.strip('/') else '/'
+    try:
+        if args.load_test:
+            asyncio.run(load_test(args.host, args.port, base, args.load_test, args.requests))
+        else:
+            server = LessonServer(args.root or lesson_config.lessons_root(), args.app, base)
+            asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n✅ Server stopped")
+
+
+if __name__ == "__main__":
+    main()
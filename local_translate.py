@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Offline English → Vietnamese translation on CPU (alternative to the MyMemory API)
+- OPUS-MT en-vi converted to CTranslate2 (int8) with its SentencePiece models
+- texts are split into sentences, deduplicated, sorted by length and translated
+  in multi-sentence batches across worker processes (one model per process)
+- translations are memoized per sentence: after prefill() over everything a run
+  needs, auto_fill_vocab's one-text-at-a-time calls never run the model again
+
+Setup (once):
+    pip install ctranslate2 sentencepiece transformers[sentencepiece] torch
+    ct2-transformers-converter --model Helsinki-NLP/opus-mt-en-vi --quantization int8 \\
+        --copy_files source.spm target.spm --output_dir lessons/models/opus-mt-en-vi
+
+Usage:
+    python local_translate.py "Organic food is grown without chemicals."
+    python local_translate.py --lessons        # translate what enrichment would ask for, report speed
+"""
+
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentation
+import lesson_config
+
+MODEL_DIR = 'lessons/models/opus-mt-en-vi'
+BATCH_SENTENCES = 32      # sentences per translate_batch call
+THREADS_PER_WORKER = 2    # intra-op threads of each model instance
+BEAM_SIZE = 2
+MAX_DECODING_LENGTH = 256
+
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+(?=["\'(]?[A-Z0-9])')
+
+_config = {'model_dir': MODEL_DIR, 'workers': None}
+_memo = {}                # sentence -> Vietnamese
+_model = None             # (translator, source spm, target spm) of this process
+
+
+def configure(model_dir=MODEL_DIR, workers=None):
+    """Choose the model folder and the number of worker processes (default: cores / threads)"""
+    _config['model_dir'] = model_dir
+    _config['workers'] = workers
+
+
+def check_model(model_dir=None):
+    """Error message when the backend cannot run, None when it can"""
+    model_dir = model_dir or _config['model_dir']
+    try:
+        import ctranslate2  # noqa: F401
+        import sentencepiece  # noqa: F401
+    except ImportError:
+        return "Local translation needs ctranslate2 and sentencepiece (pip install ctranslate2 sentencepiece)"
+    missing = [name for name in ('model.bin', 'source.spm', 'target.spm')
+               if not os.path.exists(f"{model_dir}/{name}")]
+    if missing:
+        return f"No converted model in {model_dir} (missing {', '.join(missing)}); see local_translate.py"
+    return None
+
+
+def load_model(model_dir, threads=THREADS_PER_WORKER):
+    """Load the translator and tokenizers into this process"""
+    global _model
+    import ctranslate2
+    import sentencepiece
+
+    translator = ctranslate2.Translator(model_dir, device='cpu', compute_type='int8',
+                                        inter_threads=1, intra_threads=threads)
+    source = sentencepiece.SentencePieceProcessor(model_file=f"{model_dir}/source.spm")
+    target = sentencepiece.SentencePieceProcessor(model_file=f"{model_dir}/target.spm")
+    _model = (translator, source, target)
+
+
+def split_sentences(text):
+    """Sentences of a text (whitespace normalized)"""
+    return [s for s in SENTENCE_RE.split(' '.join(text.split())) if s]
+
+
+def translate_sentences(sentences):
+    """Translate sentences with the model loaded in this process (one batch call)"""
+    translator, source, target = _model
+    tokens = [source.encode(sentence, out_type=str) + ['</s>'] for sentence in sentences]
+    results = translator.translate_batch(
+        tokens,
+        beam_size=BEAM_SIZE,
+        max_batch_size=BATCH_SENTENCES,
+        max_decoding_length=MAX_DECODING_LENGTH
+    )
+    return [target.decode(result.hypotheses[0]) for result in results]
+
+
+def worker_count():
+    """Worker processes to use"""
+    return _config['workers'] or max(1, (os.cpu_count() or 1) // THREADS_PER_WORKER)
+
+
+def prefill(texts):
+    """
+    Translate every sentence of texts that is not memoized yet
+    Returns the number of sentences translated.
+    """
+    pending = sorted({
+        sentence for text in texts if text and text.strip()
+        for sentence in split_sentences(text) if sentence not in _memo
+    }, key=len)
+    if not pending:
+        return 0
+
+    # Length-sorted batches keep padding low
+    batches = [pending[i:i + BATCH_SENTENCES] for i in range(0, len(pending), BATCH_SENTENCES)]
+    workers = min(worker_count(), len(batches))
+
+    if workers == 1:
+        if _model is None:
+            load_model(_config['model_dir'])
+        results = [translate_sentences(batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=load_model,
+                                 initargs=(_config['model_dir'],)) as pool:
+            results = list(pool.map(translate_sentences, batches))
+
+    for batch, translations in zip(batches, results):
+        _memo.update(zip(batch, translations))
+    return len(pending)
+
+
+def translate(text):
+    """Vietnamese translation of a text ('' on failure), same contract as translate_to_vietnamese"""
+    if not text or not text.strip():
+        return ''
+    try:
+        prefill([text])
+    except Exception as e:
+        print(f"  ⚠ Local translation failed: {e}")
+        return ''
+    return ' '.join(_memo.get(sentence, '') for sentence in split_sentences(text)).strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Translate English to Vietnamese offline on CPU')
+    parser.add_argument('text', nargs='*', help='texts to translate')
+    parser.add_argument('--lessons', action='store_true', help='translate the pending texts of every lesson')
+    parser.add_argument('--model', default=MODEL_DIR, help='CTranslate2 model folder')
+    parser.add_argument('--workers', type=int, help='worker processes (default: cores / 2)')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    configure(args.model, args.workers)
+    problem = check_model()
+    if problem:
+        print(f"✗ {problem}")
+        return
+
+    with instrumentation.session(args):
+        for text in args.text:
+            print(f"{text}\n→ {translate(text)}\n")
+
+        if args.lessons:
+            # auto_fill_vocab imports this module; it knows what enrichment translates
+            import auto_fill_vocab
+            texts = [text for _, data in lesson_config.iter_published()
+                     for text in auto_fill_vocab.pending_translations(data)]
+            start = time.perf_counter()
+            with instrumentation.stage('translate'):
+                count = prefill(texts)
+            elapsed = time.perf_counter() - start
+            print(f"✓ Translated {count} sentences from {len(texts)} texts in {elapsed:.1f}s "
+                  f"({count / elapsed if elapsed else 0:.1f} sentences/s, {worker_count()} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+/**
+ * Service worker - installs the course from the offline packs listed in
+ * lessons/json/precache.json (build_precache.py) and serves lesson files locally.
+ *
+ * Packs install by priority: core first, then the unit the student is working on
+ * (the app posts { type: 'prioritize-unit', unit }), then the other units and the
+ * search shards. A pack is downloaded again only when one of its files changed.
+ * A cached lesson file is served only while its hash matches precache.json, so a
+ * content update is never answered with the previous body.
+ */
+
+const LESSONS_ROOT = new URL('lessons/json/', self.registration.scope).href;
+const DATA_CACHE = 'lesson-data-v1';
+const SHELL_CACHE = 'app-shell-v1';
+const META_URL = `${LESSONS_ROOT}__precache__`; // url -> hash of the cached copy
+const PACK_MAGIC = 'ELPK';
+
+// Always asked from the network first so content updates are seen
+const FRESH_FILES = new Set([`${LESSONS_ROOT}precache.json`, `${LESSONS_ROOT}manifest.json`]);
+
+let syncing = Promise.resolve();
+let currentUnit = null;
+let fileIndex = null; // promise of precache.json "files" ({url: {hash, size}}), null when unknown
+
+const readMeta = async (cache) => {
+  const response = await cache.match(META_URL);
+  return response ? response.json() : {};
+};
+
+const writeMeta = (cache, meta) => cache.put(META_URL, new Response(JSON.stringify(meta), {
+  headers: { 'Content-Type': 'application/json' }
+}));
+
+/**
+ * Split a pack into its files and store them in the cache
+ * Format: "ELPK", uint32 header length (LE), JSON header, bodies in header order
+ */
+const installPack = async (cache, buffer, meta, hashes) => {
+  const view = new DataView(buffer);
+  const magic = new TextDecoder().decode(new Uint8Array(buffer, 0, 4));
+  if (magic !== PACK_MAGIC) throw new Error('Not an offline pack');
+
+  const headerLength = view.getUint32(4, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+
+  let offset = 8 + headerLength;
+  for (const file of header.files) {
+    const body = buffer.slice(offset, offset + file.size);
+    offset += file.size;
+    await cache.put(`${LESSONS_ROOT}${file.url}`, new Response(body, {
+      headers: { 'Content-Type': file.type, 'Content-Length': String(file.size) }
+    }));
+    meta[file.url] = hashes[file.url]?.hash;
+  }
+};
+
+/**
+ * Download the packs whose files are missing or outdated, highest priority first
+ */
+const syncPacks = async () => {
+  let precache;
+  try {
+    const response = await fetch(`${LESSONS_ROOT}precache.json`, { cache: 'no-cache' });
+    if (!response.ok) return;
+    precache = await response.json();
+  } catch {
+    return; // offline: keep what is cached
+  }
+  fileIndex = Promise.resolve(precache.files);
+
+  const cache = await caches.open(DATA_CACHE);
+  const meta = await readMeta(cache);
+  const rank = (group) => (group.unit !== undefined && group.unit === currentUnit ? 0.5 : group.priority);
+  const groups = [...precache.groups].sort((a, b) => rank(a) - rank(b));
+
+  for (const group of groups) {
+    const stale = group.files.some(url => meta[url] !== precache.files[url]?.hash);
+    if (!stale) continue;
+    try {
+      const response = await fetch(`${LESSONS_ROOT}${group.pack.url}`);
+      if (!response.ok) continue;
+      await installPack(cache, await response.arrayBuffer(), meta, precache.files);
+      await writeMeta(cache, meta);
+    } catch (error) {
+      console.warn(`Offline pack ${group.name} not installed:`, error);
+    }
+  }
+
+  // Files dropped from the course
+  for (const url of Object.keys(meta)) {
+    if (!precache.files[url]) {
+      await cache.delete(`${LESSONS_ROOT}${url}`);
+      delete meta[url];
+    }
+  }
+  await writeMeta(cache, meta);
+};
+
+const queueSync = () => {
+  syncing = syncing.then(syncPacks, syncPacks);
+  return syncing;
+};
+
+/**
+ * Fetch the current file hashes; when a cached file is outdated, sync the packs
+ * (runs whenever the app reloads manifest.json, i.e. before it asks for lessons)
+ */
+const refreshIndex = () => {
+  fileIndex = fetch(`${LESSONS_ROOT}precache.json`, { cache: 'no-cache' })
+    .then(response => (response.ok ? response.json() : null))
+    .then(precache => precache?.files ?? null)
+    .catch(() => null);
+  return fileIndex.then(async (files) => {
+    if (!files) return;
+    const meta = await readMeta(await caches.open(DATA_CACHE));
+    if (Object.keys(files).some(url => meta[url] !== files[url].hash)) await queueSync();
+  });
+};
+
+self.addEventListener('install', (event) => {
+  self.skipWaiting();
+  event.waitUntil(queueSync());
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener('message', (event) => {
+  if (event.data?.type === 'prioritize-unit' && event.data.unit !== currentUnit) {
+    currentUnit = event.data.unit;
+    event.waitUntil(queueSync());
+  }
+});
+
+const networkFirst = async (request, cacheName) => {
+  const cache = await caches.open(cacheName);
+  try {
+    const response = await fetch(request);
+    if (response.ok) cache.put(request, response.clone());
+    return response;
+  } catch (error) {
+    const cached = await cache.match(request);
+    if (cached) return cached;
+    throw error;
+  }
+};
+
+/**
+ * Cached copy when it has the hash precache.json lists for the file; an outdated
+ * copy (packs not synced yet after a content update) comes from the network
+ * instead, and is only served when offline
+ */
+const verifiedCache = async (request, url) => {
+  if (!fileIndex) refreshIndex();
+  const cache = await caches.open(DATA_CACHE);
+  const [cached, files, meta] = await Promise.all([
+    cache.match(request, { ignoreSearch: true }),
+    fileIndex,
+    readMeta(cache)
+  ]);
+  const relativeUrl = url.slice(LESSONS_ROOT.length);
+  const expected = files?.[relativeUrl]?.hash;
+  if (cached && (!expected || meta[relativeUrl] === expected)) return cached;
+
+  try {
+    const response = await fetch(request, { cache: 'no-cache' });
+    if (response.ok && !cached) cache.put(request, response.clone());
+    return response;
+  } catch (error) {
+    if (cached) return cached;
+    throw error;
+  }
+};
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  if (request.method !== 'GET' || !request.url.startsWith(self.registration.scope)) return;
+
+  if (request.url.startsWith(LESSONS_ROOT)) {
+    const url = request.url.split('?')[0];
+    if (url.includes('/offline/')) return; // packs go straight to the network
+    if (FRESH_FILES.has(url)) {
+      if (url.endsWith('/manifest.json')) event.waitUntil(refreshIndex());
+      event.respondWith(networkFirst(request, DATA_CACHE));
+    } else {
+      event.respondWith(verifiedCache(request, url));
+    }
+    return;
+  }
+
+  // App shell (index.html, scripts, styles): fresh when online, cached offline
+  event.respondWith(networkFirst(request, SHELL_CACHE));
+});
@@ -0,0 +1,756 @@
+#!/usr/bin/env python3
+"""
+Run the lesson content pipeline over every lesson in one process
+convert → enrich → answers → manifest, scheduled as a DAG
+
+Lessons come from lessons/pipeline.json plus any DOCX discovered in the source
+folders. Each lesson stays in memory across stages and is serialized once at the
+end (only when its content changed).
+
+Usage:
+    python run_pipeline.py                            # all stages, all lessons
+    python run_pipeline.py --stages enrich,manifest   # start from the published JSON
+    python run_pipeline.py --only unit4-reading --offline  # convert/enrich one lesson, course-wide stages see all
+    python run_pipeline.py --translator local         # translate with the offline CPU model
+"""
+
+import argparse
+import json
+import os
+from graphlib import TopologicalSorter
+
+import auto_fill_vocab
+import build_alignment
+import build_audio
+import build_candidates
+import build_cloze
+import build_deltas
+import build_difficulty
+import build_examples
+import build_game_banks
+import build_main_ideas
+import build_media
+import build_morphology
+import build_phoneme_index
+import build_precache
+import build_search_index
+import content_ids
+import fill_answers
+import instrumentation
+import lesson_config
+import local_translate
+import vocab_ids
+import vocab_store
+from convert_docx_to_json import parse_docx_to_json
+from convert_reading_to_json import parse_reading_docx
+
+# Vocabulary fields filled by enrichment (carried over between builds)
+VOCAB_FIELDS = ['pronunciation', 'pos', 'meaning', 'definition', 'exampleSimple']
+
+
+def normalize_word(word):
+    """Normalize a headword for lookups"""
+    return ' '.join(word.lower().split())
+
+
+def parse_lesson(lesson):
+    """Run the converter matching the lesson type"""
+    if lesson['type'] == 'reading':
+        return parse_reading_docx(lesson['source'], lesson['unit'])
+    return parse_docx_to_json(lesson['source'], lesson['unit'], lesson.get('title', ''))
+
+
+class LookupCache:
+    """
+    In-memory memo of dictionary and translation lookups
+    Seeded from existing lessons so unchanged words and paragraphs never hit the network.
+    """
+
+    def __init__(self, offline=False):
+        self.offline = offline
+        self.dictionary = {}     # word -> api result (None = API had nothing)
+        self.translations = {}   # source text -> Vietnamese
+        self.known_words = {}    # normalized word -> enriched vocabulary fields
+        self.hits = 0
+        self.misses = 0
+
+    def seed(self, data):
+        """Remember enriched vocabulary and translations from a lesson"""
+        for word in data.get('vocabulary', []):
+            if word.get('word'):
+                known = self.known_words.setdefault(normalize_word(word['word']), {})
+                for field in VOCAB_FIELDS:
+                    if word.get(field) and not known.get(field):
+                        known[field] = word[field]
+
+        for para in data.get('reading', {}).get('paragraphs', []):
+            if para.get('text') and para.get('translation'):
+                self.translations[para['text']] = para['translation']
+
+        for task in data.get('fillInTheBlanks', {}).get('tasks', []):
+            for question in task.get('questions', []):
+                if question.get('sentence') and question.get('translation'):
+                    self.translations[question['sentence']] = question['translation']
+
+    def install(self):
+        """Route auto_fill_vocab lookups through this cache"""
+        fetch = auto_fill_vocab.fetch_from_dictionary_api
+        translate = auto_fill_vocab.translate_to_vietnamese
+
+        def cached_fetch(word):
+            if word in self.dictionary:
+                self.hits += 1
+                return self.dictionary[word]
+            if self.offline:
+                return None
+            self.misses += 1
+            result = fetch(word)
+            self.dictionary[word] = result
+            return result
+
+        def cached_translate(text):
+            if text in self.translations:
+                self.hits += 1
+                return self.translations[text]
+            if self.offline:
+                return ''
+            self.misses += 1
+            result = translate(text)
+            if result:
+                self.translations[text] = result
+            return result
+
+        auto_fill_vocab.fetch_from_dictionary_api = cached_fetch
+        auto_fill_vocab.translate_to_vietnamese = cached_translate
+
+
+def carry_over(data, previous, cache):
+    """
+    Copy enriched fields from the previous build (and other lessons) into a fresh parse
+    Exercises written into the published lesson by hand (the DOCX has none) are kept.
+    Returns vocabulary entries that are new and still need enrichment.
+    """
+    previous = previous or {}
+
+    old_words = {
+        normalize_word(w['word']): w
+        for w in previous.get('vocabulary', []) if w.get('word')
+    }
+    new_words = []
+
+    for word in data.get('vocabulary', []):
+        key = normalize_word(word.get('word', ''))
+        source = old_words.get(key) or cache.known_words.get(key)
+
+        if source:
+            for field in VOCAB_FIELDS:
+                if not word.get(field) and field in source:
+                    word[field] = source[field] or word.get(field, '')
+
+        if key not in old_words:
+            new_words.append(word)
+
+    old_paragraphs = {
+        p['id']: p for p in previous.get('reading', {}).get('paragraphs', [])
+    }
+    for para in data.get('reading', {}).get('paragraphs', []):
+        old = old_paragraphs.get(para['id'])
+        if old and old.get('text') == para.get('text'):
+            para['translation'] = para.get('translation') or old.get('translation', '')
+            para['mainIdea'] = para.get('mainIdea') or old.get('mainIdea', '')
+            # build_main_ideas tells generated from hand-written ideas by these fields
+            if para['mainIdea'] == old.get('mainIdea'):
+                for field in build_main_ideas.GENERATED_FIELDS:
+                    if field in old:
+                        para[field] = old[field]
+            if old.get('alignment') and para['translation'] == old.get('translation'):
+                para['alignment'] = old['alignment']
+        elif not para.get('translation'):
+            para['translation'] = cache.translations.get(para.get('text'), '')
+
+    fib = data.setdefault('fillInTheBlanks', {"instructions": "", "tasks": []})
+    old_tasks = [t for t in previous.get('fillInTheBlanks', {}).get('tasks', []) if not t.get('generated')]
+    if old_tasks and not any(not t.get('generated') for t in fib['tasks']):
+        fib['tasks'] = old_tasks + fib['tasks']
+
+    old_questions = {}
+    for task in previous.get('fillInTheBlanks', {}).get('tasks', []):
+        for question in task.get('questions', []):
+            old_questions[question.get('sentence')] = question
+
+    for task in data.get('fillInTheBlanks', {}).get('tasks', []):
+        for question in task.get('questions', []):
+            old = old_questions.get(question.get('sentence'))
+            if old:
+                question['answer'] = question.get('answer') or old.get('answer', '')
+                question['translation'] = question.get('translation') or old.get('translation', '')
+
+    return new_words
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# Per-lesson stages take (pipeline, lesson); global stages take (pipeline, lessons)
+# ---------------------------------------------------------------------------
+
+def stage_convert(pipeline, lesson):
+    """Parse the source DOCX and carry over enriched fields from the published lesson"""
+    if lesson['id'] in pipeline.published and not pipeline.reconvert:
+        # Published lessons are often hand-corrected; only rebuild them on request
+        print(f"ℹ {lesson['id']}: already published, keeping it (use --reconvert to rebuild)")
+        return
+
+    data = parse_lesson(lesson)
+    previous = pipeline.published.get(lesson['id'])
+    pipeline.new_words[lesson['id']] = carry_over(data, previous, pipeline.cache)
+    pipeline.renamed_ids[lesson['id']] = content_ids.reconcile(previous, data)
+    pipeline.data[lesson['id']] = data
+
+
+def stage_translate(pipeline, lessons):
+    """Translate all pending paragraphs and meanings in one batch across workers (local backend only)"""
+    if not pipeline.enrich or pipeline.cache.offline or auto_fill_vocab.TRANSLATOR != 'local':
+        return
+    def in_store(word):
+        # stage_enrich fills these from the vocabulary store without translating
+        return bool(pipeline.vocab_store.get(vocab_store.resolve_key(pipeline.vocab_store, word), {}).get('meaning'))
+
+    # Dictionary lookups happen here: single words translate their definition
+    # Prefill only for the lessons enrich runs on
+    texts = [
+        text for lesson in pipeline.selected
+        if (data := pipeline.lesson_data(lesson)) is not None
+        for text in auto_fill_vocab.pending_translations(data, in_store)
+        if text not in pipeline.cache.translations
+    ]
+    count = local_translate.prefill(texts)
+    print(f"  ✓ Translated {count} sentences locally ({local_translate.worker_count()} workers)")
+
+
+def stage_enrich(pipeline, lesson):
+    """Fill missing vocabulary data and paragraph translations"""
+    if not pipeline.enrich:
+        return
+
+    data = pipeline.lesson_data(lesson)
+    if data is None:
+        return
+
+    if lesson['id'] in pipeline.new_words:
+        # Freshly converted: only words that were not in the published lesson
+        new_words = pipeline.new_words[lesson['id']]
+        for i, word in enumerate(new_words):
+            # Words another lesson already enriched (earlier or in this run) come from the store
+            if not vocab_store.fill_from_store(pipeline.vocab_store, word):
+                auto_fill_vocab.auto_fill_word(word, i, len(new_words))
+                vocab_store.merge_entry(pipeline.vocab_store, word)
+    else:
+        auto_fill_vocab.auto_fill_vocabulary(data)
+
+    auto_fill_vocab.auto_fill_reading_translations(data)
+
+
+def stage_answers(pipeline, lesson):
+    """Apply the hand-typed answer sets"""
+    data = pipeline.lesson_data(lesson)
+    if data is not None:
+        fill_answers.apply_answers(data, lesson['id'])
+
+
+def stage_manifest(pipeline, lessons):
+    """Make sure every built lesson is listed in the manifest (existing extra fields are kept)"""
+    entries = pipeline.manifest.setdefault('lessons', [])
+    by_id = {entry.get('id'): entry for entry in entries}
+
+    for lesson in lessons:
+        data = pipeline.lesson_data(lesson)
+        if data is None:
+            continue
+        entry = by_id.get(lesson['id'])
+        if entry is None:
+            entry = {}
+            entries.append(entry)
+            by_id[lesson['id']] = entry
+        entry.update({
+            "id": lesson['id'],
+            "fileName": lesson['fileName'],
+            "typeLesson": lesson['type'],
+            # Listed here so the lesson list never loads lesson bodies
+            "unit": data.get('metadata', {}).get('unit', ''),
+            "title": data.get('metadata', {}).get('title', '')
+        })
+
+
+def stage_search(pipeline, lessons):
+    """Build the static full-text search index over all lessons"""
+    root = lesson_config.lessons_root()
+    files = build_search_index.build_index(
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    )
+    for rel_path, data in files.items():
+        pipeline.publish(f"{root}/{rel_path}", data)
+
+
+def stage_games(pipeline, lessons):
+    """Precompute game item banks (distractors, scrambles, matching sets)"""
+    root = lesson_config.lessons_root()
+    files = build_game_banks.build_banks(
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    )
+    for rel_path, data in files.items():
+        pipeline.publish(f"{root}/{rel_path}", data)
+
+
+def stage_audio(pipeline, lessons):
+    """Pre-render pronunciation audio (skipped when no local TTS engine is installed)"""
+    engine, encoder = build_audio.find_tools()
+    if not engine or not encoder:
+        print("⚠ No local TTS engine/encoder found, skipping audio")
+        return
+    root = lesson_config.lessons_root()
+    files, rendered = build_audio.build_audio(
+        ((lesson['id'], data) for lesson in lessons
+         if (data := pipeline.lesson_data(lesson)) is not None),
+        root, engine, encoder, dry_run=pipeline.dry_run
+    )
+    if rendered:
+        print(f"  ✓ {'Would render' if pipeline.dry_run else 'Rendered'} {rendered} audio clips")
+    for rel_path, data in files.items():
+        pipeline.publish(f"{root}/{rel_path}", data)
+
+
+def stage_media(pipeline, lessons):
+    """Extract DOCX pictures, render AVIF/WebP derivatives and link them into the lessons"""
+    lesson_data = [
+        (lesson, data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    ]
+    if not any(True for _, data in lesson_data for _ in build_media.iter_image_refs(data)):
+        print("  ℹ No pictures in the lessons")
+        return
+    blobs = {}
+    for lesson, _ in lesson_data:
+        blobs.update(build_media.docx_media(lesson['source']))
+    tool = build_media.find_tool()
+    root = lesson_config.lessons_root()
+    files, rendered = build_media.build_media(
+        ((lesson['id'], data) for lesson, data in lesson_data), blobs, root, tool, dry_run=pipeline.dry_run
+    )
+    if rendered:
+        print(f"  ✓ {'Would render' if pipeline.dry_run else 'Rendered'} {rendered} image derivatives with {tool}")
+    for rel_path, data in files.items():
+        pipeline.publish(f"{root}/{rel_path}", data)
+
+
+def stage_phonemes(pipeline, lessons):
+    """Canonicalize IPA in every lesson and build the phoneme index"""
+    root = lesson_config.lessons_root()
+    normalized = build_phoneme_index.normalize_lessons(
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    )
+    files = build_phoneme_index.build_phoneme_index(normalized)
+    for rel_path, data in files.items():
+        pipeline.publish(f"{root}/{rel_path}", data)
+
+
+def stage_morphology(pipeline, lessons):
+    """Build the inflection table and phrase templates for vocabulary matching"""
+    root = lesson_config.lessons_root()
+    files = build_morphology.build_morphology(
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    )
+    for rel_path, data in files.items():
+        pipeline.publish(f"{root}/{rel_path}", data)
+
+
+def stage_examples(pipeline, lessons):
+    """Attach an in-context example sentence to every vocabulary entry"""
+    attached = build_examples.attach_examples(
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    )
+    print(f"  ✓ {attached} vocabulary entries have a reading example")
+
+
+def stage_align(pipeline, lessons):
+    """Pair every paragraph's sentences with their translation (offset spans)"""
+    aligned, total = build_alignment.align_lessons(
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    )
+    print(f"  ✓ {total} paragraphs aligned ({aligned} updated)")
+
+
+def stage_main_ideas(pipeline, lessons):
+    """Extract a main idea for every paragraph nobody wrote one for"""
+    generated, by_hand = build_main_ideas.fill_main_ideas(
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    )
+    print(f"  ✓ Main ideas: {generated} extracted, {by_hand} written by hand")
+
+
+def stage_cloze(pipeline, lessons):
+    """Generate cloze tasks from the reading sentences that contain lesson vocabulary"""
+    tasks, questions = build_cloze.generate_cloze(
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    )
+    print(f"  ✓ Cloze: {questions} questions in {tasks} tasks")
+
+
+def stage_vocabulary(pipeline, lessons):
+    """Merge every lesson's vocabulary into the shared store and reference it from the lessons"""
+    lesson_data = [
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    ]
+    # Published lessons outside this build still point at their entries
+    building = {lesson_id for lesson_id, _ in lesson_data}
+    others = [
+        (entry['id'], data) for entry, data in lesson_config.iter_published(expand=False)
+        if entry['id'] not in building
+    ]
+    keep = {ref for _, data in others for ref in vocab_store.lesson_refs(data)}
+    added, removed = vocab_store.build_store(lesson_data, pipeline.vocab_store, keep)
+
+    dangling = vocab_store.dangling_refs(lesson_data + others, pipeline.vocab_store)
+    if dangling:
+        lesson_id, ref = dangling[0]
+        raise RuntimeError(f"vocabulary store would lose {len(dangling)} referenced entries ({lesson_id}: {ref})")
+    root = lesson_config.lessons_root()
+    pipeline.publish(f"{root}/{vocab_store.STORE_FILE}", vocab_store.store_data(pipeline.vocab_store), indent=2)
+    print(f"  ✓ {len(pipeline.vocab_store)} shared entries ({added} added, {removed} unused removed)")
+
+
+def stage_versions(pipeline, lessons):
+    """Version changed lessons and publish JSON-patch deltas from their previous version"""
+    # Versions and patches describe the lesson files as published (store references compacted)
+    files, snapshots = build_deltas.update_versions((
+        (lesson['id'], vocab_store.compact_lesson(data, pipeline.vocab_store)) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    ), pipeline.manifest)
+    root = lesson_config.lessons_root()
+    for rel_path, ops in files.items():
+        pipeline.publish(f"{root}/{rel_path}", ops)
+    for lesson_id, snapshot in snapshots.items():
+        pipeline.publish(f"{build_deltas.SNAPSHOT_DIR}/{lesson_id}.json", snapshot, indent=2)
+    print(f"  ✓ {len(snapshots)} lessons changed, {len(files)} delta patches")
+
+
+def stage_precache(pipeline, lessons):
+    """Precache manifest and offline packs, built from the files once they are written"""
+    root = lesson_config.lessons_root()
+
+    def write_precache():
+        precache = build_precache.build_precache(root)
+        print(f"  ✓ Precache: {len(precache['files'])} files in {len(precache['groups'])} packs")
+        return [f"{root}/{build_precache.PRECACHE_FILE}"]
+
+    pipeline.after_write.append(write_precache)
+    print("  ℹ Precache manifest is built after the lessons are written")
+
+
+def stage_ids(pipeline, lessons):
+    """Give every vocabulary entry its global integer id (append-only registry)"""
+    keys = vocab_ids.load_registry()
+    renamed = sum(vocab_ids.rename_ids(keys, lesson_id, mapping) for lesson_id, mapping in pipeline.renamed_ids.items())
+    if renamed:
+        print(f"  ✓ {renamed} vocabulary ids renamed (vids kept)")
+    lesson_data = [
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    ]
+    added = vocab_ids.assign_ids(lesson_data, keys)
+    if added:
+        print(f"  ✓ {added} new vocabulary ids")
+    pipeline.publish(vocab_ids.REGISTRY_PATH, vocab_ids.registry_data(keys), indent=2)
+
+
+def stage_difficulty(pipeline, lessons):
+    """Score text and vocabulary difficulty; the lesson summary goes into the manifest"""
+    summaries = build_difficulty.score_lessons((
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    ), build_difficulty.load_bands())
+    for entry in pipeline.manifest.get('lessons', []):
+        if entry.get('id') in summaries:
+            entry['difficulty'] = summaries[entry['id']]
+    print(f"  ✓ Scored {len(summaries)} lessons")
+
+
+def stage_candidates(pipeline, lessons):
+    """Propose new vocabulary from the reading texts (teacher report, not published)"""
+    results = build_candidates.mine_candidates(
+        (lesson['id'], data) for lesson in lessons
+        if (data := pipeline.lesson_data(lesson)) is not None
+    )
+    pipeline.publish(build_candidates.CANDIDATES_PATH, {"version": build_candidates.CANDIDATES_VERSION, "lessons": results}, indent=2)
+    print(f"  ✓ {sum(len(c) for c in results.values())} vocabulary candidates in {build_candidates.CANDIDATES_PATH}")
+
+
+# name -> dependencies and the function that runs it
+PIPELINE_STAGES = {
+    'convert': {'after': [], 'per_lesson': stage_convert},
+    'translate': {'after': ['convert'], 'global': stage_translate},
+    'enrich': {'after': ['convert', 'translate'], 'per_lesson': stage_enrich},
+    'ids': {'after': ['convert'], 'global': stage_ids},
+    'vocabulary': {'after': ['convert', 'enrich'], 'global': stage_vocabulary},
+    'answers': {'after': ['convert'], 'per_lesson': stage_answers},
+    'align': {'after': ['enrich'], 'global': stage_align},
+    'main_ideas': {'after': ['enrich'], 'global': stage_main_ideas},
+    'cloze': {'after': ['enrich', 'answers', 'align'], 'global': stage_cloze},
+    'manifest': {'after': ['enrich', 'answers'], 'global': stage_manifest},
+    'search': {'after': ['manifest'], 'global': stage_search},
+    'games': {'after': ['enrich'], 'global': stage_games},
+    'audio': {'after': ['enrich'], 'global': stage_audio},
+    'media': {'after': ['convert'], 'global': stage_media},
+    'phonemes': {'after': ['enrich'], 'global': stage_phonemes},
+    'morphology': {'after': ['convert'], 'global': stage_morphology},
+    'examples': {'after': ['enrich', 'answers'], 'global': stage_examples},
+    'difficulty': {'after': ['manifest'], 'global': stage_difficulty},
+    'candidates': {'after': ['enrich'], 'global': stage_candidates},
+    'versions': {'after': ['enrich', 'answers', 'ids', 'vocabulary', 'phonemes', 'examples', 'align', 'main_ideas',
+                           'cloze', 'media', 'manifest'],
+                 'global': stage_versions},
+}
+
+# Last: packs whatever the other stages wrote
+PIPELINE_STAGES['precache'] = {'after': list(PIPELINE_STAGES), 'global': stage_precache}
+
+# What the standalone converters run: a fresh parse, published fields carried over,
+# vids and store references kept (enrichment and indexes are left to the full pipeline)
+CONVERT_STAGES = ['convert', 'answers', 'ids', 'vocabulary']
+
+
+def stage_order(selected):
+    """Topological order of the selected stages (unselected dependencies are skipped)"""
+    graph = {
+        name: [dep for dep in PIPELINE_STAGES[name]['after'] if dep in selected]
+        for name in selected
+    }
+    return list(TopologicalSorter(graph).static_order())
+
+
+class LessonPipeline:
+    """Holds lessons, manifest and lookups in memory while stages run over them"""
+
+    def __init__(self, lessons, enrich=True, offline=False, reconvert=False, manifest_path=None, dry_run=False):
+        self.lessons = lessons
+        self.selected = lessons   # lessons the per-lesson stages of the current run cover
+        self.enrich = enrich
+        self.reconvert = reconvert
+        self.dry_run = dry_run    # stages that write files themselves (audio, media) only report
+        self.manifest_path = manifest_path or lesson_config.manifest_path()
+        self.cache = LookupCache(offline=offline)
+        self.cache.install()
+        self.vocab_store = lesson_config.lessons_store()   # shared vocabulary entries by key
+
+        self.data = {}            # lesson id -> lesson dict being built
+        self.new_words = {}       # lesson id -> vocabulary entries added by conversion
+        self.renamed_ids = {}     # lesson id -> {old id: new id} since the published build
+        self.published = {}       # lesson id -> lesson dict as currently published
+        self.published_text = {}  # lesson id / manifest -> serialized JSON on disk
+        self.artifacts = {}       # path -> generated data (indexes, banks, ...) written compact
+        self.after_write = []     # callables run once everything is on disk
+
+        for lesson in lessons:
+            self.load_published(lesson)
+
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            self.published_text['manifest'] = f.read()
+        self.manifest = json.loads(self.published_text['manifest'])
+
+    def load_published(self, lesson):
+        """Read the published JSON for a lesson (if any) and seed the lookup cache"""
+        try:
+            with instrumentation.stage('json_load'), open(lesson['output'], 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            return
+        self.published_text[lesson['id']] = text
+        self.published[lesson['id']] = vocab_store.expand_lesson(json.loads(text), self.vocab_store)
+        self.cache.seed(self.published[lesson['id']])
+
+    def lesson_data(self, lesson):
+        """In-memory lesson dict, starting from the published JSON when it was not converted"""
+        lesson_id = lesson['id']
+        if lesson_id not in self.data and lesson_id in self.published_text:
+            self.data[lesson_id] = vocab_store.expand_lesson(json.loads(self.published_text[lesson_id]), self.vocab_store)
+        return self.data.get(lesson_id)
+
+    def publish(self, path, data, indent=None):
+        """Queue a generated artifact for the final write (compact unless indent is given)"""
+        self.artifacts[path] = (data, indent)
+
+    def run(self, stages, lessons=None):
+        """
+        Run stages (in dependency order); per-lesson stages cover lessons (default: all),
+        course-wide stages always cover every lesson
+        """
+        lessons = lessons or self.lessons
+        self.selected = lessons
+
+        for name in stage_order(stages):
+            stage = PIPELINE_STAGES[name]
+            print(f"\n{'='*60}")
+            print(f"Stage: {name} ({len(self.lessons if 'global' in stage else lessons)} lessons)")
+            print(f"{'='*60}")
+
+            if 'global' in stage:
+                # Course-wide stages always see every lesson
+                instrumentation.set_lesson(None)
+                with instrumentation.stage(name):
+                    stage['global'](self, self.lessons)
+                continue
+
+            for lesson in lessons:
+                instrumentation.set_lesson(f"{lesson['id']}.json")
+                try:
+                    with instrumentation.stage(name):
+                        stage['per_lesson'](self, lesson)
+                except Exception as e:
+                    print(f"✗ {name} failed for {lesson['id']}: {e}")
+                    import traceback
+                    traceback.print_exc()
+
+    def write(self, dry_run=False):
+        """Serialize every changed lesson and the manifest once; returns written paths"""
+        dry_run = dry_run or self.dry_run
+        written = []
+        outputs = [(lesson['id'], lesson['output'], self.data.get(lesson['id'])) for lesson in self.lessons]
+        outputs.append(('manifest', self.manifest_path, self.manifest))
+
+        for key, path, data in outputs:
+            if data is None:
+                continue
+
+            instrumentation.set_lesson(os.path.basename(path))
+            with instrumentation.stage('serialize'):
+                published = self.published_text.get(key, '')
+                stored = data if key == 'manifest' else vocab_store.compact_lesson(data, self.vocab_store)
+                if published and json.loads(published) == stored:
+                    continue
+
+                text = json.dumps(stored, ensure_ascii=False, indent=2)
+                if published.endswith('\n'):
+                    text += '\n'
+
+                if not dry_run:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(text)
+
+            self.published_text[key] = text
+            if key != 'manifest':
+                self.published[key] = data
+                self.cache.seed(data)
+            written.append(path)
+
+        for path, (data, indent) in self.artifacts.items():
+            instrumentation.set_lesson(os.path.basename(path))
+            with instrumentation.stage('serialize'):
+                if indent:
+                    text = json.dumps(data, ensure_ascii=False, indent=indent) + '\n'
+                else:
+                    text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        if f.read() == text:
+                            continue
+                except FileNotFoundError:
+                    pass
+
+                if not dry_run:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(text)
+            written.append(path)
+
+        if not dry_run:
+            for step in self.after_write:
+                written.extend(step())
+
+        self.data = {}
+        self.new_words = {}
+        self.renamed_ids = {}
+        self.artifacts = {}
+        self.after_write = []
+        return written
+
+
+def convert_lessons(lessons):
+    """
+    Rebuild lessons from their DOCX through the pipeline (used by the standalone converters)
+    Nothing is fetched; lessons are written with write_lesson's store compaction.
+    Returns {lesson id: converted lesson data} (lessons that failed to parse are missing).
+    """
+    pipeline = LessonPipeline(lessons, enrich=False, offline=True, reconvert=True)
+    pipeline.run(CONVERT_STAGES)
+    converted = {lesson_id: pipeline.data[lesson_id] for lesson_id in pipeline.new_words}
+    pipeline.write()
+    return converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the lesson content pipeline')
+    parser.add_argument('--config', default=lesson_config.CONFIG_PATH, help='pipeline config file')
+    parser.add_argument('--stages', default=','.join(PIPELINE_STAGES),
+                        help=f"comma-separated stages to run (default: {','.join(PIPELINE_STAGES)})")
+    parser.add_argument('--only', action='append', metavar='LESSON_ID', help='convert/enrich only these lesson ids (course-wide stages still cover every lesson)')
+    parser.add_argument('--no-discover', action='store_true', help='ignore DOCX files missing from the config')
+    parser.add_argument('--reconvert', action='store_true', help='rebuild already published lessons from their DOCX')
+    parser.add_argument('--no-enrich', action='store_true', help='skip dictionary/translation enrichment')
+    parser.add_argument('--offline', action='store_true', help='only reuse known data, never call the APIs')
+    parser.add_argument('--translator', choices=auto_fill_vocab.TRANSLATORS, default=auto_fill_vocab.TRANSLATOR,
+                        help='translation backend (local: offline CPU model, see local_translate.py)')
+    parser.add_argument('--dry-run', action='store_true', help='report changed files without writing them')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = [s for s in stages if s not in PIPELINE_STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    if not auto_fill_vocab.use_translator(args.translator):
+        return
+
+    lessons = lesson_config.load_lessons(args.config, discover=not args.no_discover)
+    selected = [l for l in lessons if l['id'] in args.only] if args.only else lessons
+    if not selected:
+        parser.error(f"no lessons match --only {', '.join(args.only)}")
+
+    for lesson in selected:
+        if lesson.get('discovered'):
+            print(f"ℹ Discovered {lesson['source']} → {lesson['id']} (add it to {args.config} to pin id/title)")
+
+    with instrumentation.session(args):
+        pipeline = LessonPipeline(
+            lessons,
+            enrich=not args.no_enrich,
+            offline=args.offline,
+            reconvert=args.reconvert,
+            manifest_path=lesson_config.manifest_path(args.config),
+            dry_run=args.dry_run
+        )
+        pipeline.run(stages, selected)
+        written = pipeline.write(dry_run=args.dry_run)
+
+    print(f"\n{'='*60}")
+    print("Pipeline Summary:")
+    print(f"{'='*60}")
+    print(f"  Lessons: {len(selected)} converted/enriched, {len(lessons)} in course-wide stages")
+    print(f"  Stages: {' → '.join(stage_order(stages))}")
+    print(f"  Lookups: {pipeline.cache.hits} cached / {pipeline.cache.misses} fetched")
+    print(f"  {'Would write' if args.dry_run else 'Written'}: {len(written)} files")
+    for path in written:
+        print(f"    • {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import { LESSONS_PATH } from '../../constants/config.js';
+
+/**
+ * LessonImage Component - Picture from the lesson DOCX with its AVIF/WebP derivatives
+ * The browser picks the smallest derivative that fits (see build_media.py).
+ */
+export default function LessonImage({ image, sizes = '(max-width: 720px) 100vw, 720px', className = '' }) {
+  if (!image?.src) return null;
+
+  const variants = image.variants || [];
+  const types = [...new Set(variants.map(v => v.type))];
+
+  return (
+    <picture className={['lesson-image', className].filter(Boolean).join(' ')}>
+      {types.map(type => (
+        <source
+          key={type}
+          type={type}
+          sizes={sizes}
+          srcSet={variants
+            .filter(v => v.type === type)
+            .map(v => `${LESSONS_PATH}/${v.src} ${v.width}w`)
+            .join(', ')}
+        />
+      ))}
+      <img
+        src={`${LESSONS_PATH}/${image.src}`}
+        width={image.width}
+        height={image.height}
+        alt=""
+        loading="lazy"
+        decoding="async"
+      />
+    </picture>
+  );
+}
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import Button from '../common/Button.jsx';
+import LessonImage from '../common/LessonImage.jsx';
 import { buildRoute } from '../../constants/routes.js';
 
 /**
@@ -199,9 +200,11 @@ export default function FillInTheBlanksExercise({ exerciseData, lessonId }) {
 
   const results = showResults ? getResults() : null;
 
-  // Build word bank from answers instead of config
+  // Build word bank from answers instead of config (generated tasks add distractors to theirs)
   const usedWords = Object.values(userAnswers);
-  const allAnswers = currentTask.questions.map(q => q.answer);
+  const allAnswers = currentTask.distractors
+    ? currentTask.wordBank
+    : currentTask.questions.map(q => q.answer);
   const availableWords = allAnswers.filter(word =>
     !usedWords.includes(word)
   );
@@ -277,6 +280,11 @@ export default function FillInTheBlanksExercise({ exerciseData, lessonId }) {
         </div>
       )}
 
+      {/* Pictures of the task */}
+      {currentTask.images?.map(image => (
+        <LessonImage key={image.id} image={image} className="fill-blanks-exercise__image" />
+      ))}
+
       {/* Results Summary */}
       {showResults && results && (
         <div className="fill-blanks-exercise__results">
@@ -7,6 +7,7 @@ import { buildRoute } from '../../constants/routes.js';
 import { GAME_CONFIG, GAME_TYPES } from '../../constants/games.js';
 import { shuffleArray } from '../../utils/gameUtils.js';
 import storageService from '../../services/storageService.js';
+import { GRADES } from '../../utils/srsScheduler.js';
 
 /**
  * FlashCardGame - Simple flashcard review with auto-advance
@@ -106,6 +107,16 @@ export default function FlashCardGame({ lessonId, vocabulary }) {
     storageService.saveFlashcardProgress(lessonId, knownArray, reviewArray);
   }, [knownCards, reviewCards, lessonId]);
 
+  // Write pending spaced-repetition reviews when leaving the game
+  useEffect(() => () => storageService.flushReviews(), []);
+
+  // Reschedule the card (needs the global vocabulary id from the pipeline)
+  const recordReview = (grade) => {
+    if (Number.isInteger(currentCard.vid)) {
+      storageService.recordReview(currentCard.vid, grade);
+    }
+  };
+
   const handleCardClick = () => {
     // Only flip if not dragging
     if (!hasMoved.current) {
@@ -270,6 +281,7 @@ export default function FlashCardGame({ lessonId, vocabulary }) {
   const handleKnow = () => {
     // Trigger button highlight animation
     triggerButtonHighlight(knowBtnRef);
+    recordReview(GRADES.GOOD);
 
     const cardId = currentCard.word;
     setKnownCards(prev => {
@@ -288,6 +300,7 @@ export default function FlashCardGame({ lessonId, vocabulary }) {
   const handleReview = () => {
     // Trigger button highlight animation
     triggerButtonHighlight(reviewBtnRef);
+    recordReview(GRADES.AGAIN);
 
     const cardId = currentCard.word;
     setReviewCards(prev => {
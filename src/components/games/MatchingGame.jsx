@@ -10,11 +10,11 @@ import { createMatchingPairs, calculateScore } from '../../utils/gameUtils.js';
 /**
  * MatchingGame - Match words with definitions
  */
-export default function MatchingGame({ lessonId, vocabulary }) {
+export default function MatchingGame({ lessonId, vocabulary, itemBank }) {
   const navigate = useNavigate();
   const gameConfig = GAME_CONFIG[GAME_TYPES.MATCHING];
   const numPair = 7;
-  const [gameData, setGameData] = useState(() => createMatchingPairs(vocabulary, numPair));
+  const [gameData, setGameData] = useState(() => createMatchingPairs(vocabulary, numPair, itemBank));
   const [selectedItems, setSelectedItems] = useState([]);
   const [matchedPairs, setMatchedPairs] = useState([]);
   const [errorItems, setErrorItems] = useState([]);
@@ -78,7 +78,7 @@ export default function MatchingGame({ lessonId, vocabulary }) {
   };
 
   const handlePlayAgain = () => {
-    setGameData(createMatchingPairs(vocabulary, numPair));
+    setGameData(createMatchingPairs(vocabulary, numPair, itemBank));
     setSelectedItems([]);
     setMatchedPairs([]);
     setErrorItems([]);
@@ -5,16 +5,16 @@ import GameResult from './GameResult.jsx';
 import Button from '../common/Button.jsx';
 import { buildRoute } from '../../constants/routes.js';
 import { GAME_CONFIG, GAME_TYPES } from '../../constants/games.js';
-import { shuffleArray, generateWrongOptions, calculateScore } from '../../utils/gameUtils.js';
+import { shuffleArray, pickWrongOptions, calculateScore } from '../../utils/gameUtils.js';
 
 /**
  * MultipleChoiceGame - Choose the correct definition
  */
-export default function MultipleChoiceGame({ lessonId, vocabulary }) {
+export default function MultipleChoiceGame({ lessonId, vocabulary, itemBank }) {
   const navigate = useNavigate();
   const gameConfig = GAME_CONFIG[GAME_TYPES.MULTIPLE_CHOICE];
 
-  const [questions, setQuestions] = useState(() => generateQuestions(vocabulary));
+  const [questions, setQuestions] = useState(() => generateQuestions(vocabulary, itemBank));
   const [currentIndex, setCurrentIndex] = useState(0);
   const [selectedAnswer, setSelectedAnswer] = useState(null);
   const [isAnswered, setIsAnswered] = useState(false);
@@ -62,7 +62,7 @@ export default function MultipleChoiceGame({ lessonId, vocabulary }) {
   };
 
   const handlePlayAgain = () => {
-    setQuestions(generateQuestions(vocabulary));
+    setQuestions(generateQuestions(vocabulary, itemBank));
     setCurrentIndex(0);
     setSelectedAnswer(null);
     setIsAnswered(false);
@@ -176,13 +176,13 @@ export default function MultipleChoiceGame({ lessonId, vocabulary }) {
 /**
  * Generate multiple choice questions
  */
-function generateQuestions(vocabulary, count = 10) {
+function generateQuestions(vocabulary, itemBank, count = 10) {
   const shuffled = shuffleArray(vocabulary);
   const selected = shuffled.slice(0, Math.min(count, vocabulary.length));
 
   return selected.map(item => {
     const allDefinitions = vocabulary.map(v => v.meaning);
-    const wrongOptions = generateWrongOptions(item.meaning, allDefinitions, 3);
+    const wrongOptions = pickWrongOptions(item, itemBank, allDefinitions, 3);
     const options = shuffleArray([item.meaning, ...wrongOptions]);
 
     return {
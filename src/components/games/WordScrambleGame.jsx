@@ -5,17 +5,17 @@ import GameResult from './GameResult.jsx';
 import Button from '../common/Button.jsx';
 import { buildRoute } from '../../constants/routes.js';
 import { GAME_CONFIG, GAME_TYPES } from '../../constants/games.js';
-import { shuffleArray, scrambleWord, isCorrectAnswer, calculateScore } from '../../utils/gameUtils.js';
+import { shuffleArray, pickScramble, isCorrectAnswer, calculateScore } from '../../utils/gameUtils.js';
 
 /**
  * WordScrambleGame - Unscramble letters to form words
  */
-export default function WordScrambleGame({ lessonId, vocabulary }) {
+export default function WordScrambleGame({ lessonId, vocabulary, itemBank }) {
   const navigate = useNavigate();
   const gameConfig = GAME_CONFIG[GAME_TYPES.WORD_SCRAMBLE];
   const inputRef = useRef(null);
 
-  const [questions, setQuestions] = useState(() => generateScrambledWords(vocabulary));
+  const [questions, setQuestions] = useState(() => generateScrambledWords(vocabulary, itemBank));
   const [currentIndex, setCurrentIndex] = useState(0);
   const [userAnswer, setUserAnswer] = useState('');
   const [isAnswered, setIsAnswered] = useState(false);
@@ -71,7 +71,7 @@ export default function WordScrambleGame({ lessonId, vocabulary }) {
   };
 
   const handlePlayAgain = () => {
-    setQuestions(generateScrambledWords(vocabulary));
+    setQuestions(generateScrambledWords(vocabulary, itemBank));
     setCurrentIndex(0);
     setUserAnswer('');
     setIsAnswered(false);
@@ -185,7 +185,7 @@ export default function WordScrambleGame({ lessonId, vocabulary }) {
 /**
  * Generate scrambled word questions
  */
-function generateScrambledWords(vocabulary, count = 10) {
+function generateScrambledWords(vocabulary, itemBank, count = 10) {
   const shuffled = shuffleArray(vocabulary);
   const selected = shuffled.slice(0, Math.min(count, vocabulary.length));
 
@@ -193,6 +193,6 @@ function generateScrambledWords(vocabulary, count = 10) {
     word: item.word,
     definition: item.meaning,
     pos: item.pos,
-    scrambled: scrambleWord(item.word)
+    scrambled: pickScramble(item, itemBank)
   }));
 }
@@ -1,13 +1,51 @@
 import { useState } from 'react';
+import LessonImage from '../common/LessonImage.jsx';
+
+/**
+ * Cut a text into the sentence spans of paragraph.alignment (build_alignment.py)
+ * @param {string} text
+ * @param {Array<number[]>} alignment - [textStart, textEnd, translationStart, translationEnd]
+ * @param {number} side - 0 for the text, 2 for the translation
+ * @returns {Array<{text: string, pair: number}>} Segments (pair -1 between spans)
+ */
+const alignedSegments = (text, alignment, side) => {
+  const segments = [];
+  let position = 0;
+  alignment.forEach((span, pair) => {
+    const [start, end] = [span[side], span[side + 1]];
+    if (start > position) segments.push({ text: text.slice(position, start), pair: -1 });
+    segments.push({ text: text.slice(start, end), pair });
+    position = end;
+  });
+  if (position < text.length) segments.push({ text: text.slice(position), pair: -1 });
+  return segments;
+};
 
 /**
  * ReadingParagraph Component - Displays a reading paragraph with clickable words
+ * With the translation shown, hovering a sentence highlights its aligned translation.
  */
 export default function ReadingParagraph({
   paragraph,
   showTranslation,
   onWordClick
 }) {
+  const [activePair, setActivePair] = useState(-1);
+  const alignment = showTranslation && paragraph.translation ? paragraph.alignment : null;
+
+  const renderAligned = (text, side) => alignedSegments(text, alignment, side).map((segment, i) => (
+    segment.pair < 0 ? segment.text : (
+      <span
+        key={i}
+        className={`reading-paragraph__sentence${segment.pair === activePair ? ' reading-paragraph__sentence--active' : ''}`}
+        onMouseEnter={() => setActivePair(segment.pair)}
+        onMouseLeave={() => setActivePair(-1)}
+      >
+        {segment.text}
+      </span>
+    )
+  ));
+
   const handleTextClick = (e) => {
     // Get the clicked word
     const selection = window.getSelection();
@@ -53,15 +91,18 @@ export default function ReadingParagraph({
       <div className="reading-paragraph__label">
         {paragraph.label}
       </div>
+      {paragraph.images?.map(image => (
+        <LessonImage key={image.id} image={image} className="reading-paragraph__image" />
+      ))}
       <div
         className="reading-paragraph__text"
         onClick={handleTextClick}
       >
-        {paragraph.text}
+        {alignment ? renderAligned(paragraph.text, 0) : paragraph.text}
       </div>
       {showTranslation && paragraph.translation && (
         <div className="reading-paragraph__translation">
-          <em>{paragraph.translation}</em>
+          <em>{alignment ? renderAligned(paragraph.translation, 2) : paragraph.translation}</em>
         </div>
       )}
     </div>
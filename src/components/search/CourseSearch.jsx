@@ -0,0 +1,86 @@
+import { useState, useEffect } from 'react';
+import { useNavigate } from 'react-router-dom';
+import searchService from '../../services/searchService.js';
+import { buildRoute } from '../../constants/routes.js';
+
+const KIND_LABELS = {
+  vocabulary: '📚 Vocabulary',
+  reading: '📖 Reading',
+  question: '✏️ Exercise'
+};
+
+/**
+ * CourseSearch Component - Search words and phrases across all lessons
+ */
+export default function CourseSearch() {
+  const [query, setQuery] = useState('');
+  const [results, setResults] = useState([]);
+  const [error, setError] = useState(null);
+  const navigate = useNavigate();
+
+  useEffect(() => {
+    if (!query.trim()) {
+      setResults([]);
+      return;
+    }
+
+    // Debounce typing
+    const timer = setTimeout(() => {
+      searchService.search(query)
+        .then(found => {
+          setResults(found);
+          setError(null);
+        })
+        .catch(err => {
+          console.error('Search failed:', err);
+          setError('Search is not available right now.');
+        });
+    }, 150);
+
+    return () => clearTimeout(timer);
+  }, [query]);
+
+  const handleResultClick = (result) => {
+    if (result.kind === 'vocabulary') {
+      navigate(buildRoute.vocabulary(result.lessonId));
+    } else if (result.kind === 'question') {
+      navigate(buildRoute.exercise(result.lessonId));
+    } else {
+      navigate(buildRoute.reading(result.lessonId));
+    }
+  };
+
+  return (
+    <div className="course-search">
+      <input
+        type="search"
+        className="course-search__input"
+        placeholder="Search words and phrases in all lessons..."
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+      />
+
+      {error && <p className="course-search__empty">{error}</p>}
+
+      {query.trim() && !error && (
+        <ul className="course-search__results">
+          {results.length === 0 ? (
+            <li className="course-search__empty">No results for "{query}"</li>
+          ) : (
+            results.map((result, index) => (
+              <li
+                key={`${result.lessonId}-${result.ref}-${index}`}
+                className="course-search__result"
+                onClick={() => handleResultClick(result)}
+              >
+                <span className="course-search__kind">{KIND_LABELS[result.kind]}</span>
+                <span className="course-search__lesson">{result.lessonId}</span>
+                <p className="course-search__text">{result.text}</p>
+              </li>
+            ))
+          )}
+        </ul>
+      )}
+    </div>
+  );
+}
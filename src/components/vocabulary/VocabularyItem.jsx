@@ -1,6 +1,7 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import Button from '../common/Button.jsx';
 import audioService from '../../services/audioService.js';
+import phonemeService from '../../services/phonemeService.js';
 
 /**
  * VocabularyItem Component - Display a single vocabulary word
@@ -13,14 +14,27 @@ export default function VocabularyItem({
 }) {
   const [isPlaying, setIsPlaying] = useState(false);
   const [showDetails, setShowDetails] = useState(false);
+  const [minimalPairs, setMinimalPairs] = useState([]);
 
-  const handlePlayAudio = async (e) => {
+  // Minimal pairs from the phoneme index, loaded when the details open
+  useEffect(() => {
+    if (!showDetails) return;
+    let cancelled = false;
+    phonemeService.getMinimalPairs({ word: word.word })
+      .then(pairs => !cancelled && setMinimalPairs(pairs))
+      .catch(() => !cancelled && setMinimalPairs([]));
+    return () => {
+      cancelled = true;
+    };
+  }, [showDetails, word.word]);
+
+  const handlePlayAudio = async (e, text = word.word) => {
     e.stopPropagation(); // Prevent card toggle
     if (isPlaying) return;
 
     try {
       setIsPlaying(true);
-      await audioService.play(word.word);
+      await audioService.play(text);
     } catch (error) {
       console.error('Failed to play audio:', error);
     } finally {
@@ -104,13 +118,56 @@ export default function VocabularyItem({
             <div className="vocabulary-item__section">
               <strong>From reading:</strong>
               <p className="vocabulary-item__example">
-                {word.exampleFromReading.text}
+                {highlightExample(word.exampleFromReading)}
               </p>
             </div>
           )}
 
+          {minimalPairs.length > 0 && (
+            <div className="vocabulary-item__section">
+              <strong>Minimal pairs:</strong>
+              <ul className="vocabulary-item__pairs">
+                {minimalPairs.map(({ first, second, sounds }) => {
+                  const isFirst = first.word.toLowerCase() === word.word.toLowerCase();
+                  const other = isFirst ? second : first;
+                  const [own, contrast] = isFirst ? sounds : [...sounds].reverse();
+                  return (
+                    <li key={`${other.word}-${contrast}`} className="vocabulary-item__pair">
+                      <button
+                        className="vocabulary-item__audio-btn"
+                        onClick={(e) => handlePlayAudio(e, other.word)}
+                        disabled={isPlaying}
+                        title="Phát âm"
+                      >
+                        🔊
+                      </button>
+                      <span>{other.word}</span>
+                      <span className="vocabulary-item__pronunciation">/{other.ipa}/</span>
+                      <span className="vocabulary-item__pair-sounds">/{own}/ – /{contrast}/</span>
+                    </li>
+                  );
+                })}
+              </ul>
+            </div>
+          )}
         </div>
       )}
     </div>
   );
 }
+
+/**
+ * Highlight the vocabulary occurrence in an example sentence (offsets from build_examples.py)
+ */
+function highlightExample({ text, start, end }) {
+  if (start == null || end == null) {
+    return text;
+  }
+  return (
+    <>
+      {text.slice(0, start)}
+      <mark className="vocabulary-item__highlight">{text.slice(start, end)}</mark>
+      {text.slice(end)}
+    </>
+  );
+}
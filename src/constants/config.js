@@ -12,7 +12,8 @@ export const LESSONS_PATH = `${import.meta.env.BASE_URL}lessons/json`.replace(/\
 // LocalStorage keys
 export const STORAGE_KEYS = {
   PROGRESS: 'english_learning_progress',
-  CACHE: 'english_learning_cache'
+  CACHE: 'english_learning_cache',
+  LESSONS: 'english_learning_lesson'
 };
 
 // Cache duration (1 day)
@@ -33,6 +33,7 @@ export default function GamePlayPage() {
   const navigate = useNavigate();
 
   const [vocabulary, setVocabulary] = useState([]);
+  const [itemBank, setItemBank] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -43,8 +44,12 @@ export default function GamePlayPage() {
   const loadVocabulary = async () => {
     try {
       setIsLoading(true);
-      const vocab = await lessonService.getVocabulary(lessonId);
+      const [vocab, bank] = await Promise.all([
+        lessonService.getVocabulary(lessonId),
+        lessonService.getGameBank(lessonId)
+      ]);
       setVocabulary(vocab);
+      setItemBank(bank);
     } catch (err) {
       console.error('Failed to load vocabulary:', err);
       setError('Failed to load vocabulary. Please try again.');
@@ -84,6 +89,7 @@ export default function GamePlayPage() {
       <GameComponent
         lessonId={lessonId}
         vocabulary={vocabulary}
+        itemBank={itemBank}
       />
     </div>
   );
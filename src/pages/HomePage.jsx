@@ -3,6 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import Card from '../components/common/Card.jsx';
 import Button from '../components/common/Button.jsx';
 import Loading from '../components/common/Loading.jsx';
+import CourseSearch from '../components/search/CourseSearch.jsx';
 import lessonService from '../services/lessonService.js';
 import storageService from '../services/storageService.js';
 import { buildRoute } from '../constants/routes.js';
@@ -33,6 +34,14 @@ function LessonCard({ lesson, stats, onVocabularyClick, onReadingClick, onExerci
     <Card className="lesson-card">
       <div className="lesson-card__header">
         <span className="lesson-card__unit">{lesson.unit}</span>
+        {lesson.difficulty && (
+          <span
+            className="lesson-card__level"
+            title={lesson.difficulty.grade !== undefined ? `Reading grade ${lesson.difficulty.grade}` : undefined}
+          >
+            {lesson.difficulty.cefr}
+          </span>
+        )}
       </div>
 
       <h2 className="lesson-card__title">{lesson.title}</h2>
@@ -95,6 +104,9 @@ export default function HomePage() {
     // Load cached tab from localStorage
     return localStorage.getItem('homeActiveTab') || 'reading';
   });
+  const [sortByLevel, setSortByLevel] = useState(() => {
+    return localStorage.getItem('homeSortByLevel') === 'true';
+  });
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -106,6 +118,10 @@ export default function HomePage() {
     localStorage.setItem('homeActiveTab', activeTab);
   }, [activeTab]);
 
+  useEffect(() => {
+    localStorage.setItem('homeSortByLevel', String(sortByLevel));
+  }, [sortByLevel]);
+
   const loadLessons = async () => {
     try {
       setIsLoading(true);
@@ -149,6 +165,14 @@ export default function HomePage() {
   };
 
   const filteredLessons = lessons.filter(lesson => lesson.typeLesson === activeTab);
+  const hasLevels = filteredLessons.some(lesson => lesson.difficulty);
+
+  // Easiest first by the difficulty score from the manifest (unscored lessons last)
+  if (sortByLevel && hasLevels) {
+    filteredLessons.sort((a, b) =>
+      (a.difficulty?.score ?? Infinity) - (b.difficulty?.score ?? Infinity)
+    );
+  }
 
   const getProgressStats = async (lesson) => {
     const { learnedWords = [] } = lesson.progress || {};
@@ -190,6 +214,8 @@ export default function HomePage() {
         <h1>English Learning</h1>
       </header>
 
+      <CourseSearch />
+
       <div className="home-page__tabs">
         <button
           className={`home-page__tab ${activeTab === 'reading' ? 'home-page__tab--active' : ''}`}
@@ -203,6 +229,15 @@ export default function HomePage() {
         >
           🎧 Listening
         </button>
+        {hasLevels && (
+          <button
+            className={`home-page__tab ${sortByLevel ? 'home-page__tab--active' : ''}`}
+            onClick={() => setSortByLevel(!sortByLevel)}
+            title="Sort by estimated CEFR level"
+          >
+            {sortByLevel ? 'Easiest first' : 'Unit order'}
+          </button>
+        )}
       </div>
 
       <div className="home-page__lessons">
@@ -53,10 +53,9 @@ export default function ReadingPage() {
       const result = await dictionaryService.lookup(word, vocabulary);
       setWordData(result);
 
-      // Mark word as learned if from vocabulary
-      const vocabWord = vocabulary.find(v => v.word.toLowerCase() === word.toLowerCase());
-      if (vocabWord) {
-        storageService.addLearnedWord(lessonId, vocabWord.id);
+      // Mark word as learned if from vocabulary (also matches inflected forms)
+      if (result.source === 'vocabulary' && result.id) {
+        storageService.addLearnedWord(lessonId, result.id);
       }
     } catch (err) {
       console.error('Failed to lookup word:', err);
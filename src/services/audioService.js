@@ -1,15 +1,20 @@
 import { AUDIO_CONFIG, API_CONFIG } from '../constants/config.js';
+import lessonService from './lessonService.js';
 
 /**
  * Audio Service - Handle word pronunciation
- * Uses Web Speech API (primary) and Google TTS (fallback)
+ * Uses pre-rendered audio files (built by build_audio.py) when available,
+ * then Web Speech API, then Google TTS (fallback)
  */
 class AudioService {
   constructor() {
     this.synthesis = window.speechSynthesis;
     this.currentUtterance = null;
+    this.currentAudio = null;
     this.isSupported = 'speechSynthesis' in window;
     this.voicesLoaded = false;
+    // Older Safari cannot decode the Opus clips build_audio.py renders by default
+    this.canPlayOpus = typeof Audio !== 'undefined' && new Audio().canPlayType('audio/ogg; codecs=opus') !== '';
 
     // Load voices on initialization
     if (this.isSupported) {
@@ -35,8 +40,20 @@ class AudioService {
    */
   async play(word, options = {}) {
     try {
-      // Try Web Speech API first
+      // Pre-rendered file: one cached static fetch
+      const url = options.forceAPI ? null : await this.playableAudioUrl(word);
+      if (url) {
+        try {
+          await this.playFile(url);
+          return;
+        } catch (error) {
+          // Missing or undecodable clip: speak the word instead
+          console.warn('Audio file failed, using speech synthesis:', error);
+        }
+      }
+
       if (this.isSupported && !options.forceAPI) {
+        // Web Speech API
         await this.playWithSpeechAPI(word, options);
       } else {
         // Fallback to Google TTS
@@ -48,6 +65,40 @@ class AudioService {
     }
   }
 
+  /**
+   * URL of the word's pre-rendered clip when this browser can decode it
+   * @param {string} word
+   * @returns {Promise<string|null>}
+   */
+  async playableAudioUrl(word) {
+    const url = await lessonService.getAudioUrl(word);
+    return url && (this.canPlayOpus || !url.endsWith('.opus')) ? url : null;
+  }
+
+  /**
+   * Play a pre-rendered audio file
+   * @param {string} url
+   * @returns {Promise<void>}
+   */
+  playFile(url) {
+    return new Promise((resolve, reject) => {
+      this.stop();
+
+      const audio = new Audio(url);
+      audio.onended = () => {
+        this.currentAudio = null;
+        resolve();
+      };
+      audio.onerror = () => {
+        this.currentAudio = null;
+        reject(new Error('Audio file playback failed'));
+      };
+
+      this.currentAudio = audio;
+      audio.play().catch(reject);
+    });
+  }
+
   /**
    * Play using Web Speech API (browser built-in)
    * @param {string} word
@@ -116,6 +167,10 @@ class AudioService {
    * Stop current playback
    */
   stop() {
+    if (this.currentAudio) {
+      this.currentAudio.pause();
+      this.currentAudio = null;
+    }
     if (this.isSupported && this.synthesis.speaking) {
       this.synthesis.cancel();
       this.currentUtterance = null;
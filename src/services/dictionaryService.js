@@ -1,9 +1,10 @@
 import { API_CONFIG } from '../constants/config.js';
 import storageService from './storageService.js';
+import morphologyService from './morphologyService.js';
 
 /**
  * Dictionary Service - Hybrid word lookup
- * Priority: JSON vocabulary → Cache → Free Dictionary API → Google Translate fallback
+ * Priority: JSON vocabulary (exact, then inflected forms / phrase templates) → Cache → Free Dictionary API → Google Translate fallback
  */
 class DictionaryService {
   /**
@@ -18,7 +19,8 @@ class DictionaryService {
     try {
       // 1. Check lesson vocabulary JSON (instant)
       if (vocabulary.length > 0) {
-        const found = vocabulary.find(v => v.word.toLowerCase() === normalizedWord);
+        const found = vocabulary.find(v => v.word.toLowerCase() === normalizedWord)
+          || await morphologyService.findVocabulary(word, vocabulary);
         if (found) {
           return await this.formatVocabularyResult(found);
         }
@@ -67,6 +69,7 @@ class DictionaryService {
     }
 
     return {
+      id: vocabItem.id,
       word: vocabItem.word,
       pronunciation: vocabItem.pronunciation || '',
       partOfSpeech: vocabItem.pos || '',
@@ -1,4 +1,7 @@
 import { LESSONS_PATH } from '../constants/config.js';
+import storageService from './storageService.js';
+import offlineService from './offlineService.js';
+import { applyPatch } from '../utils/jsonPatch.js';
 
 /**
  * Lesson Service - Handle lesson data loading and parsing
@@ -6,6 +9,9 @@ import { LESSONS_PATH } from '../constants/config.js';
 class LessonService {
   constructor() {
     this.lessons = new Map();
+    this.gameBanks = new Map();
+    this.audioManifest = null;
+    this.vocabularyStore = null;
     this.lessonList = [];
   }
 
@@ -26,8 +32,21 @@ class LessonService {
       const manifest = await manifestResponse.json();
       console.log('Manifest loaded:', manifest);
 
-      // Load metadata from each lesson file
+      // Load metadata from each lesson file (unless the manifest already lists it)
       const lessonPromises = manifest.lessons.map(async (item) => {
+        if (item.title && item.unit) {
+          return {
+            id: item.id,
+            fileName: item.fileName,
+            typeLesson: item.typeLesson,
+            unit: item.unit,
+            title: item.title,
+            difficulty: item.difficulty || null,
+            version: item.version || null,
+            versions: item.versions || []
+          };
+        }
+
         try {
           const response = await fetch(`${LESSONS_PATH}/${item.fileName}`);
           if (!response.ok) {
@@ -42,7 +61,10 @@ class LessonService {
             fileName: item.fileName,
             typeLesson: item.typeLesson,
             unit: lessonData.metadata.unit,
-            title: lessonData.metadata.title
+            title: lessonData.metadata.title,
+            difficulty: item.difficulty || null,
+            version: item.version || null,
+            versions: item.versions || []
           };
         } catch (error) {
           console.error(`Error loading lesson ${item.id}:`, error);
@@ -83,19 +105,34 @@ class LessonService {
         throw new Error(`Lesson ${lessonId} not found in lesson list`);
       }
 
-      const response = await fetch(`${LESSONS_PATH}/${lessonInfo.fileName}`);
-      if (!response.ok) {
-        throw new Error(`Failed to load lesson: ${response.statusText}`);
+      let lessonData = await this.loadCachedLesson(lessonInfo);
+      if (!lessonData) {
+        const response = await fetch(`${LESSONS_PATH}/${lessonInfo.fileName}`);
+        if (!response.ok) {
+          throw new Error(`Failed to load lesson: ${response.statusText}`);
+        }
+        lessonData = await response.json();
       }
 
-      const lessonData = await response.json();
-
       // Validate lesson structure
       this.validateLesson(lessonData);
 
+      if (lessonInfo.version) {
+        storageService.cacheLesson(lessonId, lessonInfo.version, lessonData);
+      }
+
+      // Vocabulary entries reference the shared store (vocab_store.py)
+      lessonData = await this.expandVocabulary(lessonData);
+
       // Cache the lesson
       this.lessons.set(lessonId, lessonData);
 
+      // Progress stores words by their global vocabulary id (vid)
+      storageService.registerVocabulary(lessonId, lessonData.vocabulary || []);
+
+      // The service worker installs this unit's offline pack first
+      offlineService.prioritizeUnit(lessonData.metadata?.unit);
+
       return lessonData;
     } catch (error) {
       console.error(`Failed to load lesson ${lessonId}:`, error);
@@ -103,6 +140,67 @@ class LessonService {
     }
   }
 
+  /**
+   * Load the shared vocabulary store once (lessons reference its entries)
+   * @returns {Promise<Object>} key -> shared fields
+   */
+  async loadVocabularyStore() {
+    if (!this.vocabularyStore) {
+      this.vocabularyStore = fetch(`${LESSONS_PATH}/vocabulary.json`)
+        .then(response => (response.ok ? response.json() : { entries: {} }))
+        .then(store => store.entries || {})
+        .catch(() => ({}));
+    }
+    return this.vocabularyStore;
+  }
+
+  /**
+   * Lesson with its vocabulary references filled from the store
+   * (lesson fields override the shared ones)
+   * @param {Object} lessonData - Lesson as published
+   * @returns {Promise<Object>} Lesson with full vocabulary entries
+   */
+  async expandVocabulary(lessonData) {
+    const vocabulary = lessonData.vocabulary || [];
+    if (!vocabulary.some(entry => entry.ref)) return lessonData;
+
+    const entries = await this.loadVocabularyStore();
+    return {
+      ...lessonData,
+      vocabulary: vocabulary.map(entry => (
+        entry.ref && entries[entry.ref] ? { ...entries[entry.ref], ...entry } : entry
+      ))
+    };
+  }
+
+  /**
+   * Lesson from the local cache, brought up to date with the delta patches
+   * published after its version (build_deltas.py)
+   * @param {Object} lessonInfo - Lesson list entry (version, versions)
+   * @returns {Promise<Object|null>} Lesson data, or null to download the whole lesson
+   */
+  async loadCachedLesson(lessonInfo) {
+    const cached = await storageService.getCachedLesson(lessonInfo.id);
+    if (!cached || !lessonInfo.version) return null;
+    if (cached.version === lessonInfo.version) return cached.data;
+
+    const start = lessonInfo.versions.indexOf(cached.version);
+    if (start < 0) return null;
+
+    try {
+      const chain = [...lessonInfo.versions.slice(start), lessonInfo.version];
+      const patches = await Promise.all(chain.slice(0, -1).map(async (from, i) => {
+        const response = await fetch(`${LESSONS_PATH}/versions/${lessonInfo.id}/${from}-${chain[i + 1]}.json`);
+        if (!response.ok) throw new Error(`Missing patch ${from}-${chain[i + 1]}`);
+        return response.json();
+      }));
+      return patches.reduce((data, ops) => applyPatch(data, ops), cached.data);
+    } catch (error) {
+      console.warn(`Delta update failed for ${lessonInfo.id}, downloading the lesson:`, error);
+      return null;
+    }
+  }
+
   /**
    * Get lesson metadata by ID
    * @param {string} lessonId
@@ -142,6 +240,56 @@ class LessonService {
     return lesson.fillInTheBlanks || { instructions: '', wordBank: [], questions: [] };
   }
 
+  /**
+   * Get the precomputed game item bank for a lesson (built by build_game_banks.py)
+   * @param {string} lessonId
+   * @returns {Promise<Object|null>} Item bank or null if not built
+   */
+  async getGameBank(lessonId) {
+    if (this.gameBanks.has(lessonId)) {
+      return this.gameBanks.get(lessonId);
+    }
+
+    let bank = null;
+    try {
+      const response = await fetch(`${LESSONS_PATH}/games/${lessonId}.json`);
+      if (response.ok) {
+        bank = await response.json();
+      }
+    } catch (error) {
+      console.warn(`No game bank for ${lessonId}, using random options`);
+    }
+
+    this.gameBanks.set(lessonId, bank);
+    return bank;
+  }
+
+  /**
+   * Load the pre-rendered audio manifest (built by build_audio.py)
+   * @returns {Promise<Object|null>} Manifest or null if audio was not built
+   */
+  async loadAudioManifest() {
+    if (!this.audioManifest) {
+      this.audioManifest = fetch(`${LESSONS_PATH}/audio/manifest.json`)
+        .then(response => (response.ok ? response.json() : null))
+        .catch(() => null);
+    }
+    return this.audioManifest;
+  }
+
+  /**
+   * Get the URL of pre-rendered audio for a word or example sentence
+   * @param {string} text
+   * @returns {Promise<string|null>} Audio URL or null if not pre-rendered
+   */
+  async getAudioUrl(text) {
+    const manifest = await this.loadAudioManifest();
+    // Same key as build_audio.normalize_text
+    const key = text.trim().split(/\s+/).join(' ').toLowerCase();
+    const fileName = manifest?.entries?.[key];
+    return fileName ? `${LESSONS_PATH}/audio/${fileName}` : null;
+  }
+
   /**
    * Find a vocabulary word by word text
    * @param {string} lessonId
@@ -174,6 +322,9 @@ class LessonService {
    */
   clearCache() {
     this.lessons.clear();
+    this.gameBanks.clear();
+    this.audioManifest = null;
+    this.vocabularyStore = null;
   }
 }
 
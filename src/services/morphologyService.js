@@ -0,0 +1,112 @@
+import { LESSONS_PATH } from '../constants/config.js';
+import searchService from './searchService.js';
+
+/**
+ * Morphology Service - Match inflected text to vocabulary headwords
+ * Uses the inflection table and phrase templates built by build_morphology.py
+ * (matching mirrors build_morphology.find_matches).
+ */
+class MorphologyService {
+  constructor() {
+    this.index = null;
+  }
+
+  /**
+   * Load the morphology index (fetched once)
+   * @returns {Promise<Object|null>} Index or null if not built
+   */
+  async loadIndex() {
+    if (!this.index) {
+      this.index = fetch(`${LESSONS_PATH}/morphology/index.json`)
+        .then(response => (response.ok ? response.json() : null))
+        .catch(() => null);
+    }
+    return this.index;
+  }
+
+  /**
+   * Key of a vocabulary headword (must match build_morphology.headword_key)
+   * @param {string} text
+   * @returns {string}
+   */
+  headwordKey(text) {
+    return searchService.normalize(text).trim().split(/\s+/).join(' ');
+  }
+
+  /**
+   * Lemma of a single word ('derived' -> 'derive')
+   * @param {string} word
+   * @returns {Promise<string>}
+   */
+  async lemmatize(word) {
+    const index = await this.loadIndex();
+    const token = searchService.normalize(word).trim();
+    return index?.forms[token] || token;
+  }
+
+  /**
+   * End token index if pattern[j:] matches lemmas from i, else -1
+   */
+  matchPattern(lemmas, i, pattern, j, slotMax) {
+    if (j === pattern.length) {
+      return i;
+    }
+    const optional = pattern[j].startsWith('?');
+    const core = pattern[j].replace(/^\?/, '');
+
+    if (core === '*') {
+      for (let n = 1; n <= slotMax && i + n <= lemmas.length; n++) {
+        const end = this.matchPattern(lemmas, i + n, pattern, j + 1, slotMax);
+        if (end >= 0) return end;
+      }
+    } else if (i < lemmas.length && core.split('|').includes(lemmas[i])) {
+      const end = this.matchPattern(lemmas, i + 1, pattern, j + 1, slotMax);
+      if (end >= 0) return end;
+    }
+
+    return optional ? this.matchPattern(lemmas, i, pattern, j + 1, slotMax) : -1;
+  }
+
+  /**
+   * Headwords occurring in a text, longest match first
+   * @param {string} text
+   * @returns {Promise<string[]>} Headword keys
+   */
+  async findHeadwords(text) {
+    const index = await this.loadIndex();
+    if (!index) {
+      return [];
+    }
+
+    const lemmas = searchService.tokenize(text).map(token => index.forms[token] || token);
+    const matches = [];
+    lemmas.forEach((lemma, i) => {
+      (index.starts[lemma] || []).forEach(idx => {
+        const [key, pattern] = index.patterns[idx];
+        const end = this.matchPattern(lemmas, i, pattern, 0, index.slotMax);
+        if (end > i) {
+          matches.push({ key, length: end - i });
+        }
+      });
+    });
+
+    return matches.sort((a, b) => b.length - a.length).map(match => match.key);
+  }
+
+  /**
+   * Find the vocabulary entry for a clicked word or highlighted phrase
+   * @param {string} text
+   * @param {Array} vocabulary
+   * @returns {Promise<Object|null>}
+   */
+  async findVocabulary(text, vocabulary) {
+    const keys = await this.findHeadwords(text);
+    for (const key of keys) {
+      const found = vocabulary.find(v => this.headwordKey(v.word) === key);
+      if (found) return found;
+    }
+    return null;
+  }
+}
+
+export default new MorphologyService();
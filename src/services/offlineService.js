@@ -0,0 +1,33 @@
+/**
+ * Offline Service - Registers the service worker (public/sw.js) that installs
+ * the course from the packs listed in lessons/json/precache.json
+ */
+class OfflineService {
+  /**
+   * Register the service worker (production builds only)
+   */
+  register() {
+    if (!('serviceWorker' in navigator) || !import.meta.env.PROD) return;
+
+    navigator.serviceWorker
+      .register(`${import.meta.env.BASE_URL}sw.js`)
+      .catch(error => console.warn('Service worker not registered:', error));
+  }
+
+  /**
+   * Ask the service worker to install a unit's pack before the others
+   * @param {string} unit - Lesson unit label ('Unit 4')
+   */
+  prioritizeUnit(unit) {
+    if (!('serviceWorker' in navigator) || !import.meta.env.PROD) return;
+
+    const number = parseInt(String(unit).match(/\d+/)?.[0], 10);
+    if (Number.isNaN(number)) return;
+
+    navigator.serviceWorker.ready
+      .then(registration => registration.active?.postMessage({ type: 'prioritize-unit', unit: number }))
+      .catch(() => {});
+  }
+}
+
+export default new OfflineService();
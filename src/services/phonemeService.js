@@ -0,0 +1,88 @@
+import { LESSONS_PATH } from '../constants/config.js';
+
+/**
+ * Phoneme Service - Query the phoneme index built by build_phoneme_index.py
+ * Words are [word, ipa, variant, [[lessonId, wordId], ...]].
+ */
+class PhonemeService {
+  constructor() {
+    this.index = null;
+  }
+
+  /**
+   * Load the phoneme index (fetched once)
+   * @returns {Promise<Object>}
+   */
+  async loadIndex() {
+    if (!this.index) {
+      this.index = fetch(`${LESSONS_PATH}/phonemes/index.json`).then(response => {
+        if (!response.ok) {
+          throw new Error(`Phoneme index not available: ${response.statusText}`);
+        }
+        return response.json();
+      });
+    }
+    return this.index;
+  }
+
+  /**
+   * Convert an index word entry into an object
+   * @param {Array} entry
+   * @returns {Object} { word, ipa, variant, refs }
+   */
+  toWord([word, ipa, variant, refs]) {
+    return {
+      word,
+      ipa,
+      variant,
+      refs: refs.map(([lessonId, wordId]) => ({ lessonId, wordId }))
+    };
+  }
+
+  /**
+   * All phonemes in the course
+   * @returns {Promise<string[]>}
+   */
+  async getPhonemes() {
+    const index = await this.loadIndex();
+    return Object.keys(index.phonemes);
+  }
+
+  /**
+   * Words containing a sound
+   * @param {string} phoneme - e.g. 'θ', 'iː', 'aɪ'
+   * @returns {Promise<Array>}
+   */
+  async getWordsWithSound(phoneme) {
+    const index = await this.loadIndex();
+    return (index.phonemes[phoneme] || []).map(idx => this.toWord(index.words[idx]));
+  }
+
+  /**
+   * Minimal pairs, optionally limited to a word or a pair of contrasting sounds
+   * @param {Object} filter - { word, sounds: [a, b] }
+   * @returns {Promise<Array>} [{ first, second, sounds }]
+   */
+  async getMinimalPairs({ word, sounds } = {}) {
+    const index = await this.loadIndex();
+    const wanted = word?.toLowerCase();
+
+    return index.minimalPairs
+      .filter(([a, b, soundA, soundB]) => {
+        if (wanted && index.words[a][0].toLowerCase() !== wanted && index.words[b][0].toLowerCase() !== wanted) {
+          return false;
+        }
+        if (sounds && !(sounds.includes(soundA) && sounds.includes(soundB))) {
+          return false;
+        }
+        return true;
+      })
+      .map(([a, b, soundA, soundB]) => ({
+        first: this.toWord(index.words[a]),
+        second: this.toWord(index.words[b]),
+        sounds: [soundA, soundB]
+      }));
+  }
+}
+
+export default new PhonemeService();
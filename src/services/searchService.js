@@ -0,0 +1,193 @@
+import { LESSONS_PATH } from '../constants/config.js';
+
+const SEARCH_PATH = `${LESSONS_PATH}/search`;
+
+// Ranking weight per document kind
+const KIND_WEIGHT = {
+  vocabulary: 3,
+  question: 2,
+  reading: 1
+};
+
+/**
+ * Search Service - Full-text search over the static index built by build_search_index.py
+ * Only the term shards needed by a query are fetched, then cached.
+ */
+class SearchService {
+  constructor() {
+    this.meta = null;
+    this.shards = new Map();
+    this.docChunks = new Map();
+  }
+
+  /**
+   * Lowercase and strip Vietnamese diacritics (must match build_search_index.fold_text)
+   * @param {string} text
+   * @returns {string}
+   */
+  normalize(text) {
+    return text
+      .toLowerCase()
+      .replace(/đ/g, 'd')
+      .normalize('NFD')
+      .replace(/[\u0300-\u036f]/g, '');
+  }
+
+  /**
+   * Split text into normalized tokens
+   * @param {string} text
+   * @returns {string[]}
+   */
+  tokenize(text) {
+    return this.normalize(text).match(/[a-z0-9]+/g) || [];
+  }
+
+  /**
+   * Load index metadata (lessons, kinds, shards)
+   * @returns {Promise<Object>}
+   */
+  async loadMeta() {
+    if (!this.meta) {
+      this.meta = fetch(`${SEARCH_PATH}/index.json`).then(response => {
+        if (!response.ok) {
+          throw new Error(`Search index not available: ${response.statusText}`);
+        }
+        return response.json();
+      });
+    }
+    return this.meta;
+  }
+
+  /**
+   * Load the term shard for a first character
+   * @param {string} key
+   * @returns {Promise<Object>} term -> encoded postings
+   */
+  async loadShard(key) {
+    const meta = await this.loadMeta();
+    if (!meta.shards.includes(key)) {
+      return {};
+    }
+    if (!this.shards.has(key)) {
+      this.shards.set(key, fetch(`${SEARCH_PATH}/terms-${key}.json`).then(r => r.json()));
+    }
+    return this.shards.get(key);
+  }
+
+  /**
+   * Load a chunk of documents
+   * @param {number} chunk
+   * @returns {Promise<Array>}
+   */
+  async loadDocChunk(chunk) {
+    if (!this.docChunks.has(chunk)) {
+      this.docChunks.set(chunk, fetch(`${SEARCH_PATH}/docs-${chunk}.json`).then(r => r.json()));
+    }
+    return this.docChunks.get(chunk);
+  }
+
+  /**
+   * Decode delta-encoded postings into docId -> positions
+   * @param {number[]} encoded
+   * @returns {Map<number, number[]>}
+   */
+  decodePostings(encoded) {
+    const postings = new Map();
+    let doc = 0;
+    let i = 0;
+    while (i < encoded.length) {
+      doc += encoded[i];
+      const count = encoded[i + 1];
+      const positions = [];
+      let pos = 0;
+      for (let j = 0; j < count; j++) {
+        pos += encoded[i + 2 + j];
+        positions.push(pos);
+      }
+      postings.set(doc, positions);
+      i += 2 + count;
+    }
+    return postings;
+  }
+
+  /**
+   * Postings for a token; the last query token also matches as a prefix
+   * @param {string} token
+   * @param {boolean} allowPrefix
+   * @returns {Promise<Map<number, number[]>>}
+   */
+  async getPostings(token, allowPrefix) {
+    const shard = await this.loadShard(token[0]);
+    if (shard[token] || !allowPrefix) {
+      return this.decodePostings(shard[token] || []);
+    }
+
+    const merged = new Map();
+    Object.keys(shard)
+      .filter(term => term.startsWith(token))
+      .forEach(term => {
+        this.decodePostings(shard[term]).forEach((positions, doc) => {
+          merged.set(doc, [...(merged.get(doc) || []), ...positions].sort((a, b) => a - b));
+        });
+      });
+    return merged;
+  }
+
+  /**
+   * Search all lessons
+   * @param {string} query
+   * @param {number} limit
+   * @returns {Promise<Array>} [{ lessonId, kind, ref, text, isPhrase }]
+   */
+  async search(query, limit = 20) {
+    const tokens = this.tokenize(query);
+    if (tokens.length === 0) {
+      return [];
+    }
+
+    const meta = await this.loadMeta();
+    const lists = await Promise.all(
+      tokens.map((token, i) => this.getPostings(token, i === tokens.length - 1))
+    );
+
+    // Documents containing every token
+    const [first, ...rest] = lists;
+    const candidates = [...first.keys()].filter(doc => rest.every(list => list.has(doc)));
+
+    const scored = candidates.map(doc => {
+      const isPhrase = first.get(doc).some(start =>
+        rest.every((list, i) => list.get(doc).includes(start + i + 1))
+      );
+      const hits = lists.reduce((sum, list) => sum + list.get(doc).length, 0);
+      return { doc, isPhrase, hits };
+    });
+
+    const chunkOf = doc => Math.floor(doc / meta.docsPerChunk);
+    const top = scored
+      .sort((a, b) => (b.isPhrase - a.isPhrase) || (b.hits - a.hits))
+      .slice(0, limit * 2);
+
+    const chunks = await Promise.all(
+      [...new Set(top.map(item => chunkOf(item.doc)))].map(async chunk => [chunk, await this.loadDocChunk(chunk)])
+    );
+    const chunkMap = new Map(chunks);
+
+    return top
+      .map(({ doc, isPhrase, hits }) => {
+        const [lessonIdx, kindIdx, ref, text] = chunkMap.get(chunkOf(doc))[doc % meta.docsPerChunk];
+        const kind = meta.kinds[kindIdx];
+        return {
+          lessonId: meta.lessons[lessonIdx],
+          kind,
+          ref,
+          text,
+          isPhrase,
+          score: (isPhrase ? 10 : 0) + KIND_WEIGHT[kind] + hits
+        };
+      })
+      .sort((a, b) => b.score - a.score)
+      .slice(0, limit);
+  }
+}
+
+export default new SearchService();
@@ -1,22 +1,129 @@
 import { STORAGE_KEYS, CACHE_DURATION } from '../constants/config.js';
+import { sm2Review, newState, packStates, unpackStates, today } from '../utils/srsScheduler.js';
+
+// Progress schema: one small record per lesson plus one packed review-state store
+const PROGRESS_VERSION = 2;
+const PROGRESS_PREFIX = `${STORAGE_KEYS.PROGRESS}:v${PROGRESS_VERSION}:`;
+const REVIEW_KEY = `${PROGRESS_PREFIX}@reviews`;
+const REVIEW_FLUSH_DELAY = 500;
+
+// Delta-update bases live in the Cache API (whole lessons would crowd localStorage)
+const lessonCacheKey = (lessonId) => `/${STORAGE_KEYS.LESSONS}/${encodeURIComponent(lessonId)}`;
 
 /**
  * Storage Service - Handle localStorage operations
+ *
+ * Progress is stored per lesson (`english_learning_progress:v2:<lessonId>`) as
+ * { v, t: lastAccessed (epoch seconds), l: learned, x: exercises, k: known, r: review }.
+ * Word references are global vocabulary ids (vid) when the lesson provides them,
+ * so a read or update only touches that lesson's small record.
+ * Spaced-repetition state for all words is one packed string (see srsScheduler.js).
+ * Lesson bodies kept for delta updates go to the Cache API, not localStorage.
  */
 class StorageService {
+  constructor() {
+    this.records = new Map();     // lessonId -> stored record (parsed once)
+    this.vocabMaps = new Map();   // lessonId -> id/word <-> vid maps
+    this.reviewStates = null;     // vid -> review state
+    this.reviewFlush = null;
+    this.migrated = false;
+  }
+
+  /**
+   * Register a lesson's vocabulary so word references can be stored as vids
+   * @param {string} lessonId
+   * @param {Array} vocabulary
+   */
+  registerVocabulary(lessonId, vocabulary) {
+    const maps = { idToVid: new Map(), wordToVid: new Map(), vidToId: new Map(), vidToWord: new Map() };
+    vocabulary.forEach(entry => {
+      if (Number.isInteger(entry.vid)) {
+        maps.idToVid.set(entry.id, entry.vid);
+        maps.wordToVid.set(entry.word, entry.vid);
+        maps.vidToId.set(entry.vid, entry.id);
+        maps.vidToWord.set(entry.vid, entry.word);
+      }
+    });
+    this.vocabMaps.set(lessonId, maps);
+  }
+
+  /**
+   * Encode word ids / words as vids where known
+   */
+  encodeRefs(lessonId, refs, kind) {
+    const maps = this.vocabMaps.get(lessonId);
+    const lookup = maps && (kind === 'word' ? maps.wordToVid : maps.idToVid);
+    return (refs || []).map(ref => (lookup && lookup.has(ref) ? lookup.get(ref) : ref));
+  }
+
+  /**
+   * Decode stored refs back to word ids / words (unregistered vids stay numbers)
+   */
+  decodeRefs(lessonId, refs, kind) {
+    const maps = this.vocabMaps.get(lessonId);
+    const lookup = maps && (kind === 'word' ? maps.vidToWord : maps.vidToId);
+    return (refs || []).map(ref => (typeof ref === 'number' && lookup?.has(ref) ? lookup.get(ref) : ref));
+  }
+
+  /**
+   * Split the legacy single-blob progress into per-lesson records (once)
+   */
+  migrateLegacyProgress() {
+    if (this.migrated) return;
+    this.migrated = true;
+
+    const legacy = localStorage.getItem(STORAGE_KEYS.PROGRESS);
+    if (!legacy) return;
+
+    try {
+      Object.entries(JSON.parse(legacy)).forEach(([lessonId, progress]) => {
+        if (!localStorage.getItem(PROGRESS_PREFIX + lessonId)) {
+          this.saveLessonProgress(lessonId, progress);
+        }
+      });
+      localStorage.removeItem(STORAGE_KEYS.PROGRESS);
+    } catch (error) {
+      console.error('Failed to migrate progress:', error);
+    }
+  }
+
+  /**
+   * Stored record of a lesson (parsed once, then cached)
+   * @param {string} lessonId
+   * @returns {Object|null}
+   */
+  getRecord(lessonId) {
+    this.migrateLegacyProgress();
+    if (!this.records.has(lessonId)) {
+      const data = localStorage.getItem(PROGRESS_PREFIX + lessonId);
+      this.records.set(lessonId, data ? JSON.parse(data) : null);
+    }
+    return this.records.get(lessonId);
+  }
+
   /**
    * Get user progress for a specific lesson
    * @param {string} lessonId
    * @returns {Object} Progress data
    */
   getLessonProgress(lessonId) {
-    const allProgress = this.getAllProgress();
-    return allProgress[lessonId] || {
-      learnedWords: [],
-      completedExercises: [],
-      flashcardKnownWords: [],
-      flashcardReviewWords: [],
-      lastAccessed: null
+    const record = this.getRecord(lessonId);
+    if (!record) {
+      return {
+        learnedWords: [],
+        completedExercises: [],
+        flashcardKnownWords: [],
+        flashcardReviewWords: [],
+        lastAccessed: null
+      };
+    }
+
+    return {
+      learnedWords: this.decodeRefs(lessonId, record.l, 'id'),
+      completedExercises: record.x || [],
+      flashcardKnownWords: this.decodeRefs(lessonId, record.k, 'word'),
+      flashcardReviewWords: this.decodeRefs(lessonId, record.r, 'word'),
+      lastAccessed: record.t ? new Date(record.t * 1000).toISOString() : null
     };
   }
 
@@ -64,8 +171,8 @@ class StorageService {
   /**
    * Save flashcard game progress
    * @param {string} lessonId
-   * @param {string[]} knownWords - Array of word IDs
-   * @param {string[]} reviewWords - Array of word IDs
+   * @param {string[]} knownWords - Array of words
+   * @param {string[]} reviewWords - Array of words
    */
   saveFlashcardProgress(lessonId, knownWords, reviewWords) {
     const progress = this.getLessonProgress(lessonId);
@@ -76,14 +183,21 @@ class StorageService {
   }
 
   /**
-   * Save lesson progress
+   * Save lesson progress (only this lesson's record is serialized)
    * @param {string} lessonId
    * @param {Object} progressData
    */
   saveLessonProgress(lessonId, progressData) {
-    const allProgress = this.getAllProgress();
-    allProgress[lessonId] = progressData;
-    localStorage.setItem(STORAGE_KEYS.PROGRESS, JSON.stringify(allProgress));
+    const record = {
+      v: PROGRESS_VERSION,
+      t: progressData.lastAccessed ? Math.floor(Date.parse(progressData.lastAccessed) / 1000) : null,
+      l: this.encodeRefs(lessonId, progressData.learnedWords, 'id'),
+      x: progressData.completedExercises || [],
+      k: this.encodeRefs(lessonId, progressData.flashcardKnownWords, 'word'),
+      r: this.encodeRefs(lessonId, progressData.flashcardReviewWords, 'word')
+    };
+    this.records.set(lessonId, record);
+    localStorage.setItem(PROGRESS_PREFIX + lessonId, JSON.stringify(record));
   }
 
   /**
@@ -91,8 +205,65 @@ class StorageService {
    * @returns {Object} All lessons progress
    */
   getAllProgress() {
-    const data = localStorage.getItem(STORAGE_KEYS.PROGRESS);
-    return data ? JSON.parse(data) : {};
+    this.migrateLegacyProgress();
+    const allProgress = {};
+    Object.keys(localStorage)
+      .filter(key => key.startsWith(PROGRESS_PREFIX) && key !== REVIEW_KEY)
+      .forEach(key => {
+        const lessonId = key.slice(PROGRESS_PREFIX.length);
+        allProgress[lessonId] = this.getLessonProgress(lessonId);
+      });
+    return allProgress;
+  }
+
+  /**
+   * Review states of all words (unpacked once)
+   * @returns {Map<number, Object>} vid -> state
+   */
+  getReviewStates() {
+    if (!this.reviewStates) {
+      this.reviewStates = unpackStates(localStorage.getItem(REVIEW_KEY));
+    }
+    return this.reviewStates;
+  }
+
+  /**
+   * Record a review of a word and reschedule it
+   * @param {number} vid - Global vocabulary id
+   * @param {number} grade - GRADES value
+   * @returns {Object} New review state
+   */
+  recordReview(vid, grade) {
+    const states = this.getReviewStates();
+    const state = sm2Review(states.get(vid) || newState(vid), grade, today());
+    states.set(vid, state);
+
+    // Batch consecutive reviews into one write
+    clearTimeout(this.reviewFlush);
+    this.reviewFlush = setTimeout(() => this.flushReviews(), REVIEW_FLUSH_DELAY);
+    return state;
+  }
+
+  /**
+   * Write review states now
+   */
+  flushReviews() {
+    clearTimeout(this.reviewFlush);
+    this.reviewFlush = null;
+    if (this.reviewStates) {
+      localStorage.setItem(REVIEW_KEY, packStates(this.reviewStates.values()));
+    }
+  }
+
+  /**
+   * Words due for review
+   * @param {number[]} vids - Candidate words
+   * @returns {number[]} vids due today or earlier
+   */
+  getDueWords(vids) {
+    const states = this.getReviewStates();
+    const day = today();
+    return vids.filter(vid => states.has(vid) && states.get(vid).due <= day);
   }
 
   /**
@@ -140,18 +311,66 @@ class StorageService {
     return data ? JSON.parse(data) : {};
   }
 
+  /**
+   * Cached copy of a lesson with its content version (see build_deltas.py)
+   * @param {string} lessonId
+   * @returns {Promise<{version: string, data: Object}|null>}
+   */
+  async getCachedLesson(lessonId) {
+    if (typeof caches === 'undefined') return null;
+    try {
+      const cache = await caches.open(STORAGE_KEYS.LESSONS);
+      const response = await cache.match(lessonCacheKey(lessonId));
+      return response ? await response.json() : null;
+    } catch {
+      return null;
+    }
+  }
+
+  /**
+   * Keep a lesson for delta updates (skipped when the Cache API is missing or full)
+   * @param {string} lessonId
+   * @param {string} version
+   * @param {Object} data
+   */
+  async cacheLesson(lessonId, version, data) {
+    // Copies from older builds took localStorage space progress needs
+    localStorage.removeItem(`${STORAGE_KEYS.LESSONS}:${lessonId}`);
+    if (typeof caches === 'undefined') return;
+    try {
+      const cache = await caches.open(STORAGE_KEYS.LESSONS);
+      await cache.put(lessonCacheKey(lessonId), new Response(JSON.stringify({ version, data }), {
+        headers: { 'Content-Type': 'application/json' }
+      }));
+    } catch (error) {
+      console.warn(`Lesson ${lessonId} not cached:`, error);
+    }
+  }
+
   /**
    * Clear all cache
    */
   clearCache() {
     localStorage.removeItem(STORAGE_KEYS.CACHE);
+    Object.keys(localStorage)
+      .filter(key => key.startsWith(`${STORAGE_KEYS.LESSONS}:`))
+      .forEach(key => localStorage.removeItem(key));
+    if (typeof caches !== 'undefined') {
+      caches.delete(STORAGE_KEYS.LESSONS).catch(() => {});
+    }
   }
 
   /**
    * Clear all progress
    */
   clearProgress() {
+    clearTimeout(this.reviewFlush);
+    Object.keys(localStorage)
+      .filter(key => key.startsWith(PROGRESS_PREFIX))
+      .forEach(key => localStorage.removeItem(key));
     localStorage.removeItem(STORAGE_KEYS.PROGRESS);
+    this.records.clear();
+    this.reviewStates = null;
   }
 
   /**
@@ -63,11 +63,49 @@ export const generateWrongOptions = (correctAnswer, allOptions, count = 3) => {
   return getRandomItems(wrongOptions, count);
 };
 
+/**
+ * Pick wrong options from the precomputed item bank, falling back to random lesson options
+ */
+export const pickWrongOptions = (item, itemBank, allOptions, count = 3) => {
+  const ranked = itemBank?.items?.[item.id]?.distractors;
+  if (ranked && ranked.length >= count) {
+    // Sample among the best-ranked distractors so replays vary
+    return getRandomItems(ranked.slice(0, count + 2), count);
+  }
+  return generateWrongOptions(item.meaning, allOptions, count);
+};
+
+/**
+ * Get a scrambled word from the item bank, or scramble it now
+ */
+export const pickScramble = (item, itemBank) => {
+  const variants = itemBank?.items?.[item.id]?.scrambles;
+  return variants?.length ? getRandomItems(variants, 1)[0] : scrambleWord(item.word);
+};
+
+/**
+ * Select vocabulary for a matching round (precomputed set when available)
+ */
+const selectMatchingItems = (vocabulary, count, itemBank) => {
+  const sets = itemBank?.matchingSets || [];
+  if (sets.length > 0) {
+    const [ids] = getRandomItems(sets, 1);
+    const selected = ids
+      .map(id => vocabulary.find(v => v.id === id))
+      .filter(Boolean)
+      .slice(0, count);
+    if (selected.length >= 2) {
+      return selected;
+    }
+  }
+  return getRandomItems(vocabulary, count);
+};
+
 /**
  * Create matching pairs for matching game
  */
-export const createMatchingPairs = (vocabulary, count = 6) => {
-  const selected = getRandomItems(vocabulary, count);
+export const createMatchingPairs = (vocabulary, count = 6, itemBank = null) => {
+  const selected = selectMatchingItems(vocabulary, count, itemBank);
   const words = selected.map((item, index) => ({
     id: `word-${index}`,
     content: item.word,
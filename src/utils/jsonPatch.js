@@ -0,0 +1,50 @@
+/**
+ * Minimal RFC 6902 JSON Patch (add / remove / replace)
+ * Must match build_deltas.py (diff/apply_patch).
+ */
+
+const decodeToken = (token) => token.replace(/~1/g, '/').replace(/~0/g, '~');
+
+/**
+ * Apply patch operations to a copy of a document
+ * @param {*} doc
+ * @param {Array<{op: string, path: string, value?: *}>} ops
+ * @returns {*} Patched document (new object)
+ */
+export const applyPatch = (doc, ops) => {
+  let result = structuredClone(doc);
+
+  for (const op of ops) {
+    const tokens = op.path.split('/').slice(1).map(decodeToken);
+    if (tokens.length === 0) {
+      result = structuredClone(op.value);
+      continue;
+    }
+
+    let parent = result;
+    for (const token of tokens.slice(0, -1)) {
+      parent = parent[Array.isArray(parent) ? Number(token) : token];
+      if (parent === undefined || parent === null) {
+        throw new Error(`Invalid patch path: ${op.path}`);
+      }
+    }
+
+    const last = tokens[tokens.length - 1];
+    if (Array.isArray(parent)) {
+      const index = last === '-' ? parent.length : Number(last);
+      if (op.op === 'add') {
+        parent.splice(index, 0, structuredClone(op.value));
+      } else if (op.op === 'remove') {
+        parent.splice(index, 1);
+      } else {
+        parent[index] = structuredClone(op.value);
+      }
+    } else if (op.op === 'remove') {
+      delete parent[last];
+    } else {
+      parent[last] = structuredClone(op.value);
+    }
+  }
+
+  return result;
+};
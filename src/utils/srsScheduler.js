@@ -0,0 +1,128 @@
+/**
+ * Spaced repetition (SM-2) and the compact review-state format
+ * Must match srs_scheduler.py (sm2_review, pack_states/unpack_states).
+ */
+
+export const GRADES = {
+  AGAIN: 1,
+  HARD: 2,
+  GOOD: 3,
+  EASY: 4
+};
+
+// SM-2 quality (0-5) for the four grades
+const SM2_QUALITY = { 1: 1, 2: 3, 3: 4, 4: 5 };
+const START_EASE = 2500; // ease factor x1000
+const MIN_EASE = 1300;
+
+// Packed record: vid, due day, interval, ease x1000, counters (reps << 20 | lapses << 10)
+const STRIDE = 5;
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+/**
+ * Current day number (days since epoch)
+ * @returns {number}
+ */
+export const today = () => Math.floor(Date.now() / DAY_MS);
+
+/**
+ * New review state for a word
+ * @param {number} vid - Global vocabulary id
+ * @returns {Object}
+ */
+export const newState = (vid) => ({
+  vid,
+  due: 0,
+  interval: 0,
+  ease: START_EASE,
+  reps: 0,
+  lapses: 0
+});
+
+/**
+ * Apply one review (SM-2, integer ease)
+ * @param {Object} state
+ * @param {number} grade - GRADES value
+ * @param {number} day - Day number of the review
+ * @returns {Object} Updated state (new object)
+ */
+export const sm2Review = (state, grade, day = today()) => {
+  const q = SM2_QUALITY[grade];
+  const next = { ...state };
+
+  if (q < 3) {
+    next.reps = 0;
+    next.lapses += 1;
+    next.interval = 1;
+  } else {
+    next.reps += 1;
+    if (next.reps === 1) {
+      next.interval = 1;
+    } else if (next.reps === 2) {
+      next.interval = 6;
+    } else {
+      next.interval = Math.floor((state.interval * state.ease + 500) / 1000);
+    }
+  }
+
+  next.ease = Math.max(MIN_EASE, state.ease + 100 - (5 - q) * (80 + (5 - q) * 20));
+  next.due = day + next.interval;
+  return next;
+};
+
+/**
+ * Pack review states into a base64 string (5 little-endian uint32 per word)
+ * @param {Iterable<Object>} states
+ * @returns {string}
+ */
+export const packStates = (states) => {
+  const list = [...states];
+  const view = new DataView(new ArrayBuffer(list.length * STRIDE * 4));
+  list.forEach((state, i) => {
+    const values = [
+      state.vid,
+      state.due,
+      state.interval,
+      state.ease,
+      ((Math.min(state.reps, 0xfff) << 20) | (Math.min(state.lapses, 0x3ff) << 10)) >>> 0
+    ];
+    values.forEach((value, j) => view.setUint32((i * STRIDE + j) * 4, value, true));
+  });
+
+  let binary = '';
+  const bytes = new Uint8Array(view.buffer);
+  for (let i = 0; i < bytes.length; i++) {
+    binary += String.fromCharCode(bytes[i]);
+  }
+  return btoa(binary);
+};
+
+/**
+ * Unpack review states
+ * @param {string} text
+ * @returns {Map<number, Object>} vid -> state
+ */
+export const unpackStates = (text) => {
+  const states = new Map();
+  if (!text) return states;
+
+  const binary = atob(text);
+  const view = new DataView(new ArrayBuffer(binary.length));
+  for (let i = 0; i < binary.length; i++) {
+    view.setUint8(i, binary.charCodeAt(i));
+  }
+
+  for (let offset = 0; offset + STRIDE * 4 <= binary.length; offset += STRIDE * 4) {
+    const counters = view.getUint32(offset + 16, true);
+    const state = {
+      vid: view.getUint32(offset, true),
+      due: view.getUint32(offset + 4, true),
+      interval: view.getUint32(offset + 8, true),
+      ease: view.getUint32(offset + 12, true),
+      reps: counters >>> 20,
+      lapses: (counters >>> 10) & 0x3ff
+    };
+    states.set(state.vid, state);
+  }
+  return states;
+};
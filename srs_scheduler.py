@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Reference spaced-repetition schedulers with an offline simulation benchmark
+- SM-2 in integer arithmetic, identical to src/utils/srsScheduler.js
+- FSRS-4.5 with the published default weights
+- review state packs into the app's compact progress format
+  (5 little-endian uint32 per word, base64; see pack_states)
+- simulate: thousands of words over months of daily study, with a learner whose
+  memory follows the FSRS forgetting curve; reports workload, retention and speed
+
+Usage:
+    python srs_scheduler.py                          # both algorithms, 5000 words, 365 days
+    python srs_scheduler.py --algorithm fsrs --retention 0.85 --words 20000
+"""
+
+import argparse
+import base64
+import math
+import random
+import struct
+import time
+
+AGAIN, HARD, GOOD, EASY = 1, 2, 3, 4
+
+# SM-2 quality (0-5) for the app's four grades
+SM2_QUALITY = {AGAIN: 1, HARD: 3, GOOD: 4, EASY: 5}
+SM2_START_EASE = 2500   # ease factor x1000
+SM2_MIN_EASE = 1300
+
+FSRS_WEIGHTS = (0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031, 1.6474,
+                0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755)
+FSRS_DECAY = -0.5
+FSRS_FACTOR = 19 / 81
+
+# Packed record: vid, due day, interval, param, counters
+# param: SM-2 ease x1000 / FSRS stability x100
+# counters: reps (12 bits) << 20 | lapses (10 bits) << 10 | difficulty x10 (10 bits)
+RECORD = struct.Struct('<5I')
+
+
+class CardState:
+    """Review state of one word"""
+    __slots__ = ('vid', 'due', 'interval', 'ease', 'stability', 'difficulty', 'reps', 'lapses')
+
+    def __init__(self, vid, ease=SM2_START_EASE):
+        self.vid = vid
+        self.due = 0
+        self.interval = 0
+        self.ease = ease
+        self.stability = 0.0
+        self.difficulty = 0.0
+        self.reps = 0
+        self.lapses = 0
+
+    @property
+    def last_review(self):
+        return self.due - self.interval
+
+
+def sm2_review(card, grade, today):
+    """SM-2 update (integer ease, Math.round-compatible rounding)"""
+    q = SM2_QUALITY[grade]
+    if q < 3:
+        card.reps = 0
+        card.lapses += 1
+        card.interval = 1
+    else:
+        card.reps += 1
+        if card.reps == 1:
+            card.interval = 1
+        elif card.reps == 2:
+            card.interval = 6
+        else:
+            card.interval = (card.interval * card.ease + 500) // 1000
+
+    card.ease = max(SM2_MIN_EASE, card.ease + 100 - (5 - q) * (80 + (5 - q) * 20))
+    card.due = today + card.interval
+    return card
+
+
+def fsrs_retrievability(elapsed, stability):
+    """Probability of recall after elapsed days"""
+    return (1 + FSRS_FACTOR * elapsed / stability) ** FSRS_DECAY
+
+
+def fsrs_interval(stability, retention):
+    """Days until recall probability drops to the target retention"""
+    return max(1, round(stability / FSRS_FACTOR * (retention ** (1 / FSRS_DECAY) - 1)))
+
+
+def fsrs_memory(stability, difficulty, reps, grade, elapsed, w=FSRS_WEIGHTS):
+    """Next (stability, difficulty) after a review"""
+    if reps == 0:
+        stability = w[grade - 1]
+        difficulty = w[4] - (grade - 3) * w[5]
+    else:
+        r = fsrs_retrievability(elapsed, stability)
+        if grade == AGAIN:
+            forget = w[11] * difficulty ** -w[12] * ((stability + 1) ** w[13] - 1) * math.exp(w[14] * (1 - r))
+            new_stability = min(forget, stability)
+        else:
+            hard = w[15] if grade == HARD else 1
+            easy = w[16] if grade == EASY else 1
+            new_stability = stability * (
+                math.exp(w[8]) * (11 - difficulty) * stability ** -w[9]
+                * (math.exp(w[10] * (1 - r)) - 1) * hard * easy + 1
+            )
+        # Difficulty moves with the grade and reverts towards the default
+        difficulty = w[7] * w[4] + (1 - w[7]) * (difficulty - w[6] * (grade - 3))
+        stability = new_stability
+    return max(0.01, stability), min(10.0, max(1.0, difficulty))
+
+
+def fsrs_review(card, grade, today, retention=0.9):
+    """FSRS-4.5 update"""
+    elapsed = today - card.last_review
+    card.stability, card.difficulty = fsrs_memory(card.stability, card.difficulty, card.reps, grade, elapsed)
+    if grade == AGAIN:
+        card.lapses += 1
+    card.reps += 1
+    card.interval = fsrs_interval(card.stability, retention)
+    card.due = today + card.interval
+    return card
+
+
+SCHEDULERS = {
+    'sm2': lambda card, grade, today, retention: sm2_review(card, grade, today),
+    'fsrs': fsrs_review,
+}
+
+
+def pack_states(cards, algorithm='sm2'):
+    """Base64 of packed review states (the app's storage format)"""
+    buf = bytearray()
+    for card in cards:
+        param = card.ease if algorithm == 'sm2' else round(card.stability * 100)
+        counters = (min(card.reps, 0xFFF) << 20) | (min(card.lapses, 0x3FF) << 10) | round(card.difficulty * 10)
+        buf += RECORD.pack(card.vid, card.due, card.interval, min(param, 0xFFFFFFFF), counters)
+    return base64.b64encode(bytes(buf)).decode('ascii')
+
+
+def unpack_states(text, algorithm='sm2'):
+    """Inverse of pack_states"""
+    cards = []
+    for vid, due, interval, param, counters in RECORD.iter_unpack(base64.b64decode(text)):
+        card = CardState(vid)
+        card.due, card.interval = due, interval
+        if algorithm == 'sm2':
+            card.ease = param
+        else:
+            card.stability = param / 100
+        card.reps = counters >> 20
+        card.lapses = (counters >> 10) & 0x3FF
+        card.difficulty = (counters & 0x3FF) / 10
+        cards.append(card)
+    return cards
+
+
+def simulate(algorithm, words=5000, days=365, new_per_day=20, retention=0.9, seed=1):
+    """
+    Simulate daily study; the learner's true memory follows FSRS with a hidden
+    per-word difficulty, independent of the scheduler being tested.
+    Returns summary statistics.
+    """
+    rng = random.Random(seed)
+    review = SCHEDULERS[algorithm]
+
+    cards = [CardState(vid) for vid in range(words)]
+    truth = [[0.0, rng.uniform(3, 9), 0, 0] for _ in range(words)]  # stability, difficulty, reps, last day
+    due = {}
+    introduced = 0
+
+    reviews = recalled = 0
+    peak = 0
+    review_time = 0.0
+    errors = 0
+
+    for today in range(days):
+        todays = due.pop(today, [])
+        for _ in range(min(new_per_day, words - introduced)):
+            todays.append(introduced)
+            introduced += 1
+        peak = max(peak, len(todays))
+
+        for vid in todays:
+            card, true_state = cards[vid], truth[vid]
+            stability, difficulty, reps, last = true_state
+
+            if reps == 0:
+                grade = rng.choice([AGAIN, HARD, GOOD, GOOD, EASY])
+            else:
+                p = fsrs_retrievability(today - last, stability)
+                if rng.random() < p:
+                    recalled += 1
+                    grade = rng.choices([HARD, GOOD, EASY], [15, 70, 15])[0]
+                else:
+                    grade = AGAIN
+                reviews += 1
+
+            true_state[0], true_state[1] = fsrs_memory(stability, difficulty, reps, grade, today - last)
+            true_state[2] += 1
+            true_state[3] = today
+
+            started = time.perf_counter()
+            review(card, grade, today, retention)
+            review_time += time.perf_counter() - started
+
+            if card.due <= today or card.interval < 1:
+                errors += 1
+            due.setdefault(card.due, []).append(vid)
+
+    started = time.perf_counter()
+    packed = pack_states(cards, algorithm)
+    restored = unpack_states(packed, algorithm)
+    pack_time = time.perf_counter() - started
+    roundtrip_ok = all(a.due == b.due and a.interval == b.interval and a.reps == min(b.reps, 0xFFF) for a, b in zip(cards, restored))
+
+    return {
+        "algorithm": algorithm,
+        "reviews": reviews,
+        "perDay": reviews / days,
+        "peak": peak,
+        "retention": recalled / reviews if reviews else 0.0,
+        "usPerReview": review_time / max(1, reviews + introduced) * 1e6,
+        "packedBytes": len(packed),
+        "packMs": pack_time * 1000,
+        "errors": errors,
+        "roundtrip": roundtrip_ok,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate spaced-repetition schedules offline')
+    parser.add_argument('--algorithm', choices=['sm2', 'fsrs', 'both'], default='both')
+    parser.add_argument('--words', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--new-per-day', type=int, default=20)
+    parser.add_argument('--retention', type=float, default=0.9, help='FSRS target retention')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    algorithms = ['sm2', 'fsrs'] if args.algorithm == 'both' else [args.algorithm]
+
+    print(f"\n{'='*60}")
+    print(f"Simulation: {args.words} words, {args.days} days, {args.new_per_day} new/day")
+    print(f"{'='*60}")
+    for algorithm in algorithms:
+        result = simulate(algorithm, args.words, args.days, args.new_per_day, args.retention, args.seed)
+        status = '✓' if result['errors'] == 0 and result['roundtrip'] else '✗'
+        print(f"{status} {algorithm}: {result['reviews']} reviews ({result['perDay']:.1f}/day, peak {result['peak']}), "
+              f"retention {result['retention']:.1%}")
+        print(f"    {result['usPerReview']:.2f} µs/review, packed state {result['packedBytes'] / 1024:.1f} KB "
+              f"in {result['packMs']:.1f} ms, schedule errors: {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
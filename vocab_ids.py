@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Global integer ids for vocabulary entries (used by the compact progress format)
+- lessons/vocab_ids.json is an append-only list of "lessonId/wordId" keys;
+  an entry's integer id (vid) is its position in that list
+- ids are never reused or renumbered, so saved progress stays valid as lessons grow
+- when a rebuild renames a word id (content_ids.reconcile), its key is renamed in
+  place and the entry keeps its vid
+"""
+
+import json
+
+REGISTRY_PATH = 'lessons/vocab_ids.json'
+REGISTRY_VERSION = 1
+
+
+def load_registry(path=REGISTRY_PATH):
+    """List of "lessonId/wordId" keys (index = vid)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('ids', [])
+    except FileNotFoundError:
+        return []
+
+
+def registry_data(keys):
+    """JSON data of the registry file"""
+    return {"version": REGISTRY_VERSION, "ids": keys}
+
+
+def save_registry(keys, path=REGISTRY_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(registry_data(keys), f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def assign_ids(lessons, keys):
+    """
+    Set vid on every vocabulary entry of (lesson_id, data) pairs, appending
+    unseen entries to keys; returns the number of new ids
+    """
+    positions = {key: vid for vid, key in enumerate(keys)}
+    added = 0
+    for lesson_id, data in lessons:
+        for word in data.get('vocabulary', []):
+            key = f"{lesson_id}/{word.get('id', '')}"
+            if key not in positions:
+                positions[key] = len(keys)
+                keys.append(key)
+                added += 1
+            word['vid'] = positions[key]
+    return added
+
+
+def rename_ids(keys, lesson_id, mapping):
+    """Rename "lessonId/oldId" keys to their new word ids in place; returns the number renamed"""
+    present = set(keys)
+    renamed = 0
+    for vid, key in enumerate(keys):
+        owner, _, word_id = key.partition('/')
+        new_key = f"{owner}/{mapping.get(word_id)}"
+        if owner == lesson_id and word_id in mapping and new_key not in present:
+            keys[vid] = new_key
+            present.add(new_key)
+            renamed += 1
+    return renamed
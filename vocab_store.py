@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Canonical vocabulary store shared by every lesson
+- one entry per normalized headword and part of speech, enriched once
+  (pronunciation, meaning, definition, example) and reused by every lesson
+- published lessons keep compact references: {"id", "ref": key} plus only the
+  fields that differ from the store (lesson-specific overrides) and the fields
+  the store does not hold (vid, exampleFromReading, ...)
+- lesson_config.read_lesson / iter_published expand references, write_lesson
+  compacts them; lessonService expands them in the browser
+- entries no published lesson refers to any more are dropped when the store is
+  rebuilt; lessons outside the build keep theirs, and a build that would leave a
+  reference dangling fails before anything is written
+
+Output: public/lessons/json/vocabulary.json (commit it, like the lessons)
+"""
+
+import json
+import re
+
+STORE_FILE = 'vocabulary.json'
+STORE_VERSION = 1
+
+# Fields held by the store; everything else stays on the lesson entry
+SHARED_FIELDS = ('word', 'pronunciation', 'pos', 'meaning', 'definition', 'exampleSimple')
+
+POS_SPLIT_RE = re.compile(r'[\s,/]+')
+POS_ALIASES = {'noun': 'n', 'verb': 'v', 'adjective': 'adj', 'adverb': 'adv', 'preposition': 'prep',
+               'conjunction': 'conj', 'pronoun': 'pron'}
+
+
+def word_key(word):
+    """Normalized headword (case and spacing ignored)"""
+    return ' '.join((word or '').lower().split())
+
+
+def pos_key(pos):
+    """Normalized part of speech ('Verb, n' -> 'n,v')"""
+    return ','.join(sorted({POS_ALIASES.get(p, p) for p in POS_SPLIT_RE.split((pos or '').lower()) if p}))
+
+
+def entry_key(word):
+    """Store key of a vocabulary entry: headword|pos"""
+    return f"{word_key(word.get('word'))}|{pos_key(word.get('pos'))}"
+
+
+def load_store(root):
+    """{key: shared fields} of the published store ({} when there is none)"""
+    try:
+        with open(f"{root}/{STORE_FILE}", 'r', encoding='utf-8') as f:
+            return json.load(f).get('entries', {})
+    except FileNotFoundError:
+        return {}
+
+
+def store_data(entries):
+    """JSON data of the store file (keys sorted so rebuilds diff cleanly)"""
+    return {"version": STORE_VERSION, "entries": {key: entries[key] for key in sorted(entries)}}
+
+
+def resolve_key(entries, word):
+    """
+    Store key for a lesson entry: its own key when stored, else its ref for the same
+    headword, else - when the lesson gives no part of speech - the headword's only entry
+    """
+    key = entry_key(word)
+    if key in entries:
+        return key
+    headword = word_key(word.get('word'))
+    ref = word.get('ref')
+    if ref in entries and ref.split('|', 1)[0] == headword:
+        return ref
+    if pos_key(word.get('pos')):
+        return key
+    matches = [k for k in entries if k.split('|', 1)[0] == headword]
+    return matches[0] if len(matches) == 1 else key
+
+
+def merge_entry(entries, word):
+    """Add a lesson entry to the store (filling fields the store lacks or has empty); returns its key"""
+    key = resolve_key(entries, word)
+    stored = entries.setdefault(key, {})
+    for field in SHARED_FIELDS:
+        if field in word and (field not in stored or (word[field] and not stored[field])):
+            stored[field] = word[field]
+    return key
+
+
+def fill_from_store(entries, word):
+    """Copy enriched store fields into an entry that lacks them; True when the store knew the word"""
+    stored = entries.get(resolve_key(entries, word))
+    if not stored or not stored.get('meaning'):
+        return False
+    for field in SHARED_FIELDS:
+        if not word.get(field) and stored.get(field):
+            word[field] = stored[field]
+    return True
+
+
+def expand_lesson(data, entries):
+    """Fill the shared fields of referenced entries in place; returns data"""
+    for word in data.get('vocabulary', []):
+        stored = entries.get(word.get('ref'))
+        if stored:
+            for field in SHARED_FIELDS:
+                if field in stored:
+                    word.setdefault(field, stored[field])
+    return data
+
+
+def compact_entry(word, entries):
+    """Reference form of an expanded entry (the entry itself when the store lacks it)"""
+    stored = entries.get(word.get('ref'))
+    if stored is None:
+        return word
+    return {
+        field: value for field, value in word.items()
+        if field not in SHARED_FIELDS or field not in stored or value != stored[field]
+    }
+
+
+def compact_lesson(data, entries):
+    """Copy of a lesson with referenced vocabulary entries in compact form"""
+    if not any(word.get('ref') in entries for word in data.get('vocabulary', [])):
+        return data
+    compact = dict(data)
+    compact['vocabulary'] = [compact_entry(word, entries) for word in data['vocabulary']]
+    return compact
+
+
+def lesson_refs(data):
+    """Store keys a (compact or expanded) lesson refers to"""
+    return {word['ref'] for word in data.get('vocabulary', []) if word.get('ref')}
+
+
+def dangling_refs(lessons, entries):
+    """[(lesson_id, ref)] of the (lesson_id, data) pairs whose ref has no store entry"""
+    return [
+        (lesson_id, ref) for lesson_id, data in lessons
+        for ref in sorted(lesson_refs(data)) if ref not in entries
+    ]
+
+
+def build_store(lessons, entries, keep=()):
+    """
+    Merge the vocabulary of every (lesson_id, data) pair into entries and point
+    each lesson entry at its store key; entries neither these lessons nor keep
+    (refs of published lessons outside the build) use are removed
+    Returns (entries added, entries removed).
+    """
+    before = set(entries)
+    used = set(keep) & before
+    for _, data in lessons:
+        for word in data.get('vocabulary', []):
+            if not word.get('word'):
+                continue
+            key = merge_entry(entries, word)
+            word['ref'] = key
+            used.add(key)
+
+    for key in set(entries) - used:
+        del entries[key]
+    return len(used - before), len(before - used)
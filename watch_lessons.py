@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Watch lessons/reading and lessons/listening and rebuild lessons as DOCX files change
+- debounced change detection (mtime polling, no extra dependencies)
+- rebuilds, enriches, fills answers and re-manifests only the affected lesson
+- parsers, previous lesson data and dictionary/translation lookups stay warm in memory
+
+Usage:
+    python watch_lessons.py              # watch and rebuild with API enrichment
+    python watch_lessons.py --offline    # never call the network, reuse known data only
+"""
+
+import argparse
+import os
+import time
+
+import instrumentation
+import lesson_config
+from run_pipeline import PIPELINE_STAGES, LessonPipeline
+
+WATCH_DIRS = ['lessons/reading', 'lessons/listening']
+
+
+class LessonWatcher:
+    """Keeps a warm LessonPipeline and rebuilds single lessons on change"""
+
+    def __init__(self, enrich=True, offline=False):
+        self.lessons = lesson_config.load_lessons()
+        self.pipeline = LessonPipeline(self.lessons, enrich=enrich, offline=offline, reconvert=True)
+
+    def find_lesson(self, docx_path):
+        """Lesson entry for a source DOCX, reloading the config for new files"""
+        path = os.path.normpath(docx_path)
+        for lesson in self.lessons:
+            if os.path.normpath(lesson['source']) == path:
+                return lesson
+
+        self.lessons = lesson_config.load_lessons()
+        for lesson in self.lessons:
+            if os.path.normpath(lesson['source']) == path:
+                self.pipeline.lessons.append(lesson)
+                self.pipeline.load_published(lesson)
+                return lesson
+        return None
+
+    def rebuild(self, docx_path):
+        """Rebuild, enrich and publish the lesson built from docx_path"""
+        lesson = self.find_lesson(docx_path)
+        if not lesson:
+            print(f"⚠ {docx_path} is not a lesson source, skipping...")
+            return
+
+        start = time.perf_counter()
+        print(f"\n↻ Rebuilding {lesson['id']} from {lesson['source']}")
+
+        self.pipeline.run(list(PIPELINE_STAGES), [lesson])
+        new_words = len(self.pipeline.new_words.get(lesson['id'], []))
+        written = self.pipeline.write()
+
+        elapsed = time.perf_counter() - start
+        cache = self.pipeline.cache
+        print(f"✓ {lesson['fileName']}: {new_words} new words, {len(written)} files written, "
+              f"{elapsed:.2f}s [cache {cache.hits} hits / {cache.misses} misses]")
+
+
+def scan_docx(dirs):
+    """Return {path: mtime} for every DOCX under dirs (Word lock files ignored)"""
+    found = {}
+    for directory in dirs:
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if entry.name.endswith('.docx') and not entry.name.startswith('~$'):
+                found[entry.path] = entry.stat().st_mtime
+    return found
+
+
+def watch(watcher, interval, debounce):
+    """Poll lesson directories and rebuild each changed DOCX once edits settle"""
+    snapshot = scan_docx(WATCH_DIRS)
+    pending = {}  # path -> time of last change
+
+    print(f"👀 Watching {', '.join(WATCH_DIRS)} ({len(snapshot)} files). Ctrl+C to stop.")
+
+    while True:
+        time.sleep(interval)
+        now = time.monotonic()
+        current = scan_docx(WATCH_DIRS)
+
+        for path, mtime in current.items():
+            if snapshot.get(path) != mtime:
+                pending[path] = now
+        snapshot = current
+
+        for path in [p for p, changed in pending.items() if now - changed >= debounce]:
+            del pending[path]
+            if path not in current:
+                continue
+            try:
+                watcher.rebuild(path)
+            except Exception as e:
+                print(f"✗ Error rebuilding {path}: {e}")
+                import traceback
+                traceback.print_exc()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild lessons automatically when DOCX sources change')
+    parser.add_argument('--interval', type=float, default=0.2, help='polling interval in seconds')
+    parser.add_argument('--debounce', type=float, default=0.4, help='quiet time before a rebuild in seconds')
+    parser.add_argument('--no-enrich', action='store_true', help='skip dictionary/translation enrichment')
+    parser.add_argument('--offline', action='store_true', help='only reuse known data, never call the APIs')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumentation.session(args):
+        watcher = LessonWatcher(enrich=not args.no_enrich, offline=args.offline)
+        try:
+            watch(watcher, args.interval, args.debounce)
+        except KeyboardInterrupt:
+            print("\n✅ Watch stopped")
+
+
+if __name__ == "__main__":
+    main()